@@ -4,10 +4,18 @@ Uses working yangson leafref extraction to analyze real network configurations.
 """
 import os
 import json
+import hashlib
+import pickle
 from typing import Dict, List, Any, Tuple
 from dataclasses import dataclass
+from src.json_utils import json_loads, json_dumps
 from .yangson_extractor import WorkingYangsonLeafrefExtractor
 
+def _load_json_file(file_path: str) -> Any:
+    """Read and parse a JSON file, using orjson when it is installed."""
+    with open(file_path, 'rb') as f:
+        return json_loads(f.read())
+
 def _verbose_print(*args, **kwargs):
     """Print only if TRUE_SCHEMA_VERBOSE environment variable is set."""
     if os.environ.get('TRUE_SCHEMA_VERBOSE'):
@@ -20,6 +28,78 @@ def get_project_root() -> str:
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_dir)))
     return project_root
 
+def _leafref_cache_path() -> str:
+    """
+    Location of the on-disk leafref table for the current YANG model set.
+    The file name is a SHA256 over the size/mtime of every YANG module and of the
+    extractor itself, so editing either produces a new cache entry.
+    """
+    project_root = get_project_root()
+    yang_root = os.path.join(project_root, "models", "yang")
+    extractor_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yangson_extractor.py")
+    
+    digest = hashlib.sha256()
+    stat = os.stat(extractor_file)
+    digest.update(f"extractor:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    for root, dirs, files in os.walk(yang_root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".yang"):
+                file_path = os.path.join(root, name)
+                stat = os.stat(file_path)
+                rel_path = os.path.relpath(file_path, yang_root)
+                digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    
+    return os.path.join(project_root, ".cache", f"leafrefs-{digest.hexdigest()[:16]}.json")
+
+# Analysis results kept in .cache; the least recently used beyond this are pruned
+ANALYSIS_CACHE_MAX_ENTRIES = 64
+
+def _analysis_fingerprint() -> str:
+    """Size/mtime of every src/analysis source, so edits to the analysis code invalidate cached results."""
+    analysis_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(analysis_root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                file_path = os.path.join(root, name)
+                stat = os.stat(file_path)
+                rel_path = os.path.relpath(file_path, analysis_root)
+                digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+def _analysis_cache_path(leafref_cache_path: str, current_config: Dict, proposed_config: Dict) -> str:
+    """
+    Location of the on-disk analysis result for a pair of configurations.
+    The file name is a SHA256 over both serialized configs, the leafref table in use
+    and the src/analysis sources. Keys are not sorted: change order follows dict order.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{os.path.basename(leafref_cache_path)}:{_analysis_fingerprint()}\n".encode())
+    digest.update(json_dumps(current_config))
+    digest.update(b"\n")
+    digest.update(json_dumps(proposed_config))
+    
+    return os.path.join(os.path.dirname(leafref_cache_path), f"analysis-{digest.hexdigest()[:32]}.pkl")
+
+def _prune_analysis_cache(cache_dir: str, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES):
+    """Delete the least recently used analysis results beyond max_entries."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.startswith("analysis-") and name.endswith((".pkl", ".json")):
+            file_path = os.path.join(cache_dir, name)
+            try:
+                entries.append((os.stat(file_path).st_mtime_ns, file_path))
+            except OSError:
+                continue
+    entries.sort(reverse=True)
+    for _, file_path in entries[max_entries:]:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
 @dataclass
 class TrueSchemaDependency:
     """TRUE schema-driven dependency found in configuration analysis."""
@@ -49,13 +129,30 @@ class TrueSchemaDrivenAnalyzer:
         self.leafref_extractor = WorkingYangsonLeafrefExtractor()
         self.true_leafrefs = []
         self.initialized = False
+        self.leafref_cache_path = None
         
     def initialize_schema_analysis(self) -> bool:
-        """Initialize TRUE schema-driven analysis using working yangson model."""
+        """
+        Initialize TRUE schema-driven analysis using working yangson model.
+        Runs once per analyzer; the extracted leafrefs are also cached on disk.
+        """
+        
+        if self.initialized:
+            return True
         
         _verbose_print("🚀 Initializing TRUE Schema-Driven Configuration Analysis")
         _verbose_print("=" * 65)
         
+        # Reuse leafrefs extracted by a previous run if the YANG models are unchanged
+        cache_path = _leafref_cache_path()
+        self.leafref_cache_path = cache_path
+        cached_leafrefs = self._load_cached_leafrefs(cache_path)
+        if cached_leafrefs:
+            _verbose_print(f"✅ Loaded {len(cached_leafrefs)} TRUE leafrefs from {cache_path}")
+            self.true_leafrefs = cached_leafrefs
+            self.initialized = True
+            return True
+        
         # Load working yangson model
         if not self.leafref_extractor.load_working_yang_model():
             _verbose_print("❌ Failed to load yangson model")
@@ -73,9 +170,28 @@ class TrueSchemaDrivenAnalyzer:
             for leafref in self.true_leafrefs:
                 _verbose_print(f"   📋 {leafref['source_path']} → {leafref['target_path']}")
         
+        self._store_cached_leafrefs(cache_path, self.true_leafrefs)
         self.initialized = True
         return True
     
+    def _load_cached_leafrefs(self, cache_path: str) -> List[Dict]:
+        """Load leafrefs from the on-disk cache; returns [] when missing or unreadable."""
+        try:
+            return _load_json_file(cache_path)
+        except (OSError, ValueError):
+            return []
+    
+    def _store_cached_leafrefs(self, cache_path: str, leafrefs: List[Dict]):
+        """Persist extracted leafrefs; cache write failures are not fatal."""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(leafrefs, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            _verbose_print(f"   ⚠️  Could not write leafref cache: {e}")
+    
     def load_configuration_files(self, current_file: str, proposed_file: str) -> Tuple[Dict, Dict]:
         """Load current and proposed configuration files."""
         
@@ -84,16 +200,14 @@ class TrueSchemaDrivenAnalyzer:
         try:
             # Load current configuration
             if os.path.exists(current_file):
-                with open(current_file, 'r') as f:
-                    current_config = json.load(f)
+                current_config = _load_json_file(current_file)
                 _verbose_print(f"   ✅ Current config loaded: {os.path.basename(current_file)}")
             else:
                 _verbose_print(f"   ⚠️  Current config not found: {current_file}")
                 current_config = {}
             
             # Load proposed configuration
-            with open(proposed_file, 'r') as f:
-                proposed_config = json.load(f)
+            proposed_config = _load_json_file(proposed_file)
             _verbose_print(f"   ✅ Proposed config loaded: {os.path.basename(proposed_file)}")
             
             return current_config, proposed_config
@@ -335,6 +449,76 @@ class TrueSchemaDrivenAnalyzer:
         if not proposed_config:
             return {"error": "Failed to load configuration files"}
         
+        return self._analyze_loaded_configurations(current_config, proposed_config)
+    
+    def analyze_configuration_dicts(self, current_config: Dict, proposed_config: Dict) -> Dict:
+        """
+        Complete configuration analysis workflow for already-loaded configurations.
+        Same result shape as analyze_configuration_file, without any file I/O.
+        """
+        
+        # Initialize schema analysis
+        if not self.initialize_schema_analysis():
+            return {"error": "Schema analysis initialization failed"}
+        
+        if not proposed_config:
+            return {"error": "Proposed configuration is empty"}
+        
+        # Identical config pairs (e.g. re-running analyze on the same proposal)
+        # reuse the changes and dependencies computed by a previous run
+        try:
+            cache_path = _analysis_cache_path(self.leafref_cache_path, current_config, proposed_config)
+        except (TypeError, ValueError, OSError):
+            cache_path = None
+        
+        if cache_path:
+            cached_result = self._load_cached_analysis(cache_path)
+            if cached_result:
+                _verbose_print(f"✅ Loaded analysis result from {cache_path}")
+                return cached_result
+        
+        result = self._analyze_loaded_configurations(current_config, proposed_config)
+        if cache_path:
+            self._store_cached_analysis(cache_path, result)
+        return result
+    
+    def _load_cached_analysis(self, cache_path: str) -> Dict:
+        """Load a cached analysis result; returns {} when missing or unreadable."""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            # Mark the entry as recently used for _prune_analysis_cache
+            os.utime(cache_path)
+            return {
+                "success": True,
+                "changes": cached["changes"],
+                "dependencies": cached["dependencies"],
+                "report": cached["report"],
+                "schema_leafrefs": self.true_leafrefs
+            }
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError):
+            return {}
+    
+    def _store_cached_analysis(self, cache_path: str, result: Dict):
+        """Persist an analysis result; cache write failures are not fatal."""
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    "changes": result["changes"],
+                    "dependencies": result["dependencies"],
+                    "report": result["report"]
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            _prune_analysis_cache(cache_dir)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            _verbose_print(f"   ⚠️  Could not write analysis cache: {e}")
+    
+    def _analyze_loaded_configurations(self, current_config: Dict, proposed_config: Dict) -> Dict:
+        """Run change detection, dependency matching and reporting on loaded configs."""
+        
         # Analyze changes
         changes = self.analyze_configuration_changes(current_config, proposed_config)
         
@@ -8,27 +8,137 @@ import sys
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.text import Text
+import contextlib
+import functools
 import logging
 
+from src.json_utils import json_dumps
+
 # Setup paths for graph imports
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'src'))
 
-console = Console()
 logger = logging.getLogger(__name__)
 
+# Node type descriptions for the status summary table
+_NODE_DESCRIPTIONS = {
+    'devices': 'Network devices (switches, routers)',
+    'interfaces': 'Physical and logical interfaces',
+    'vlans': 'VLAN configurations',
+    'acls': 'Access control lists',
+    'bgp_instances': 'BGP routing instances',
+    'bgp_peers': 'BGP peering relationships',
+    'device_states': 'Device configuration versions',
+    'connections': 'Physical connectivity (LLDP)',
+    'sites': 'Geographic locations'
+}
+
+# Cypher queries kept byte-identical across calls so Neo4j's plan cache is reused
+_Q_TOPOLOGY_CONNECTIONS = """
+    MATCH (i1:Interface)-[c:CONNECTED_TO]->(i2:Interface)
+    MATCH (d1:Device)-[:HAS_INTERFACE]->(i1)
+    MATCH (d2:Device)-[:HAS_INTERFACE]->(i2)
+    RETURN d1.hostname as device1, i1.name as int1,
+           d2.hostname as device2, i2.name as int2,
+           c.discovered_via as method
+    ORDER BY device1, device2
+"""
+
+_Q_TOPOLOGY_BGP = """
+    MATCH (d:Device)-[:BGP_PEER_WITH]->(p:BGPPeer)
+    OPTIONAL MATCH (p)-[:LATEST]->(ps:BGPPeerState)
+    RETURN d.hostname as device, 
+           count(p) as peer_count,
+           collect(DISTINCT toString(ps.peer_asn)) as peer_asns
+    ORDER BY device
+"""
+
+_Q_DEVICE_INVENTORY = """
+    MATCH (d:Device)
+    OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
+    RETURN d.hostname as hostname,
+           ds.vendor as vendor,
+           ds.os_type as os_type,
+           ds.platform as platform,
+           ds.management_ip as mgmt_ip,
+           size([(d)-[:HAS_INTERFACE]->(i:Interface) | i]) as interface_count
+    ORDER BY hostname
+"""
+
+_Q_DEVICE_DETAIL = """
+    MATCH (d:Device {hostname: $hostname})
+    OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
+    RETURN d.hostname as hostname,
+           ds.vendor as vendor,
+           ds.os_type as os_type,
+           ds.platform as platform,
+           ds.management_ip as mgmt_ip,
+           ds.timestamp as last_update
+"""
+
+_Q_DEVICE_INTERFACES = """
+    MATCH (d:Device {hostname: $hostname})-[:HAS_INTERFACE]->(i:Interface)
+    RETURN i.name as interface_name
+    ORDER BY i.name
+"""
+
+_Q_DEVICE_VLANS = """
+    MATCH (v:VLAN {device_hostname: $hostname})
+    RETURN v.vlan_number as vlan_id
+    ORDER BY vlan_id
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def get_console():
+    """
+    Return the shared Rich console, importing Rich on first use.
+    Keeps `--help` and unrelated subcommands from paying Rich's import cost.
+    """
+    from rich.console import Console
+    return Console()
+
+
+@contextlib.contextmanager
+def _maybe_progress(description: str):
+    """
+    Show a Rich spinner around a long-running call, but only on a terminal.
+    Args: description shown next to the spinner.
+    """
+    console = get_console()
+    if not console.is_terminal:
+        # Piped/scripted runs skip the live-render thread entirely
+        yield
+        return
+
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        task = progress.add_task(description, total=None)
+        yield
+        progress.update(task, completed=True)
+
+
+def emit_json(payload: Any):
+    """
+    Write payload to stdout as JSON, bypassing Rich rendering entirely.
+    Args: payload to serialize; non-JSON values (e.g. Neo4j datetimes) are stringified.
+    """
+    sys.stdout.buffer.write(json_dumps(payload, default=str))
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.flush()
+
 
 def get_graph_pipeline():
     """
     Get graph ingestion pipeline instance with proper import handling.
     Returns: GraphIngestionPipeline instance or None if import fails.
     """
+    console = get_console()
     try:
         # Change to graph directory for imports to work
         original_cwd = os.getcwd()
@@ -51,6 +161,7 @@ def get_graph_schema():
     Get graph schema instance with proper import handling.
     Returns: GraphSchema instance or None if import fails.
     """
+    console = get_console()
     try:
         # Change to graph directory for imports to work
         original_cwd = os.getcwd()
@@ -73,6 +184,9 @@ def display_ingestion_results(results: Dict[str, Any]):
     Display ingestion pipeline results in a formatted table.
     Args: results dictionary from pipeline execution.
     """
+    from rich.table import Table
+    from rich.panel import Panel
+    console = get_console()
     # Pipeline execution summary
     execution = results.get('pipeline_execution', {})
     summary = results.get('ingestion_summary', {})
@@ -122,12 +236,15 @@ def display_status_summary(status: Dict[str, Any]):
     Display comprehensive graph database status.
     Args: status dictionary from pipeline.
     """
+    from rich.table import Table
+    from rich.panel import Panel
+    console = get_console()
     graph_stats = status.get('graph_statistics', {})
     topology_stats = status.get('topology_statistics', {})
     config = status.get('configuration', {})
     
     # Database overview panel
-    total_nodes = sum(v for v in graph_stats.values() if isinstance(v, int))
+    total_nodes = sum(graph_stats.values())
     total_devices = graph_stats.get('devices', 0)
     total_interfaces = graph_stats.get('interfaces', 0)
     
@@ -149,24 +266,14 @@ def display_status_summary(status: Dict[str, Any]):
         nodes_table.add_column("Count", style="magenta", justify="right")
         nodes_table.add_column("Description", style="dim")
         
-        # Node type descriptions
-        descriptions = {
-            'devices': 'Network devices (switches, routers)',
-            'interfaces': 'Physical and logical interfaces',
-            'vlans': 'VLAN configurations',
-            'acls': 'Access control lists',
-            'bgp_instances': 'BGP routing instances',
-            'bgp_peers': 'BGP peering relationships',
-            'device_states': 'Device configuration versions',
-            'connections': 'Physical connectivity (LLDP)',
-            'sites': 'Geographic locations'
-        }
-        
         for key, value in graph_stats.items():
-            if value > 0:
-                display_key = key.replace('_', ' ').title()
-                description = descriptions.get(key, 'Configuration objects')
-                nodes_table.add_row(display_key, str(value), description)
+            if not value:
+                continue
+            nodes_table.add_row(
+                key.replace('_', ' ').title(),
+                str(value),
+                _NODE_DESCRIPTIONS.get(key, 'Configuration objects')
+            )
         
         console.print(nodes_table)
     
@@ -184,27 +291,54 @@ def display_status_summary(status: Dict[str, Any]):
         console.print(topology_table)
 
 
-def display_topology_overview():
-    """Display network topology relationships and connections."""
+def _read_topology(tx) -> tuple:
+    """
+    Fetch physical connections and BGP peering in one read transaction.
+    Args: tx - managed Neo4j transaction.
+    Returns: (connection records, BGP peer records) as lists of dicts.
+    """
+    connections = tx.run(_Q_TOPOLOGY_CONNECTIONS).data()
+    bgp_peers = tx.run(_Q_TOPOLOGY_BGP).data()
+    return connections, bgp_peers
+
+
+def _read_device_detail(tx, hostname: str) -> tuple:
+    """
+    Fetch device info, interface names and VLAN ids in one read transaction.
+    Args: tx - managed Neo4j transaction, hostname of the device.
+    Returns: (device record or None, interface names, VLAN ids).
+    """
+    device_record = tx.run(_Q_DEVICE_DETAIL, hostname=hostname).single()
+    if not device_record:
+        return None, [], []
+
+    interfaces = [record['interface_name'] for record in tx.run(_Q_DEVICE_INTERFACES, hostname=hostname)]
+    vlans = [record['vlan_id'] for record in tx.run(_Q_DEVICE_VLANS, hostname=hostname)]
+    return device_record.data(), interfaces, vlans
+
+
+def display_topology_overview(as_json: bool = False):
+    """
+    Display network topology relationships and connections.
+    Args: as_json - emit raw query records as JSON instead of Rich tables.
+    """
+    from rich.table import Table
+    console = get_console()
     schema = get_graph_schema()
     if not schema:
         return
     
     try:
         with schema.driver.session() as session:
+            connections, bgp_peers = session.execute_read(_read_topology)
+
+            if as_json:
+                emit_json({'connections': connections, 'bgp_peers': bgp_peers})
+                return
+
             # Physical connections
             console.print("[bold cyan]🔗 Physical Network Connections[/bold cyan]")
             
-            result = session.run("""
-                MATCH (i1:Interface)-[c:CONNECTED_TO]->(i2:Interface)
-                MATCH (d1:Device)-[:HAS_INTERFACE]->(i1)
-                MATCH (d2:Device)-[:HAS_INTERFACE]->(i2)
-                RETURN d1.hostname as device1, i1.name as int1,
-                       d2.hostname as device2, i2.name as int2,
-                       c.discovered_via as method
-                ORDER BY device1, device2
-            """)
-            
             connections_table = Table()
             connections_table.add_column("Source Device", style="green")
             connections_table.add_column("Source Interface", style="cyan")
@@ -213,7 +347,7 @@ def display_topology_overview():
             connections_table.add_column("Discovery Method", style="dim")
             
             connection_count = 0
-            for record in result:
+            for record in connections:
                 connections_table.add_row(
                     record['device1'],
                     record['int1'],
@@ -232,26 +366,17 @@ def display_topology_overview():
             # BGP peering summary
             console.print(f"\n[bold cyan]🌐 BGP Peering Relationships[/bold cyan]")
             
-            result = session.run("""
-                MATCH (d:Device)-[:BGP_PEER_WITH]->(p:BGPPeer)
-                OPTIONAL MATCH (p)-[:LATEST]->(ps:BGPPeerState)
-                RETURN d.hostname as device, 
-                       count(p) as peer_count,
-                       collect(DISTINCT ps.peer_asn) as peer_asns
-                ORDER BY device
-            """)
-            
             bgp_table = Table()
             bgp_table.add_column("Device", style="green")
             bgp_table.add_column("Peer Count", style="magenta", justify="right")
             bgp_table.add_column("Peer ASNs", style="cyan")
             
-            for record in result:
-                peer_asns = [str(asn) for asn in record['peer_asns'] if asn is not None]
+            for record in bgp_peers:
+                # Query already returns distinct, non-null ASN strings
                 bgp_table.add_row(
                     record['device'],
                     str(record['peer_count']),
-                    ', '.join(set(peer_asns)) if peer_asns else 'unknown'
+                    ', '.join(record['peer_asns']) or 'unknown'
                 )
             
             console.print(bgp_table)
@@ -270,25 +395,24 @@ def ingest_group():
 
 
 @ingest_group.command()
-def all():
+@click.option('--json', 'as_json', is_flag=True, help='Emit pipeline results as JSON instead of tables')
+def all(as_json):
     """Run complete ingestion pipeline (schema + devices + topology)."""
-    console.print("[bold blue]🚀 Starting Complete Graph Ingestion Pipeline[/bold blue]")
+    console = get_console()
+    if not as_json:
+        console.print("[bold blue]🚀 Starting Complete Graph Ingestion Pipeline[/bold blue]")
     
     pipeline = get_graph_pipeline()
     if not pipeline:
         return
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Running complete ingestion pipeline...", total=None)
-            
+        if as_json:
+            emit_json(pipeline.run_complete_ingestion())
+            return
+
+        with _maybe_progress("Running complete ingestion pipeline..."):
             results = pipeline.run_complete_ingestion()
-            
-            progress.update(task, completed=True)
         
         console.print("[bold green]✅ Complete ingestion pipeline finished![/bold green]")
         display_ingestion_results(results)
@@ -310,23 +434,94 @@ def all():
             pipeline.cleanup()
 
 
+def read_hostnames_file(file_path: str) -> list:
+    """
+    Read device hostnames from a text file, one per line.
+    Args: file_path to read; blank lines and '#' comments are skipped.
+    Returns: List of hostnames in file order.
+    """
+    hostnames = []
+    with open(file_path, 'r') as f:
+        for line in f:
+            hostname = line.split('#', 1)[0].strip()
+            if hostname:
+                hostnames.append(hostname)
+    return hostnames
+
+
+def display_batch_update_results(results: Dict[str, Any]):
+    """
+    Display batched incremental update results in a formatted table.
+    Args: results dictionary from run_incremental_update_batch.
+    """
+    from rich.table import Table
+    console = get_console()
+    results_table = Table(title="📱 Device Ingestion Results")
+    results_table.add_column("Device", style="green", no_wrap=True)
+    results_table.add_column("Status", style="cyan")
+    results_table.add_column("Nodes Created", style="magenta", justify="right")
+    results_table.add_column("Error", style="red")
+
+    for device_result in results.get('device_results', []):
+        results_table.add_row(
+            device_result['device'],
+            device_result['status'],
+            str(device_result.get('nodes_created', 0)),
+            device_result.get('error', '')
+        )
+
+    console.print(results_table)
+    console.print(f"[dim]Devices ingested: {results.get('devices_processed', 0)} | "
+                  f"Nodes created: {results.get('nodes_created', 0)}[/dim]")
+
+
 @ingest_group.command()
-def devices():
+@click.option('--from-file', 'from_file', type=click.Path(exists=True, dir_okay=False),
+              help='File with one hostname per line to ingest in a single pipeline run')
+@click.option('--json', 'as_json', is_flag=True, help='Emit batch results as JSON instead of tables (requires --from-file)')
+def devices(from_file, as_json):
     """Ingest device configurations only."""
-    console.print("[bold blue]📱 Ingesting Device Configurations[/bold blue]")
-    
+    if as_json and not from_file:
+        raise click.UsageError("--json requires --from-file")
+    console = get_console()
+    if not as_json:
+        console.print("[bold blue]📱 Ingesting Device Configurations[/bold blue]")
+
+    if from_file:
+        hostnames = read_hostnames_file(from_file)
+        if not hostnames:
+            console.print(f"[yellow]No hostnames found in {from_file}[/yellow]")
+            return
+
     pipeline = get_graph_pipeline()
     if not pipeline:
         return
-    
+
+    if from_file:
+        try:
+            if as_json:
+                emit_json(pipeline.run_incremental_update_batch(hostnames))
+                return
+
+            with _maybe_progress(f"Ingesting {len(hostnames)} devices..."):
+                # One pipeline (driver + file discovery) shared across all hosts
+                results = pipeline.run_incremental_update_batch(hostnames)
+
+            if results.get('status') == 'success':
+                console.print(f"[bold green]✅ Successfully ingested {len(hostnames)} devices![/bold green]")
+            else:
+                console.print(f"[yellow]⚠️ Batch ingestion finished with status: {results.get('status')}[/yellow]")
+            display_batch_update_results(results)
+
+        except Exception as e:
+            console.print(f"[red]❌ Batch device ingestion failed: {e}[/red]")
+            logger.exception("Batch device ingestion error")
+        finally:
+            pipeline.cleanup()
+        return
+
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Ingesting device configurations...", total=None)
-            
+        with _maybe_progress("Ingesting device configurations..."):
             # Get current status for comparison
             initial_status = pipeline.get_pipeline_status()
             initial_devices = initial_status.get('graph_statistics', {}).get('devices', 0)
@@ -341,8 +536,6 @@ def devices():
                 schema.initialize_schema()
                 final_status = pipeline.get_pipeline_status()
                 schema.close()
-                
-                progress.update(task, completed=True)
                 console.print("[bold green]✅ Schema initialization completed![/bold green]")
                 display_status_summary(final_status)
             
@@ -357,6 +550,7 @@ def devices():
 @ingest_group.command()
 def topology():
     """Ingest network topology data only."""
+    console = get_console()
     console.print("[bold blue]🌐 Ingesting Network Topology[/bold blue]")
     
     pipeline = get_graph_pipeline()
@@ -364,17 +558,9 @@ def topology():
         return
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("Ingesting topology data...", total=None)
-            
+        with _maybe_progress("Ingesting topology data..."):
             console.print("[yellow]Note: Topology-only ingestion not yet implemented.[/yellow]")
             console.print("[yellow]Showing current topology instead...[/yellow]")
-            
-            progress.update(task, completed=True)
         
         # Display current topology
         display_topology_overview()
@@ -389,26 +575,25 @@ def topology():
 
 @ingest_group.command()
 @click.argument('hostname')
-def device(hostname):
+@click.option('--json', 'as_json', is_flag=True, help='Emit ingestion result as JSON')
+def device(hostname, as_json):
     """Ingest single device configuration."""
-    console.print(f"[bold blue]📱 Ingesting Device: {hostname}[/bold blue]")
+    console = get_console()
+    if not as_json:
+        console.print(f"[bold blue]📱 Ingesting Device: {hostname}[/bold blue]")
     
     pipeline = get_graph_pipeline()
     if not pipeline:
         return
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task(f"Ingesting {hostname}...", total=None)
-            
+        if as_json:
+            emit_json(pipeline.run_incremental_update(hostname))
+            return
+
+        with _maybe_progress(f"Ingesting {hostname}..."):
             # Use pipeline's incremental update method
             result = pipeline.run_incremental_update(hostname)
-            
-            progress.update(task, completed=True)
         
         if result.get('status') == 'success':
             console.print(f"[bold green]✅ Successfully ingested {hostname}![/bold green]")
@@ -431,9 +616,12 @@ def show_group():
 
 
 @show_group.command()
-def status():
+@click.option('--json', 'as_json', is_flag=True, help='Emit status as JSON instead of tables')
+def status(as_json):
     """Show graph database status and statistics."""
-    console.print("[bold blue]📊 Graph Database Status[/bold blue]")
+    console = get_console()
+    if not as_json:
+        console.print("[bold blue]📊 Graph Database Status[/bold blue]")
     
     pipeline = get_graph_pipeline()
     if not pipeline:
@@ -441,7 +629,10 @@ def status():
     
     try:
         status = pipeline.get_pipeline_status()
-        display_status_summary(status)
+        if as_json:
+            emit_json(status)
+        else:
+            display_status_summary(status)
         
     except Exception as e:
         console.print(f"[red]❌ Failed to retrieve status: {e}[/red]")
@@ -452,12 +643,15 @@ def status():
 
 
 @show_group.command()
-def topology():
+@click.option('--json', 'as_json', is_flag=True, help='Emit topology as JSON instead of tables')
+def topology(as_json):
     """Show network topology overview."""
-    console.print("[bold blue]🌐 Network Topology Overview[/bold blue]")
+    console = get_console()
+    if not as_json:
+        console.print("[bold blue]🌐 Network Topology Overview[/bold blue]")
     
     try:
-        display_topology_overview()
+        display_topology_overview(as_json=as_json)
         
     except Exception as e:
         console.print(f"[red]❌ Failed to display topology: {e}[/red]")
@@ -465,9 +659,13 @@ def topology():
 
 
 @show_group.command()
-def devices():
+@click.option('--json', 'as_json', is_flag=True, help='Emit device inventory as JSON instead of a table')
+def devices(as_json):
     """Show device inventory in graph database."""
-    console.print("[bold blue]📱 Device Inventory[/bold blue]")
+    from rich.table import Table
+    console = get_console()
+    if not as_json:
+        console.print("[bold blue]📱 Device Inventory[/bold blue]")
     
     schema = get_graph_schema()
     if not schema:
@@ -475,18 +673,10 @@ def devices():
     
     try:
         with schema.driver.session() as session:
-            result = session.run("""
-                MATCH (d:Device)
-                OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
-                OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i:Interface)
-                RETURN d.hostname as hostname,
-                       ds.vendor as vendor,
-                       ds.os_type as os_type,
-                       ds.platform as platform,
-                       ds.management_ip as mgmt_ip,
-                       count(i) as interface_count
-                ORDER BY hostname
-            """)
+            result = session.run(_Q_DEVICE_INVENTORY)
+            if as_json:
+                emit_json(result.data())
+                return
             
             devices_table = Table(title="Device Inventory")
             devices_table.add_column("Hostname", style="green", no_wrap=True)
@@ -523,6 +713,8 @@ def devices():
 @click.argument('hostname')
 def device(hostname):
     """Show detailed information for a specific device."""
+    from rich.panel import Panel
+    console = get_console()
     console.print(f"[bold blue]📱 Device Details: {hostname}[/bold blue]")
     
     schema = get_graph_schema()
@@ -531,19 +723,7 @@ def device(hostname):
     
     try:
         with schema.driver.session() as session:
-            # Device basic info
-            result = session.run("""
-                MATCH (d:Device {hostname: $hostname})
-                OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
-                RETURN d.hostname as hostname,
-                       ds.vendor as vendor,
-                       ds.os_type as os_type,
-                       ds.platform as platform,
-                       ds.management_ip as mgmt_ip,
-                       ds.timestamp as last_update
-            """, hostname=hostname)
-            
-            device_record = result.single()
+            device_record, interfaces, vlans = session.execute_read(_read_device_detail, hostname)
             if not device_record:
                 console.print(f"[red]❌ Device '{hostname}' not found in graph database[/red]")
                 return
@@ -564,26 +744,12 @@ def device(hostname):
             ))
             
             # Interface summary
-            result = session.run("""
-                MATCH (d:Device {hostname: $hostname})-[:HAS_INTERFACE]->(i:Interface)
-                RETURN i.name as interface_name
-                ORDER BY i.name
-            """, hostname=hostname)
-            
-            interfaces = [record['interface_name'] for record in result]
             if interfaces:
                 console.print(f"\n[bold cyan]🔌 Interfaces ({len(interfaces)}):[/bold cyan]")
                 interface_text = ", ".join(interfaces)
                 console.print(f"[dim]{interface_text}[/dim]")
             
-            # VLAN summary  
-            result = session.run("""
-                MATCH (v:VLAN {device_hostname: $hostname})
-                RETURN v.vlan_number as vlan_id
-                ORDER BY vlan_id
-            """, hostname=hostname)
-            
-            vlans = [record['vlan_id'] for record in result]
+            # VLAN summary
             if vlans:
                 console.print(f"\n[bold yellow]🏷️ VLANs ({len(vlans)}):[/bold yellow]")
                 vlan_text = ", ".join(map(str, vlans))
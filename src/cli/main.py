@@ -4,17 +4,24 @@ Integrates POC's proven generic diff and TRUE schema-driven dependency analysis.
 """
 
 import click
+import concurrent.futures
+import functools
+import hashlib
+import heapq
 import json
 import logging
 import os
+import pickle
+import re
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple, TYPE_CHECKING
+from collections import defaultdict
+from operator import attrgetter, itemgetter
+from dataclasses import dataclass, field
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
 from rich.text import Text
+from rich.style import Style
 
 # Add project root to Python path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent))
@@ -23,15 +30,13 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.loaders.config_loader import ConfigLoader
 from src.diff.generic_diff_engine import GenericDiffEngine, ConfigChange
 
-# Import TRUE schema-driven analyzer
-from src.analysis.schema_analyzer.true_schema_analyzer import TrueSchemaDrivenAnalyzer, TrueSchemaDependency, ConfigurationChange
+# Heavy analysis modules (yangson, ciscoconfparse2) are imported where they are
+# used so that --help, list-devices and the graph commands start quickly
+if TYPE_CHECKING:
+    from src.analysis.schema_analyzer.true_schema_analyzer import TrueSchemaDrivenAnalyzer
 
-# Import text configuration processing modules (new modular components)
-from src.loaders.format_detector import FormatDetector, ConfigFormat
-from src.loaders.text_to_yang_converter import TextToYangConverter
 
-
-@dataclass
+@dataclass(slots=True)
 class Dependency:
     """Compatibility wrapper for TRUE schema dependencies."""
     source_path: str
@@ -43,6 +48,25 @@ class Dependency:
     display_source: str = "" # New field for human-readable source
     display_target: str = "" # New field for human-readable target
     config_object_type: str = "" # New field for config object type
+    actual_object_identifier: str = "" # Object name the dependency was found for
+    # Top-level section of each path (text before the first '/'), computed once
+    source_section: str = field(init=False, repr=False, compare=False)
+    target_section: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Paths repeat across many dependencies (expansion copies them per target);
+        # interning keeps one copy and lets dict/set lookups short-circuit on identity
+        self.source_path = sys.intern(self.source_path)
+        self.target_path = sys.intern(self.target_path)
+        self.source_section = sys.intern(self.source_path.partition('/')[0])
+        self.target_section = sys.intern(self.target_path.partition('/')[0])
+
+
+@functools.lru_cache(maxsize=1)
+def _get_analyzer() -> 'TrueSchemaDrivenAnalyzer':
+    """Shared TRUE schema analyzer so YANG leafrefs are loaded once per process."""
+    from src.analysis.schema_analyzer.true_schema_analyzer import TrueSchemaDrivenAnalyzer
+    return TrueSchemaDrivenAnalyzer()
 
 
 class TrueSchemaAnalyzerBridge:
@@ -51,8 +75,8 @@ class TrueSchemaAnalyzerBridge:
     Adapts TRUE schema analyzer for production use.
     """
     
-    def __init__(self, project_root: Path):
-        self.analyzer = TrueSchemaDrivenAnalyzer()
+    def __init__(self, project_root: Path, analyzer: Optional['TrueSchemaDrivenAnalyzer'] = None):
+        self.analyzer = analyzer or _get_analyzer()
         self.project_root = project_root
         
     def find_dependencies(self, current_config: Dict, changed_paths: List[str]) -> List[Dependency]:
@@ -60,88 +84,65 @@ class TrueSchemaAnalyzerBridge:
         Find dependencies using TRUE schema-driven analysis.
         Adapts to CLI interface expectations.
         """
-        # Save current config to temp file for TRUE analyzer
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(current_config, f)
-            current_file = f.name
+        # Create a minimal proposed config with just the changed paths
+        proposed_config = self._create_minimal_proposed_config(current_config, changed_paths)
         
-        try:
-            # Create a minimal proposed config with just the changed paths
-            proposed_config = self._create_minimal_proposed_config(current_config, changed_paths)
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(proposed_config, f)
-                proposed_file = f.name
+        # Run TRUE schema-driven analysis directly on the in-memory configs
+        result = self.analyzer.analyze_configuration_dicts(current_config, proposed_config)
+        
+        if result.get('success') and result.get('dependencies'):
+            # Convert TrueSchemaDependency to Dependency objects
+            dependencies = []
+            for true_dep in result['dependencies']:
+                dep = Dependency(
+                    source_path=true_dep.config_change_path,
+                    target_path=true_dep.affected_leafref_target,
+                    dependency_type="schema_leafref",
+                    source_value=true_dep.affected_leafref_source,
+                    target_object=true_dep.affected_leafref_target,
+                    description=true_dep.leafref_description
+                )
+                dependencies.append(dep)
             
-            try:
-                # Run TRUE schema-driven analysis
-                result = self.analyzer.analyze_configuration_file(current_file, proposed_file)
-                
-                if result.get('success') and result.get('dependencies'):
-                    # Convert TrueSchemaDependency to Dependency objects
-                    dependencies = []
-                    for true_dep in result['dependencies']:
-                        dep = Dependency(
-                            source_path=true_dep.config_change_path,
-                            target_path=true_dep.affected_leafref_target,
-                            dependency_type="schema_leafref",
-                            source_value=true_dep.affected_leafref_source,
-                            target_object=true_dep.affected_leafref_target,
-                            description=true_dep.leafref_description
-                        )
-                        dependencies.append(dep)
-                    
-                    return dependencies
-                
-                return []
-                
-            finally:
-                os.unlink(proposed_file)
-                
-        finally:
-            os.unlink(current_file)
+            return dependencies
+        
+        return []
     
     def _create_minimal_proposed_config(self, current_config: Dict, changed_paths: List[str]) -> Dict:
         """Create minimal proposed config for TRUE analyzer to detect changes."""
         # For now, return the current config - the TRUE analyzer will detect no changes
         # This is a simplified approach; in a real implementation, you'd construct 
-        # the proposed config based on the changed paths
-        return current_config.copy()
+        # the proposed config based on the changed paths. The analyzer never mutates
+        # its inputs, so no copy is needed.
+        return current_config
     
     def get_dependency_summary(self, dependencies: List[Dependency]) -> Dict[str, Any]:
         """Generate dependency summary compatible with existing interface."""
-        summary = {
-            'total_dependencies': len(dependencies),
-            'by_type': {},
-            'by_source_section': {},
-            'by_target_section': {}
-        }
+        by_type = defaultdict(int)
+        by_source_section = defaultdict(list)
+        by_target_section = defaultdict(list)
         
         for dep in dependencies:
-            # Count by type
-            if dep.dependency_type not in summary['by_type']:
-                summary['by_type'][dep.dependency_type] = 0
-            summary['by_type'][dep.dependency_type] += 1
-            
-            # Count by source section
-            source_section = dep.source_path.split('/')[0] if '/' in dep.source_path else dep.source_path
-            if source_section not in summary['by_source_section']:
-                summary['by_source_section'][source_section] = []
-            summary['by_source_section'][source_section].append(dep)
-            
-            # Count by target section
-            target_section = dep.target_path.split('/')[0] if '/' in dep.target_path else dep.target_path
-            if target_section not in summary['by_target_section']:
-                summary['by_target_section'][target_section] = []
-            summary['by_target_section'][target_section].append(dep)
+            by_type[dep.dependency_type] += 1
+            by_source_section[dep.source_section].append(dep)
+            by_target_section[dep.target_section].append(dep)
         
-        return summary
+        return {
+            'total_dependencies': len(dependencies),
+            'by_type': dict(by_type),
+            'by_source_section': dict(by_source_section),
+            'by_target_section': dict(by_target_section)
+        }
 
 
 # Setup rich console for output
 console = Console()
 
+# Pre-built styles for diff lines; Text objects with these skip the markup parser
+_STYLE_DIFF_HEADER = Style(color="cyan")
+_STYLE_DIFF_ADD = Style(color="green")
+_STYLE_DIFF_DEL = Style(color="red")
+
 # Project root path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -155,17 +156,80 @@ if IMPACT_RULES_FILE.exists():
 else:
     console.print(f"[yellow]Warning: Impact resolution rules file not found at {IMPACT_RULES_FILE}[/yellow]")
 
+# Successful text-to-YANG conversions, persisted so repeated runs on an unchanged file skip parsing
+TEXT_CONVERSION_CACHE_DIR = PROJECT_ROOT / ".cache" / "text_conversions"
+_text_conversion_cache: Dict[tuple, tuple] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _text_converter_fingerprint() -> str:
+    """Size/mtime of the loader and parser sources, so converter edits invalidate cached conversions."""
+    digest = hashlib.sha256()
+    for package in ("loaders", "parsing"):
+        for source in sorted((PROJECT_ROOT / "src" / package).glob("*.py")):
+            stat = source.stat()
+            digest.update(f"{package}/{source.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
 
-def _process_config_file(file_path: str, analysis_mode: str = "partial") -> Dict[str, Any]:
+def _convert_text_config(file_path: str, vendor: Optional[str]) -> tuple:
+    """
+    Convert a text configuration to YANG, reusing the result of an earlier conversion.
+
+    Args:
+        file_path: Path to the text configuration file
+        vendor: Detected vendor, or None to let the converter decide
+
+    Returns:
+        Tuple of (success, yang_data, error_message, conversion_metadata) from TextToYangConverter.convert
+    """
+    stat = os.stat(file_path)
+    cache_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, vendor)
+    cached = _text_conversion_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    cache_file = TEXT_CONVERSION_CACHE_DIR / (
+        hashlib.sha256(repr((cache_key, _text_converter_fingerprint())).encode()).hexdigest()[:32] + ".pkl"
+    )
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        cached = None
+    if cached is not None:
+        _text_conversion_cache[cache_key] = cached
+        return cached
+
+    from src.loaders.text_to_yang_converter import TextToYangConverter
+    result = TextToYangConverter().convert(file_path, vendor)
+    if result[0]:
+        _text_conversion_cache[cache_key] = result
+        try:
+            TEXT_CONVERSION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            logging.getLogger(__name__).debug(f"Could not write text conversion cache: {e}")
+    return result
+
+
+def _process_config_file(file_path: str, analysis_mode: str = "partial",
+                         proceed: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, Any]]:
     """
     Process configuration file, automatically detecting format and converting text to YANG if needed.
     Maintains backward compatibility with existing YANG-based workflow.
     
     Args:
         file_path: Path to configuration file (text or YANG format)
+        proceed: Optional check run after format detection, before any output or
+            conversion; returning False stops processing
         
     Returns:
-        Processed configuration as dictionary (always in YANG format)
+        Processed configuration as dictionary (always in YANG format),
+        or None when proceed returned False
         
     Raises:
         Exception: If file format cannot be detected or conversion fails
@@ -178,11 +242,18 @@ def _process_config_file(file_path: str, analysis_mode: str = "partial") -> Dict
         if not os.path.isfile(file_path):
             raise Exception(f"Path is not a file: {file_path}")
         
+        # Import text configuration processing modules (new modular components)
+        from src.loaders.format_detector import FormatDetector, ConfigFormat
+        
         # Detect configuration format
-        console.print(f"[dim]Analyzing configuration format: {Path(file_path).name}[/dim]")
         format_detector = FormatDetector()
         detected_format, format_error, format_metadata = format_detector.detect_format(file_path)
         
+        if proceed is not None and not proceed():
+            return None
+        
+        console.print(f"[dim]Analyzing configuration format: {Path(file_path).name}[/dim]")
+        
         if detected_format == ConfigFormat.UNKNOWN:
             # Provide helpful error message with format hints
             error_msg = f"Could not detect configuration format"
@@ -202,7 +273,16 @@ def _process_config_file(file_path: str, analysis_mode: str = "partial") -> Dict
             try:
                 # Load directly using existing config loader
                 config_loader = ConfigLoader(PROJECT_ROOT)
-                config = config_loader.load_proposed_config(file_path)
+                detected_document = format_metadata.get('document')
+                proposed_path = config_loader.resolve_proposed_path(file_path)
+                if (detected_document is not None and
+                        proposed_path.suffix.lower() in ('.json', '.xml') and
+                        proposed_path.resolve() == Path(file_path).resolve()):
+                    # Format detection already parsed this exact file; don't parse it twice.
+                    # Other suffixes go through the loader, which rejects them
+                    config = detected_document
+                else:
+                    config = config_loader.load_proposed_config(file_path)
                 if not config:
                     raise Exception(f"YANG configuration file appears to be empty or invalid")
                 return config
@@ -234,8 +314,7 @@ def _process_config_file(file_path: str, analysis_mode: str = "partial") -> Dict
             console.print("[blue]Converting text configuration to YANG format...[/blue]")
             
             try:
-                text_converter = TextToYangConverter()
-                success, yang_data, error_message, conversion_metadata = text_converter.convert(
+                success, yang_data, error_message, conversion_metadata = _convert_text_config(
                     file_path, 
                     vendor if vendor != 'unknown' else None
                 )
@@ -307,7 +386,51 @@ def _process_config_file(file_path: str, analysis_mode: str = "partial") -> Dict
             raise
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """
+    Click group whose optional command sets are registered on first use.
+    Keeps the Neo4j driver and graph analysis imports out of analyze/list-devices startup.
+    Help output is built from static summaries so --help never triggers registration.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Command name -> (function that registers it and its siblings on this group, short help)
+        self.lazy_commands: Dict[str, Tuple[Callable[[click.Group], None], str]] = {}
+    
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+    
+    def get_command(self, ctx, cmd_name):
+        entry = self.lazy_commands.get(cmd_name)
+        if entry is not None and cmd_name not in self.commands:
+            register = entry[0]
+            # A register function may provide several commands; run it only once
+            for name in [name for name, (func, _) in self.lazy_commands.items() if func is register]:
+                del self.lazy_commands[name]
+            register(self)
+        return super().get_command(ctx, cmd_name)
+    
+    def format_commands(self, ctx, formatter):
+        commands = []
+        for name in self.list_commands(ctx):
+            if name in self.lazy_commands and name not in self.commands:
+                # Placeholder carrying only the summary; the real command is imported when run
+                commands.append((name, click.Command(name, help=self.lazy_commands[name][1])))
+                continue
+            cmd = super().get_command(ctx, name)
+            if cmd is None or cmd.hidden:
+                continue
+            commands.append((name, cmd))
+        
+        if commands:
+            # Same spacing rule as click.Group.format_commands
+            limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+            with formatter.section('Commands'):
+                formatter.write_dl([(name, cmd.get_short_help_str(limit)) for name, cmd in commands])
+
+
+@click.group(cls=LazyGroup)
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose logging')
 def cli(verbose):
     """Network Configuration Impact Analysis Platform - Production Version."""
@@ -339,27 +462,41 @@ def analyze(device: str, proposed: str, replace: bool, detailed: bool, verbose:
     diff_engine = GenericDiffEngine(PROJECT_ROOT / "models" / "yang")
     
     # Use TRUE schema-driven analyzer instead of old heuristic-based one
-    true_analyzer = TrueSchemaDrivenAnalyzer()
-    dependency_analyzer = TrueSchemaAnalyzerBridge(PROJECT_ROOT)
+    true_analyzer = _get_analyzer()
+    dependency_analyzer = TrueSchemaAnalyzerBridge(PROJECT_ROOT, true_analyzer)
     
     try:
         # Load configurations
         console.print(f"[blue]Loading configurations for device: {device}[/blue]")
         
-        current_config = config_loader.load_current_config(device)
+        # The current config is an independent file read; load it on a worker thread
+        # while the proposed file is format-detected here. Processing waits for it
+        # before printing or converting anything, so a missing device still fails first
+        analysis_mode = "full" if replace else "partial"
+        proposed_error = None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            current_future = executor.submit(config_loader.load_current_config, device)
+            
+            # Use new modular config processing (handles both text and YANG formats)
+            try:
+                proposed_config = _process_config_file(
+                    proposed, analysis_mode, proceed=lambda: bool(current_future.result())
+                )
+            except Exception as config_error:
+                proposed_config, proposed_error = None, config_error
+            
+            current_config = current_future.result()
+        
         if not current_config:
             console.print(f"[red]Error: Could not load current config for device {device}[/red]")
             return
-            
-        # Use new modular config processing (handles both text and YANG formats)
-        analysis_mode = "full" if replace else "partial"
-        try:
-            proposed_config = _process_config_file(proposed, analysis_mode)
-            if not proposed_config:
-                console.print(f"[red]Error: Could not process proposed config from {proposed}[/red]")
-                return
-        except Exception as config_error:
-            console.print(f"[red]{config_error}[/red]")
+        
+        if proposed_error is not None:
+            console.print(f"[red]{proposed_error}[/red]")
+            return
+        
+        if not proposed_config:
+            console.print(f"[red]Error: Could not process proposed config from {proposed}[/red]")
             return
         
         console.print("[green]✓ Configurations loaded successfully[/green]")
@@ -372,143 +509,133 @@ def analyze(device: str, proposed: str, replace: bool, detailed: bool, verbose:
         # Use TRUE schema-driven dependency analysis
         console.print("[blue]Analyzing dependencies with TRUE schema-driven approach...[/blue]")
         
-        # Save configs to temp files for TRUE analyzer
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(current_config, f)
-            current_file = f.name
-        
-        try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                json.dump(proposed_config, f)
-                proposed_file = f.name
-            
-            try:
-                # Run TRUE schema-driven analysis
-                schema_result = true_analyzer.analyze_configuration_file(current_file, proposed_file)
-                
-                if schema_result.get('success'):
-                    # Convert TRUE dependencies to CLI-compatible format
-                    dependencies = []
-                    if schema_result.get('dependencies'):
-                        for true_dep in schema_result['dependencies']:
-                            # Try to find matching detailed change path from GenericDiffEngine
-                            detailed_path = true_dep.config_change_path
-                            for change in changes:
-                                if change.path and true_dep.config_change_path in change.path:
-                                    detailed_path = change.path
-                                    break
-                            
-                            # Extract identifier from the detailed path
-                            actual_identifier = _extract_identifier_from_path(detailed_path)
-                            
-                            # Get the actual value of the leafref target (e.g., the ACL name)
-                            actual_source_value_for_dep = _get_object_at_path(current_config, true_dep.affected_leafref_target)
-                            if actual_source_value_for_dep is None:
-                                actual_source_value_for_dep = _get_object_at_path(proposed_config, true_dep.affected_leafref_target)
-
-                            # If it's still None, fallback to the original affected_leafref_source (the path itself)
-                            # This fallback might not be ideal, but keeps the code from breaking.
-                            if actual_source_value_for_dep is None:
-                                actual_source_value_for_dep = true_dep.affected_leafref_source
-
-                            dep = Dependency(
-                                source_path=true_dep.config_change_path,
-                                target_path=true_dep.affected_leafref_target,
-                                dependency_type="schema_leafref",
-                                source_value=actual_identifier, # Use the already extracted actual_identifier
-                                target_object=true_dep.affected_leafref_target,
-                                description=true_dep.leafref_description
-                            )
-                            # Add the actual object identifier as an attribute
-                            dep.actual_object_identifier = actual_identifier
-
-                            # Populate display fields for intuitive output
-                            dep.display_source = str(dep.source_value) # ACL name is already in source_value
-                            dep.config_object_type = _extract_config_object_name(dep.source_path) # Populate config object type
-                            
-                            # Resolve impacted identifiers for display_target
-                            resolved_impacted_identifiers = _resolve_dependency_target_identifiers_from_current_config(dep, current_config)
-                            if resolved_impacted_identifiers:
-                                dep.display_target = ", ".join(resolved_impacted_identifiers)
-                            else:
-                                # Fallback to raw target_path if no specific identifier found
-                                dep.display_target = dep.target_path 
-
-                            dependencies.append(dep)
-                    
-                    # Create a set of source identifiers that already have dependencies
-                    sources_with_dependencies = {dep.display_source for dep in dependencies}
-
-                    # Add changed objects that have no detected dependencies
-                    for change in changes:
-                        change_identifier = _extract_identifier_from_path(change.path)
-                        if change_identifier and change_identifier not in sources_with_dependencies:
-                            # Create a dummy dependency entry for changed objects with no detected dependencies
-                            no_dep_entry = Dependency(
-                                source_path=change.path,
-                                target_path="", # No specific target path
-                                dependency_type="no_dependency",
-                                source_value=change_identifier,
-                                target_object=None,
-                                description="No direct schema-driven dependencies found.",
-                                display_source=change_identifier,
-                                display_target="", # Blank target for no dependency
-                                config_object_type=_extract_config_object_name(change.path) # Populate config object type
-                            )
-                            dependencies.append(no_dep_entry)
-                    
-                    # Expand dependencies with multiple targets into separate entries
-                    expanded_dependencies = []
-                    for dep in dependencies:
-                        if "," in dep.display_target:
-                            targets = [t.strip() for t in dep.display_target.split(',')]
-                            for target in targets:
-                                new_dep = Dependency(
-                                    source_path=dep.source_path,
-                                    target_path=dep.target_path, # Keep original raw target path
-                                    dependency_type=dep.dependency_type,
-                                    source_value=dep.source_value,
-                                    target_object=dep.target_object,
-                                    description=dep.description,
-                                    display_source=dep.display_source,
-                                    display_target=target, # Single target per expanded entry
-                                    config_object_type=dep.config_object_type
-                                )
-                                expanded_dependencies.append(new_dep)
-                        else:
-                            expanded_dependencies.append(dep) # Add as is if single target
-
-                    # Deduplicate the comprehensive list of dependencies (now including expanded ones)
-                    deduplicated_dependencies = []
-                    seen_keys = set()
-                    # Sort dependencies to ensure consistent order for deduplication
-                    # Prioritize dependencies with actual targets over 'no_dependency' entries
-                    expanded_dependencies.sort(key=lambda d: (d.display_source, d.display_target != ""))
-
-                    for dep in expanded_dependencies:
-                        key = (dep.display_source, dep.display_target)
-                        if key not in seen_keys:
-                            seen_keys.add(key)
-                            deduplicated_dependencies.append(dep)
-                    
-                    dependencies = deduplicated_dependencies # Use deduplicated list for summary and display
+        # Run TRUE schema-driven analysis on the in-memory configs (no temp files)
+        schema_result = true_analyzer.analyze_configuration_dicts(current_config, proposed_config)
+
+        if schema_result.get('success'):
+            # Convert TRUE dependencies to CLI-compatible format
+            dependencies = []
+            if schema_result.get('dependencies'):
+                # Many dependencies share a leafref target; both configs are
+                # read-only for this run, so resolve each target path once.
+                # current_objects memoizes current_config lookups for the resolver too.
+                current_objects = {}
+                @functools.lru_cache(maxsize=None)
+                def _leafref_target_value(target_path: str):
+                    value = _get_object_at_path_cached(current_config, target_path, current_objects)
+                    if value is None:
+                        value = _get_object_at_path(proposed_config, target_path)
+                    return value
+
+                change_path_by_prefix = _index_change_paths_by_prefix(changes)
+                acl_index = _build_acl_to_interface_index(current_config)
+
+                for true_dep in schema_result['dependencies']:
+                    # Try to find matching detailed change path from GenericDiffEngine
+                    detailed_path = change_path_by_prefix.get(true_dep.config_change_path)
+                    if detailed_path is None:
+                        # Not a segment-aligned prefix: fall back to a substring scan
+                        detailed_path = true_dep.config_change_path
+                        for change in changes:
+                            if change.path and true_dep.config_change_path in change.path:
+                                detailed_path = change.path
+                                break
+
+                    # Extract identifier from the detailed path
+                    actual_identifier = _extract_identifier_from_path(detailed_path)
+
+                    # Get the actual value of the leafref target (e.g., the ACL name)
+                    actual_source_value_for_dep = _leafref_target_value(true_dep.affected_leafref_target)
+
+                    # If it's still None, fallback to the original affected_leafref_source (the path itself)
+                    # This fallback might not be ideal, but keeps the code from breaking.
+                    if actual_source_value_for_dep is None:
+                        actual_source_value_for_dep = true_dep.affected_leafref_source
+
+                    # Populate every known field at construction time (display_source is the
+                    # ACL name already in source_value); only display_target needs the dep itself
+                    dep = Dependency(
+                        source_path=true_dep.config_change_path,
+                        target_path=true_dep.affected_leafref_target,
+                        dependency_type="schema_leafref",
+                        source_value=actual_identifier, # Use the already extracted actual_identifier
+                        target_object=true_dep.affected_leafref_target,
+                        description=true_dep.leafref_description,
+                        display_source=str(actual_identifier),
+                        config_object_type=_extract_config_object_name(true_dep.config_change_path),
+                        actual_object_identifier=actual_identifier
+                    )
+
+                    # Resolve impacted identifiers for display_target
+                    resolved_impacted_identifiers = _resolve_dependency_target_identifiers_from_current_config(
+                        dep, current_config, acl_index, current_objects
+                    )
+                    if resolved_impacted_identifiers:
+                        dep.display_target = ", ".join(resolved_impacted_identifiers)
+                    else:
+                        # Fallback to raw target_path if no specific identifier found
+                        dep.display_target = dep.target_path 
+
+                    dependencies.append(dep)
+
+            # Create a set of source identifiers that already have dependencies
+            sources_with_dependencies = {dep.display_source for dep in dependencies}
+
+            # Add changed objects that have no detected dependencies
+            for change in changes:
+                change_identifier = _extract_identifier_from_path(change.path)
+                if change_identifier and change_identifier not in sources_with_dependencies:
+                    # Create a dummy dependency entry for changed objects with no detected dependencies
+                    no_dep_entry = Dependency(
+                        source_path=change.path,
+                        target_path="", # No specific target path
+                        dependency_type="no_dependency",
+                        source_value=change_identifier,
+                        target_object=None,
+                        description="No direct schema-driven dependencies found.",
+                        display_source=change_identifier,
+                        display_target="", # Blank target for no dependency
+                        config_object_type=_extract_config_object_name(change.path) # Populate config object type
+                    )
+                    dependencies.append(no_dep_entry)
+
+            # Expand dependencies with multiple targets into separate entries.
+            # Most leafrefs resolve to a single target, so skip the copy when none do.
+            if not any("," in dep.display_target for dep in dependencies):
+                expanded_dependencies = dependencies
+            else:
+                expanded_dependencies = _expand_multi_target_dependencies(dependencies)
+
+            # Deduplicate the comprehensive list of dependencies (now including expanded ones),
+            # keeping the first entry per (source, target). The sort key below is a function of
+            # that pair and sort is stable, so deduplicating before sorting keeps the same
+            # entries in the same order while sorting only the unique ones.
+            unique_dependencies = {}
+            for dep in expanded_dependencies:
+                unique_dependencies.setdefault((dep.display_source, dep.display_target), dep)
+
+            # Sort dependencies to ensure consistent order
+            # Prioritize dependencies with actual targets over 'no_dependency' entries.
+            # The sort key is built from the dedup key, so no attributes are re-read.
+            keyed_dependencies = [
+                ((source, target != ""), dep)
+                for (source, target), dep in unique_dependencies.items()
+            ]
+            keyed_dependencies.sort(key=itemgetter(0))
+            deduplicated_dependencies = [dep for _, dep in keyed_dependencies]
+
+            dependencies = deduplicated_dependencies # Use deduplicated list for summary and display
+
+            # Generate summary using bridge
+            dependency_summary = dependency_analyzer.get_dependency_summary(dependencies)
+
+            console.print(f"[green]✓ TRUE schema-driven analysis completed[/green]")
+            console.print(f"[dim]Found {len(schema_result.get('schema_leafrefs', []))} YANG leafrefs loaded[/dim]")
 
-                    # Generate summary using bridge
-                    dependency_summary = dependency_analyzer.get_dependency_summary(dependencies)
-                    
-                    console.print(f"[green]✓ TRUE schema-driven analysis completed[/green]")
-                    console.print(f"[dim]Found {len(schema_result.get('schema_leafrefs', []))} YANG leafrefs loaded[/dim]")
-                    
-                else:
-                    console.print(f"[red]Error in TRUE schema analysis: {schema_result.get('error', 'Unknown error')}[/red]")
-                    dependencies = []
-                    dependency_summary = {'total_dependencies': 0, 'by_type': {}, 'by_source_section': {}, 'by_target_section': {}}
-                    
-            finally:
-                os.unlink(proposed_file)
-        finally:
-            os.unlink(current_file)
+        else:
+            console.print(f"[red]Error in TRUE schema analysis: {schema_result.get('error', 'Unknown error')}[/red]")
+            dependencies = []
+            dependency_summary = {'total_dependencies': 0, 'by_type': {}, 'by_source_section': {}, 'by_target_section': {}}
         
         # Analyze per-object impact with change context
         impact_analysis = _analyze_per_object_impact(changes, dependencies, current_config)
@@ -549,55 +676,92 @@ def list_devices():
         console.print("[yellow]No proposed configurations found[/yellow]")
 
 
+# Above this many dependencies the Rich table is replaced by plain tab-separated rows
+_PLAIN_DEPENDENCY_ROWS = 5000
+
+# Dependency table columns (Config Type, Source, Target, Type) in one C-level fetch
+_dep_row = attrgetter('config_object_type', 'display_source', 'display_target', 'dependency_type')
+
+
+def _print_plain_dependencies(dependencies: List[Dependency], detailed: bool):
+    """
+    Write dependencies as tab-separated rows, bypassing Rich table layout.
+    Args: dependencies to print and whether to include the description column.
+    """
+    columns = ["Config Type", "Source", "Target", "Type"]
+    if detailed:
+        columns.append("Description")
+    rows = ["\t".join(columns)]
+    for dep in dependencies:
+        config_object_type, display_source, display_target, dependency_type = _dep_row(dep)
+        row = [config_object_type, str(display_source), display_target, dependency_type]
+        if detailed:
+            row.append(dep.description or "No description")
+        rows.append("\t".join(row))
+    rows.append("")
+    console.file.write("\n".join(rows))
+    console.file.flush()
+
+
 def _display_table_results(device: str, proposed_file: str, changes: List[ConfigChange], 
                           dependencies: List[Dependency], change_summary: Dict[str, Any],
                           dependency_summary: Dict[str, Any], detailed: bool, impact_analysis: Dict[str, Any],
                           current_config: Dict, proposed_config: Dict):
-    """Display results in rich table format."""
-    
-    # Header panel
-    console.print(Panel(
-        f"[bold]Configuration Analysis Results[/bold]\n"
-        f"Device: {device} | Proposed: {proposed_file}",
-        style="blue"
-    ))
+    """
+    Display results in rich table format.
+    Each section is collected first and emitted with a single console.print call.
+    """
+    from rich.table import Table
+    from rich.panel import Panel
     
-    # Summary stats
-    console.print(f"\n[bold green]Summary:[/bold green]")
-    console.print(f"  Changes: {change_summary['total_changes']} "
-                 f"(+{change_summary['added']} ~{change_summary['modified']} -{change_summary['deleted']})")
-    console.print(f"  Dependencies: {dependency_summary['total_dependencies']}")
+    # Header panel and summary stats
+    console.print(
+        Panel(
+            f"[bold]Configuration Analysis Results[/bold]\n"
+            f"Device: {device} | Proposed: {proposed_file}",
+            style="blue"
+        ),
+        f"\n[bold green]Summary:[/bold green]",
+        f"  Changes: {change_summary['total_changes']} "
+        f"(+{change_summary['added']} ~{change_summary['modified']} -{change_summary['deleted']})",
+        f"  Dependencies: {dependency_summary['total_dependencies']}",
+        sep="\n"
+    )
     
     # Changes in Unix diff style
     if changes:
-        console.print(f"\n[bold blue]Configuration Changes:[/bold blue]")
+        lines = [f"\n[bold blue]Configuration Changes:[/bold blue]"]
         
         # Group changes by configuration object
-        changes_by_object = {}
+        changes_by_object = defaultdict(list)
         for change in changes:
             # Extract config object name from path
-            config_object = _extract_config_object_name(change.path)
-            if config_object not in changes_by_object:
-                changes_by_object[config_object] = []
-            changes_by_object[config_object].append(change)
+            changes_by_object[_extract_config_object_name(change.path)].append(change)
         
         # Display each config object's changes in diff style
         for config_object, object_changes in changes_by_object.items():
-            console.print(f"\n[cyan]--- {config_object}[/cyan]")
-            console.print(f"[cyan]+++ {config_object} (proposed)[/cyan]")
+            lines.append(Text(f"\n--- {config_object}", style=_STYLE_DIFF_HEADER))
+            lines.append(Text(f"+++ {config_object} (proposed)", style=_STYLE_DIFF_HEADER))
             
+            # Paths and values are plain text (e.g. "acl-set[name='X']"), so they
+            # must not go through the markup parser
             for change in object_changes:
                 if change.change_type == "modified":
-                    console.print(f"[red]- {change.path}: {change.old_value}[/red]")
-                    console.print(f"[green]+ {change.path}: {change.new_value}[/green]")
+                    lines.append(Text(f"- {change.path}: {change.old_value}", style=_STYLE_DIFF_DEL))
+                    lines.append(Text(f"+ {change.path}: {change.new_value}", style=_STYLE_DIFF_ADD))
                 elif change.change_type == "added":
-                    console.print(f"[green]+ {change.path}: {change.new_value}[/green]")
+                    lines.append(Text(f"+ {change.path}: {change.new_value}", style=_STYLE_DIFF_ADD))
                 elif change.change_type == "deleted":
-                    console.print(f"[red]- {change.path}: {change.old_value}[/red]")
+                    lines.append(Text(f"- {change.path}: {change.old_value}", style=_STYLE_DIFF_DEL))
+        
+        console.print(*lines, sep="\n")
     
     # Dependencies table with meaningful object names
-    if dependencies:
+    if len(dependencies) > _PLAIN_DEPENDENCY_ROWS:
+        # Rich measures every cell; very large tables are written as tab-separated rows
         console.print(f"\n[bold blue]Configuration Dependencies:[/bold blue]")
+        _print_plain_dependencies(dependencies, detailed)
+    elif dependencies:
         deps_table = Table(show_header=True, header_style="bold magenta")
         deps_table.add_column("Config Type", style="magenta") # New column
         deps_table.add_column("Source", style="cyan")
@@ -607,37 +771,30 @@ def _display_table_results(device: str, proposed_file: str, changes: List[Config
         if detailed:
             deps_table.add_column("Description", style="white")
         
-        for dep in dependencies:
-            if detailed:
-                deps_table.add_row(
-                    dep.config_object_type, # New field
-                    dep.display_source, # Use new display field
-                    dep.display_target, # Use new display field
-                    dep.dependency_type,
-                    dep.description or "No description"
-                )
-            else:
-                deps_table.add_row(
-                    dep.config_object_type, # New field
-                    dep.display_source, # Use new display field
-                    dep.display_target, # Use new display field
-                    dep.dependency_type
-                )
+        add_row = deps_table.add_row
+        if detailed:
+            for dep in dependencies:
+                add_row(*_dep_row(dep), dep.description or "No description")
+        else:
+            for dep in dependencies:
+                add_row(*_dep_row(dep))
         
-        console.print(deps_table)
+        console.print(f"\n[bold blue]Configuration Dependencies:[/bold blue]", deps_table, sep="\n")
     
     # Impact Analysis per changed config object
     if impact_analysis and impact_analysis['object_impacts']:
-        console.print(f"\n[bold blue]Configuration Impact Analysis:[/bold blue]")
-        console.print("[dim]For each changed configuration object → impacted components:[/dim]")
+        lines = [
+            f"\n[bold blue]Configuration Impact Analysis:[/bold blue]",
+            "[dim]For each changed configuration object → impacted components:[/dim]"
+        ]
         
         for config_object, impacts in impact_analysis['object_impacts'].items():
             if impacts:
-                console.print(f"\n[bold cyan]{config_object}[/bold cyan]")
-                console.print(f"  [yellow]Changes:[/yellow] {impacts['change_count']} modifications")
+                lines.append(f"\n[bold cyan]{config_object}[/bold cyan]")
+                lines.append(f"  [yellow]Changes:[/yellow] {impacts['change_count']} modifications")
                 
                 if impacts['dependencies'] or impacts.get('all_identifiers'):
-                    console.print(f"  [red]Impacts:[/red]")
+                    lines.append(f"  [red]Impacts:[/red]")
                     
                     # Use the combined identifiers from impact analysis
                     all_identifiers = impacts.get('all_identifiers', [])
@@ -645,25 +802,35 @@ def _display_table_results(device: str, proposed_file: str, changes: List[Config
                     # Display all meaningful identifiers
                     if all_identifiers:
                         for identifier in all_identifiers:
-                            console.print(f"    • {identifier}")
+                            lines.append(f"    • {identifier}")
                     else:
-                        console.print(f"    • Schema references detected but no specific identifiers extracted")
+                        lines.append(f"    • Schema references detected but no specific identifiers extracted")
                 else:
-                    console.print(f"  [green]No downstream dependencies found[/green]")
+                    lines.append(f"  [green]No downstream dependencies found[/green]")
+        
+        console.print(*lines, sep="\n")
     
     # Section summaries if detailed
     if detailed:
+        lines = []
         if change_summary['changes_by_section']:
-            console.print(f"\n[bold blue]Changes by Section:[/bold blue]")
+            lines.append(f"\n[bold blue]Changes by Section:[/bold blue]")
             for section, section_changes in change_summary['changes_by_section'].items():
-                console.print(f"  [cyan]{section}:[/cyan] {len(section_changes)} changes")
+                lines.append(f"  [cyan]{section}:[/cyan] {len(section_changes)} changes")
         
         if dependency_summary['by_source_section']:
-            console.print(f"\n[bold blue]Dependencies by Section:[/bold blue]")
+            lines.append(f"\n[bold blue]Dependencies by Section:[/bold blue]")
             for section, deps in dependency_summary['by_source_section'].items():
-                console.print(f"  [cyan]{section}:[/cyan] {len(deps)} dependencies")
+                lines.append(f"  [cyan]{section}:[/cyan] {len(deps)} dependencies")
+        
+        if lines:
+            console.print(*lines, sep="\n")
+
 
+_DASH_TO_SPACE = str.maketrans('-', ' ')
 
+
+@functools.lru_cache(maxsize=1024)
 def _extract_config_object_name(path: str) -> str:
     """
     Extract meaningful configuration object name from path.
@@ -674,29 +841,32 @@ def _extract_config_object_name(path: str) -> str:
     if path == "device":
         return "Device Information"
     
-    # Extract the main configuration section
-    parts = path.split('/')
-    if len(parts) >= 1:
-        main_section = parts[0]
-        
-        # Clean up OpenConfig module prefixes
-        if ':' in main_section:
-            main_section = main_section.split(':')[1]
-        
-        # Handle specific patterns
-        if 'network-instance' in main_section:
-            return "BGP Configuration"
-        elif 'acl' in main_section:
-            return "Access Control Lists"
-        elif 'vlan' in main_section:
-            return "VLAN Configuration"  
-        elif 'interface' in main_section:
-            return "Interface Configuration"
-        else:
-            # Capitalize and clean up
-            return main_section.replace('-', ' ').title()
+    # Extract the main configuration section (only the first segment is needed)
+    main_section = path.partition('/')[0]
+    
+    # Clean up OpenConfig module prefixes
+    if ':' in main_section:
+        main_section = main_section.split(':', 2)[1]
     
-    return "Configuration"
+    # Handle specific patterns
+    if 'network-instance' in main_section:
+        return "BGP Configuration"
+    elif 'acl' in main_section:
+        return "Access Control Lists"
+    elif 'vlan' in main_section:
+        return "VLAN Configuration"  
+    elif 'interface' in main_section:
+        return "Interface Configuration"
+    else:
+        # Capitalize and clean up
+        return main_section.translate(_DASH_TO_SPACE).title()
+
+
+# Dependency dedup key within an impacted object: (target_path, source_value)
+_dep_key = attrgetter('target_path', 'source_value')
+
+# Bracketed key of each path segment: first '[...]' of the segment, non-empty, no '/'
+_SEGMENT_ID_RE = re.compile(r'(?:^|/)[^/\[\]]*\[([^/\]]+)\]')
 
 
 def _analyze_per_object_impact(changes: List[ConfigChange], dependencies: List[Dependency], current_config: Dict) -> Dict[str, Any]:
@@ -706,67 +876,104 @@ def _analyze_per_object_impact(changes: List[ConfigChange], dependencies: List[D
     Returns: Dictionary with per-object impact analysis.
     """
     # Group changes by configuration object
-    changes_by_object = {}
+    changes_by_object = defaultdict(list)
     for change in changes:
-        config_object = _extract_config_object_name(change.path)
-        if config_object not in changes_by_object:
-            changes_by_object[config_object] = []
-        changes_by_object[config_object].append(change)
+        changes_by_object[_extract_config_object_name(change.path)].append(change)
+    
+    # Index dependencies by their object identifier so each change looks up its
+    # related dependencies instead of scanning all of them. Entries keep their
+    # position so matches can be merged back into dependency order.
+    deps_by_object = defaultdict(list)
+    unkeyed_deps = []
+    for position, dep in enumerate(dependencies):
+        dep_object = _extract_config_object_identifier(dep.source_path)
+        if dep_object:
+            deps_by_object[dep_object].append((position, dep))
+        else:
+            unkeyed_deps.append((position, dep))
     
     # Map dependencies to their source configuration objects
     object_impacts = {}
     for config_object, object_changes in changes_by_object.items():
         # Find dependencies that originate from this config object's changes
+        # (same decision as _path_relates_to_change: identifiers must match when
+        # both paths have one, otherwise fall back to path matching). Keyed
+        # dependencies never need the fallback unless the change itself has no key.
         object_dependencies = []
         for change in object_changes:
-            for dep in dependencies:
-                # Check if this dependency relates to the changed path
-                if _path_relates_to_change(dep.source_path, change.path):
-                    object_dependencies.append(dep)
+            change_object = _extract_config_object_identifier(change.path)
+            if not change_object:
+                object_dependencies.extend(
+                    dep for dep in dependencies if _path_segments_overlap(dep.source_path, change.path)
+                )
+                continue
+            
+            keyed_matches = deps_by_object.get(change_object, ())
+            if not unkeyed_deps:
+                object_dependencies.extend(dep for _, dep in keyed_matches)
+                continue
+            
+            unkeyed_matches = [
+                (position, dep) for position, dep in unkeyed_deps
+                if _path_segments_overlap(dep.source_path, change.path)
+            ]
+            if unkeyed_matches:
+                object_dependencies.extend(dep for _, dep in heapq.merge(keyed_matches, unkeyed_matches))
+            else:
+                object_dependencies.extend(dep for _, dep in keyed_matches)
         
         # Extract ALL identifiers from configuration changes (what's being changed)
+        # Lists keep display order; the sets alongside them answer membership checks
         changed_identifiers = []
+        changed_set = set()
         for change in object_changes:
             # Extract ALL bracketed identifiers from change path
-            parts = change.path.split('/')
-            for part in parts:
-                if '[' in part and ']' in part:
-                    start = part.find('[') + 1
-                    end = part.find(']')
-                    if start < end:
-                        identifier = part[start:end]
-                        if identifier not in changed_identifiers and not identifier.isdigit():
-                            changed_identifiers.append(identifier)
+            for identifier in _SEGMENT_ID_RE.findall(change.path):
+                if identifier not in changed_set and not identifier.isdigit():
+                    changed_set.add(identifier)
+                    changed_identifiers.append(identifier)
         
         # Resolve impacted identifiers from schema dependencies (what's being impacted)
+        # and deduplicate dependencies by target_path + source_value in the same pass
         impacted_identifiers = []
+        impacted_set = set()
+        unique_dependencies = []
+        seen = set()
+        processed = set()
         for dep in object_dependencies:
+            # The same dependency matched through another change adds nothing new
+            if id(dep) in processed:
+                continue
+            processed.add(id(dep))
+            
+            key = _dep_key(dep)
+            if key not in seen:
+                seen.add(key)
+                unique_dependencies.append(dep)
+            
             # Use the display_target which has resolved interface names
-            if hasattr(dep, 'display_target') and dep.display_target and dep.display_target != dep.target_path:
-                # If we have a resolved display_target, use it
-                target_names = [name.strip() for name in dep.display_target.split(',')]
+            display_target = dep.display_target
+            if display_target and display_target != dep.target_path:
+                # If we have a resolved display_target, use it (usually a single name)
+                if ',' in display_target:
+                    target_names = [name.strip() for name in display_target.split(',')]
+                else:
+                    target_names = (display_target.strip(),)
                 for name in target_names:
-                    if name and name not in changed_identifiers and name not in impacted_identifiers:
+                    if name and name not in changed_set and name not in impacted_set:
+                        impacted_set.add(name)
                         impacted_identifiers.append(name)
             else:
                 # Fallback to old method
                 resolved_identifiers = _resolve_dependency_target_identifiers(dep, current_config)
                 for identifier in resolved_identifiers:
-                    if identifier not in changed_identifiers and identifier not in impacted_identifiers:
+                    if identifier not in changed_set and identifier not in impacted_set:
+                        impacted_set.add(identifier)
                         impacted_identifiers.append(identifier)
         
         # Combine all identifiers
         all_identifiers = changed_identifiers + impacted_identifiers
         
-        # Deduplicate dependencies by target_path + source_value combination
-        unique_dependencies = []
-        seen = set()
-        for dep in object_dependencies:
-            key = (dep.target_path, dep.source_value)
-            if key not in seen:
-                seen.add(key)
-                unique_dependencies.append(dep)
-        
         object_impacts[config_object] = {
             'change_count': len(object_changes),
             'dependencies': unique_dependencies,
@@ -780,6 +987,26 @@ def _analyze_per_object_impact(changes: List[ConfigChange], dependencies: List[D
     }
 
 
+_PATH_BOUNDARY_RE = re.compile(r'[/\[]')
+
+
+def _index_change_paths_by_prefix(changes: List[ConfigChange]) -> Dict[str, str]:
+    """
+    Index change paths by every prefix ending at a '/' or '[' boundary (and the full path).
+    Args: changes from the diff engine, in display order.
+    Returns: Mapping of prefix to the first change path that starts with it.
+    """
+    change_path_by_prefix = {}
+    for change in changes:
+        path = change.path
+        if not path:
+            continue
+        for boundary in _PATH_BOUNDARY_RE.finditer(path):
+            change_path_by_prefix.setdefault(path[:boundary.start()], path)
+        change_path_by_prefix.setdefault(path, path)
+    return change_path_by_prefix
+
+
 def _path_relates_to_change(dependency_path: str, change_path: str) -> bool:
     """
     Check if a dependency path relates to a configuration change path.
@@ -796,69 +1023,83 @@ def _path_relates_to_change(dependency_path: str, change_path: str) -> bool:
         return dep_object == change_object
     
     # Fallback to simpler path matching
-    dep_parts = dependency_path.split('/')
-    change_parts = change_path.split('/')
-    
-    # Check if change path is a subset or parent of dependency path
-    for i in range(min(len(change_parts), len(dep_parts))):
-        if change_parts[i] in dep_parts[i]:
-            return True
-    
-    return False
+    return _path_segments_overlap(dependency_path, change_path)
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_path(path: str) -> tuple:
+    """Path segments split on '/', cached because the same paths are compared repeatedly."""
+    return tuple(path.split('/'))
+
+
+def _path_segments_overlap(dependency_path: str, change_path: str) -> bool:
+    """
+    Path-matching fallback for paths without bracket identifiers.
+    Args: dependency_path and change_path to compare.
+    Returns: True if any aligned segment is identical (exact match, so e.g. 'acl'
+    does not match every segment containing it).
+    """
+    return any(map(str.__eq__, _split_path(change_path), _split_path(dependency_path)))
 
 
+@functools.lru_cache(maxsize=4096)
 def _extract_config_object_identifier(path: str) -> Optional[str]:
     """
     Extract configuration object identifier from path for relationship matching.
     Args: path to extract identifier from.
     Returns: Object identifier or None.
     """
-    path_parts = path.split('/')
-    
     # Look for list keys in brackets
-    for part in path_parts:
-        if '[' in part and ']' in part:
-            start = part.find('[') + 1
-            end = part.find(']')
-            if start < end:
-                return part[start:end]
-    
-    return None
+    match = _SEGMENT_ID_RE.search(path)
+    return match.group(1) if match else None
 
 
-def _get_object_at_path(config: Dict, path: str):
+@functools.lru_cache(maxsize=4096)
+def _parse_object_path(path: str) -> tuple:
     """
-    Generically retrieves an object from a config dictionary given a YANG-like path.
-    Handles lists with keys in brackets (e.g., interface[name='Ethernet1']).
+    Split a YANG-like path into lookup steps for _get_object_at_path.
+    Args: path like "openconfig-interfaces:interfaces/interface[name='Ethernet1']".
+    Returns: Tuple of (name, key_field, key_value) steps; key_field is None for plain dict keys.
     """
-    current_obj = config
-    path_parts = path.strip('/').split('/')
-
-    for part in path_parts:
-        if not current_obj:
-            return None
-
+    steps = []
+    for part in path.strip('/').split('/'):
         # Handle module prefixes (e.g., openconfig-interfaces:interfaces)
         if ':' in part:
-            part = part.split(':')[-1]
+            part = part.rpartition(':')[2]
 
         # Handle list keys (e.g., interface[name='Ethernet1'])
         if '[' in part and ']' in part:
             list_name = part.split('[')[0]
             key_part = part[part.find('[') + 1 : part.find(']')]
             
-            key_field = None
-            key_value = None
             if '=' in key_part:
                 key_field, key_value = key_part.split('=', 1)
                 key_value = key_value.strip("'\"") # Remove quotes
             else:
                 key_field = 'name' # Common default for list keys
                 key_value = key_part
+            steps.append((list_name, key_field, key_value))
+        else:
+            # Regular dictionary key
+            steps.append((part, None, None))
+    return tuple(steps)
+
 
-            if list_name in current_obj and isinstance(current_obj[list_name], list):
+def _get_object_at_path(config: Dict, path: str):
+    """
+    Generically retrieves an object from a config dictionary given a YANG-like path.
+    Handles lists with keys in brackets (e.g., interface[name='Ethernet1']).
+    """
+    current_obj = config
+
+    for name, key_field, key_value in _parse_object_path(path):
+        if not current_obj:
+            return None
+
+        if key_field is not None:
+            if name in current_obj and isinstance(current_obj[name], list):
                 found_item = None
-                for item in current_obj[list_name]:
+                for item in current_obj[name]:
                     if isinstance(item, dict) and key_field in item and str(item[key_field]) == key_value:
                         found_item = item
                         break
@@ -867,89 +1108,114 @@ def _get_object_at_path(config: Dict, path: str):
                 return None # List not found or not a list
         else:
             # Regular dictionary key
-            if part in current_obj:
-                current_obj = current_obj[part]
+            if name in current_obj:
+                current_obj = current_obj[name]
             else:
                 return None # Part not found
 
     return current_obj
 
 
+def _get_object_at_path_cached(config: Dict, path: str, path_cache: Dict[str, Any]):
+    """
+    _get_object_at_path memoized in path_cache.
+    Args: config to search, path to resolve, and a cache dict dedicated to this config.
+    Returns: The object at path, or None.
+    """
+    try:
+        return path_cache[path]
+    except KeyError:
+        value = path_cache[path] = _get_object_at_path(config, path)
+        return value
+
+
 def _extract_identifiers_from_object(obj):
     """
     Helper to extract common identifiers from a single dictionary object.
     """
     obj_identifiers = []
     if isinstance(obj, dict):
-        for field in ['name', 'id', 'vlan-id', 'sequence-id', 'interface-id', 'set-name']:
-            if field in obj and obj[field]:
-                identifier = str(obj[field])
+        for key in ['name', 'id', 'vlan-id', 'sequence-id', 'interface-id', 'set-name']:
+            if key in obj and obj[key]:
+                identifier = str(obj[key])
                 if not identifier.isdigit(): # Skip numeric identifiers
                     obj_identifiers.append(identifier)
     return obj_identifiers
 
 
-def _resolve_dependency_target_identifiers_from_current_config(dep: Dependency, current_config: Dict) -> List[str]:
+def _resolve_dependency_target_identifiers_from_current_config(dep: Dependency, current_config: Dict,
+                                                               acl_index: Optional[Dict[str, List[str]]] = None,
+                                                               path_cache: Optional[Dict[str, Any]] = None) -> List[str]:
     """
     Resolve actual impacted identifiers from dependency target paths.
     Uses generic path resolution and config searching to find actual object names.
+    Callers resolving many dependencies should pass a prebuilt _build_acl_to_interface_index
+    and a path_cache dict that lives as long as current_config is unchanged.
     """
     identifiers = []
+    seen = set()
 
     # 1. Try to extract identifiers directly from the target_path (most generic and direct)
     extracted_from_path = _extract_identifier_from_path(dep.target_path)
-    if extracted_from_path and extracted_from_path not in identifiers:
+    if extracted_from_path:
+        seen.add(extracted_from_path)
         identifiers.append(extracted_from_path)
 
     # 2. If no identifier found from path, try to resolve the target_path in current_config
     #    and then extract identifiers from the resolved object.
     if not identifiers:
-        target_object = _get_object_at_path(current_config, dep.target_path)
+        if path_cache is None:
+            target_object = _get_object_at_path(current_config, dep.target_path)
+        else:
+            target_object = _get_object_at_path_cached(current_config, dep.target_path, path_cache)
         if target_object:
             resolved_obj_identifiers = _extract_identifiers_from_object(target_object)
             for identifier in resolved_obj_identifiers:
-                if identifier not in identifiers:
+                if identifier not in seen:
+                    seen.add(identifier)
                     identifiers.append(identifier)
     
     # 3. As fallback, search for interfaces that reference this ACL (generic pattern matching)
     if not identifiers and "acl" in dep.source_path.lower():
         acl_name = dep.source_value
-        if acl_name and "openconfig-interfaces:interfaces" in current_config:
-            interfaces = current_config["openconfig-interfaces:interfaces"].get("interface", [])
-            for iface in interfaces:
-                if "name" in iface:
-                    # Check if interface has ACL applied (generic pattern)
-                    if _interface_references_acl(iface, acl_name):
-                        if iface["name"] not in identifiers:
-                            identifiers.append(iface["name"])
+        if acl_name:
+            if acl_index is None:
+                acl_index = _build_acl_to_interface_index(current_config)
+            for interface_name in acl_index.get(acl_name, ()):
+                if interface_name not in seen:
+                    seen.add(interface_name)
+                    identifiers.append(interface_name)
     
     return identifiers
 
 
-def _interface_references_acl(interface_config: Dict, acl_name: str) -> bool:
+def _build_acl_to_interface_index(current_config: Dict) -> Dict[str, List[str]]:
     """
-    Generic check if interface configuration references an ACL.
-    Searches through interface structure for ACL references.
+    Map each ACL set name to the interfaces that apply it (ingress or egress).
+    Args: current_config with an openconfig-interfaces:interfaces section.
+    Returns: Dictionary of ACL name to interface names, in interface order.
     """
-    # Look for ACL references in interface config
-    if "openconfig-acl:acl" in interface_config:
-        acl_config = interface_config["openconfig-acl:acl"]
+    acl_index = defaultdict(list)
+    if "openconfig-interfaces:interfaces" not in current_config:
+        return acl_index
+    
+    interfaces = current_config["openconfig-interfaces:interfaces"].get("interface", [])
+    for iface in interfaces:
+        if "name" not in iface or "openconfig-acl:acl" not in iface:
+            continue
+        acl_config = iface["openconfig-acl:acl"]
         
-        # Check ingress ACL sets
+        # Collect ingress and egress ACL sets applied to this interface
+        applied_sets = []
         if "ingress-acl-sets" in acl_config:
-            ingress_sets = acl_config["ingress-acl-sets"].get("ingress-acl-set", [])
-            for acl_set in ingress_sets:
-                if acl_set.get("set-name") == acl_name:
-                    return True
-        
-        # Check egress ACL sets
+            applied_sets.extend(acl_config["ingress-acl-sets"].get("ingress-acl-set", []))
         if "egress-acl-sets" in acl_config:
-            egress_sets = acl_config["egress-acl-sets"].get("egress-acl-set", [])
-            for acl_set in egress_sets:
-                if acl_set.get("set-name") == acl_name:
-                    return True
-                    
-    return False
+            applied_sets.extend(acl_config["egress-acl-sets"].get("egress-acl-set", []))
+        
+        for set_name in {acl_set.get("set-name") for acl_set in applied_sets}:
+            acl_index[set_name].append(iface["name"])
+    
+    return acl_index
 
 
 def _resolve_dependency_target_identifiers(dep: Dependency, current_config: Dict) -> List[str]:
@@ -976,6 +1242,39 @@ def _resolve_dependency_target_identifiers(dep: Dependency, current_config: Dict
     return identifiers
 
 
+def _expand_multi_target_dependencies(dependencies: List[Dependency]) -> List[Dependency]:
+    """
+    Split dependencies whose display_target lists several identifiers into one entry per target.
+
+    Args:
+        dependencies: Dependencies with comma-joined display targets
+
+    Returns:
+        New list with a single display target per entry
+    """
+    expanded_dependencies = []
+    for dep in dependencies:
+        if "," in dep.display_target:
+            targets = [t.strip() for t in dep.display_target.split(',')]
+            for target in targets:
+                new_dep = Dependency(
+                    source_path=dep.source_path,
+                    target_path=dep.target_path, # Keep original raw target path
+                    dependency_type=dep.dependency_type,
+                    source_value=dep.source_value,
+                    target_object=dep.target_object,
+                    description=dep.description,
+                    display_source=dep.display_source,
+                    display_target=target, # Single target per expanded entry
+                    config_object_type=dep.config_object_type
+                )
+                expanded_dependencies.append(new_dep)
+        else:
+            expanded_dependencies.append(dep) # Add as is if single target
+    return expanded_dependencies
+
+
+@functools.lru_cache(maxsize=8192)
 def _extract_identifier_from_path(path: str) -> str:
     """
     Extract actual object identifier from path.
@@ -983,22 +1282,37 @@ def _extract_identifier_from_path(path: str) -> str:
     Returns: Object name like "USER_INBOUND_V4"
     """
     # Look for bracketed identifiers in the path
-    parts = path.split('/')
-    for part in parts:
-        if '[' in part and ']' in part:
-            start = part.find('[') + 1
-            end = part.find(']')
-            if start < end:
-                identifier = part[start:end]
-                # Skip numeric identifiers (sequence numbers)
-                return identifier
-    return ""
+    match = _SEGMENT_ID_RE.search(path)
+    return match.group(1) if match else ""
+
+
+def _dependency_to_dict(dep: Dependency) -> Dict[str, Any]:
+    """JSON representation of a dependency, shared by the list and the summaries."""
+    return {
+        "source_path": dep.source_path,
+        "target_path": dep.target_path,
+        "dependency_type": dep.dependency_type,
+        "source_value": dep.source_value,
+        "target_object": dep.target_object,
+        "description": dep.description
+    }
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dump fallback for dependencies nested in the summaries; anything else is stringified."""
+    if isinstance(obj, Dependency):
+        return _dependency_to_dict(obj)
+    return str(obj)
 
 
 def _display_json_results(changes: List[ConfigChange], dependencies: List[Dependency],
                          change_summary: Dict[str, Any], dependency_summary: Dict[str, Any],
                          impact_analysis: Dict[str, Any]):
-    """Display results in JSON format."""
+    """
+    Display results in JSON format.
+    The document is streamed straight to stdout rather than built as a string and
+    passed through Rich, which would also re-highlight it.
+    """
     result = {
         "summary": {
             "changes": change_summary,
@@ -1015,59 +1329,59 @@ def _display_json_results(changes: List[ConfigChange], dependencies: List[Depend
             }
             for change in changes
         ],
-        "dependencies": [
-            {
-                "source_path": dep.source_path,
-                "target_path": dep.target_path,
-                "dependency_type": dep.dependency_type,
-                "source_value": dep.source_value,
-                "target_object": dep.target_object,
-                "description": dep.description
-            }
-            for dep in dependencies
-        ]
+        "dependencies": [_dependency_to_dict(dep) for dep in dependencies]
     }
     
-    console.print(json.dumps(result, indent=2))
+    json.dump(result, sys.stdout, indent=2, default=_json_default)
+    sys.stdout.write("\n")
 
 
 # ==================== NEO4J GRAPH DATABASE INTEGRATION ====================
 
-try:
-    # Handle both relative and absolute imports for simplified graph commands
+def _register_graph_commands(main_cli_group: click.Group):
+    """Import and register the Neo4j graph database commands (ingest, show)."""
     try:
-        from .simple_graph_commands import register_simple_graph_commands
-    except ImportError:
-        from simple_graph_commands import register_simple_graph_commands
-    
-    # Register Neo4j graph database commands
-    register_simple_graph_commands(cli)
-    
-    # Register enhanced multi-device analysis
+        # Handle both relative and absolute imports for simplified graph commands
+        try:
+            from .simple_graph_commands import register_simple_graph_commands
+        except ImportError:
+            from simple_graph_commands import register_simple_graph_commands
+        
+        # Register Neo4j graph database commands
+        register_simple_graph_commands(main_cli_group)
+        print("✅ Neo4j graph database commands loaded successfully", file=sys.stderr)
+        
+    except ImportError as e:
+        print(f"⚠️ Warning: Neo4j graph commands not available: {e}", file=sys.stderr)
+        print("   Run with --verbose for more details", file=sys.stderr)
+    except Exception as e:
+        print(f"❌ Error loading graph commands: {e}", file=sys.stderr)
+
+
+def _register_enhanced_analysis_commands(main_cli_group: click.Group):
+    """Import and register the enhanced multi-device analysis command (graph)."""
     try:
         try:
             from .enhanced_analysis import register_enhanced_analysis_commands
         except ImportError:
             from enhanced_analysis import register_enhanced_analysis_commands
         
-        register_enhanced_analysis_commands(cli)
+        register_enhanced_analysis_commands(main_cli_group)
         print("✅ Enhanced multi-device analysis commands loaded", file=sys.stderr)
         
     except ImportError as e:
         print(f"⚠️ Warning: Enhanced analysis not available: {e}", file=sys.stderr)
     except Exception as e:
         print(f"❌ Error loading enhanced analysis: {e}", file=sys.stderr)
-    
-    import sys
-    print("✅ Neo4j graph database commands loaded successfully", file=sys.stderr)
-    
-except ImportError as e:
-    import sys
-    print(f"⚠️ Warning: Neo4j graph commands not available: {e}", file=sys.stderr)
-    print("   Run with --verbose for more details", file=sys.stderr)
-except Exception as e:
-    import sys
-    print(f"❌ Error loading graph commands: {e}", file=sys.stderr)
+
+
+# Registered on first use so commands that don't touch Neo4j skip these imports
+cli.lazy_commands.update({
+    'ingest': (_register_graph_commands, 'Graph database ingestion commands.'),
+    'show': (_register_graph_commands, 'Graph database status and visualization commands.'),
+    'graph': (_register_enhanced_analysis_commands,
+              'Analyze configuration changes with cross-device graph-based impact analysis.'),
+})
 
 
 if __name__ == '__main__':
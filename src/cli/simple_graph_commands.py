@@ -3,15 +3,20 @@ Simplified Neo4j Graph Database CLI Commands.
 Uses direct Neo4j connections to avoid import issues.
 """
 
+import atexit
 import click
+import functools
 import os
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.tree import Tree
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+
+from src.config import config
 
 console = Console()
 
@@ -21,15 +26,294 @@ load_dotenv()
 NEO4J_URI = os.getenv('NEO4J_URI', 'bolt://localhost:7688')
 NEO4J_USERNAME = os.getenv('NEO4J_USERNAME', 'neo4j')
 NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', 'netopo123')
+NEO4J_POOL_SIZE = int(os.getenv('NEO4J_POOL', '20'))
+
+# Overview counts for 'show status'; each CALL returns exactly one row
+_Q_STATUS_COUNTS = """
+    CALL { MATCH (n) RETURN count(n) AS total_nodes }
+    CALL { MATCH ()-[r]->() RETURN count(r) AS total_relationships }
+    CALL { MATCH (d:Device) RETURN count(d) AS device_count }
+    CALL { MATCH (i:Interface) RETURN count(i) AS interface_count }
+    RETURN total_nodes, total_relationships, device_count, interface_count
+"""
+
+# Node count per label combination, largest first
+_Q_LABEL_COUNTS = "MATCH (n) RETURN labels(n) as labels, count(n) as count ORDER BY count DESC"
+
+# Device inventory with interface counts for 'show devices'
+_Q_DEVICE_INVENTORY = """
+    MATCH (d:Device)
+    OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
+    OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i:Interface)
+    RETURN d.hostname as hostname,
+           ds.vendor as vendor,
+           ds.os_type as os_type,
+           ds.platform as platform,
+           ds.management_ip as mgmt_ip,
+           count(i) as interface_count
+    ORDER BY hostname
+"""
+
+# Physical links between device interfaces
+_Q_TOPOLOGY_CONNECTIONS = """
+    MATCH (i1:Interface)-[c:CONNECTED_TO]->(i2:Interface)
+    MATCH (d1:Device)-[:HAS_INTERFACE]->(i1)
+    MATCH (d2:Device)-[:HAS_INTERFACE]->(i2)
+    RETURN d1.hostname as device1, i1.name as int1,
+           d2.hostname as device2, i2.name as int2,
+           c.discovered_via as method
+    ORDER BY device1, device2
+"""
+
+# BGP peer counts and up to three sample ASNs per device
+_Q_TOPOLOGY_BGP = """
+    MATCH (d:Device)-[:BGP_PEER_WITH]->(p:BGPPeer)
+    OPTIONAL MATCH (p)-[:LATEST]->(ps:BGPPeerState)
+    RETURN d.hostname as device,
+           count(p) as peer_count,
+           collect(DISTINCT ps.peer_asn)[0..3] as sample_asns
+    ORDER BY device
+"""
+
+# Device header, first 20 interface names and VLAN ids in one round trip; parameter: $hostname.
+# No index hints: the planner picks device_hostname_unique and vlan_device_idx when they exist,
+# and the query still runs on a graph whose schema was never initialized
+_Q_DEVICE_DETAIL = """
+    MATCH (d:Device {hostname: $hostname})
+    OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
+    CALL {
+        WITH d
+        OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i:Interface)
+        WITH i.name AS interface_name
+        ORDER BY interface_name
+        LIMIT 20
+        RETURN collect(interface_name) AS interfaces
+    }
+    CALL {
+        WITH d
+        OPTIONAL MATCH (v:VLAN {device_hostname: d.hostname})
+        WITH v.vlan_number AS vlan_id
+        ORDER BY vlan_id
+        RETURN collect(vlan_id) AS vlans
+    }
+    RETURN d.hostname as hostname,
+           ds.vendor as vendor,
+           ds.os_type as os_type,
+           ds.platform as platform,
+           ds.management_ip as mgmt_ip,
+           ds.timestamp as last_update,
+           interfaces,
+           vlans
+"""
+
+# Batched ingestion writes; parameter: $rows, a list of flat row maps
+_Q_MERGE_DEVICES = """
+    UNWIND $rows AS row
+    MERGE (d:Device {hostname: row.hostname})
+    SET d += row.props
+"""
+
+_Q_MERGE_INTERFACES = """
+    UNWIND $rows AS row
+    MATCH (d:Device {hostname: row.device_hostname})
+    MERGE (i:Interface {interface_id: row.interface_id})
+    SET i += row.props, i.device_hostname = row.device_hostname
+    MERGE (d)-[:HAS_INTERFACE]->(i)
+"""
+
+_Q_MERGE_CONNECTIONS = """
+    UNWIND $rows AS row
+    MATCH (i1:Interface {interface_id: row.source_interface_id})
+    MATCH (i2:Interface {interface_id: row.target_interface_id})
+    MERGE (i1)-[c:CONNECTED_TO]->(i2)
+    SET c.discovered_via = row.method
+"""
+
+# Queries that 'show plan' can profile, by name
+_PROFILED_QUERIES = {
+    'status': _Q_STATUS_COUNTS,
+    'labels': _Q_LABEL_COUNTS,
+    'devices': _Q_DEVICE_INVENTORY,
+    'connections': _Q_TOPOLOGY_CONNECTIONS,
+    'bgp': _Q_TOPOLOGY_BGP,
+    'device': _Q_DEVICE_DETAIL,
+}
+
+# Process-wide driver shared by all commands; closed at interpreter exit
+_DRIVER = None
 
 
 def get_neo4j_driver():
-    """Get Neo4j driver with error handling."""
-    try:
-        return GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
-    except Exception as e:
-        console.print(f"[red]❌ Failed to connect to Neo4j: {e}[/red]")
-        return None
+    """
+    Get the shared Neo4j driver, creating it on first use.
+    Commands must not close it; the connection pool is reused until exit.
+    """
+    global _DRIVER
+    if _DRIVER is None:
+        # Imported here so that registering the commands (and --help) does not load the driver
+        from neo4j import GraphDatabase
+        try:
+            _DRIVER = GraphDatabase.driver(
+                NEO4J_URI,
+                auth=(NEO4J_USERNAME, NEO4J_PASSWORD),
+                max_connection_pool_size=NEO4J_POOL_SIZE,
+                connection_acquisition_timeout=30,
+                max_connection_lifetime=3600
+            )
+        except Exception as e:
+            console.print(f"[red]❌ Failed to connect to Neo4j: {e}[/red]")
+            return None
+        atexit.register(_close_neo4j_driver)
+    return _DRIVER
+
+
+def _ttl_lru_cache(maxsize: int, ttl: float, cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    LRU cache decorator whose entries also expire ttl seconds after they were stored.
+    When cache_if is given, only results it returns True for are stored.
+    The wrapper exposes cache_info() and cache_clear() like functools.lru_cache.
+    """
+    def decorator(func):
+        entries = OrderedDict()
+        stats = {'hits': 0, 'misses': 0}
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            entry = entries.get(args)
+            if entry is not None and now - entry[0] < ttl:
+                entries.move_to_end(args)
+                stats['hits'] += 1
+                return entry[1]
+            
+            stats['misses'] += 1
+            value = func(*args)
+            if cache_if is not None and not cache_if(value):
+                return value
+            entries[args] = (now, value)
+            entries.move_to_end(args)
+            if len(entries) > maxsize:
+                entries.popitem(last=False)
+            return value
+        
+        def cache_info() -> Dict[str, int]:
+            return {**stats, 'size': len(entries), 'maxsize': maxsize, 'ttl': ttl}
+        
+        def cache_clear():
+            entries.clear()
+            stats['hits'] = stats['misses'] = 0
+        
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+def _read_query(driver, query: str, result_transformer=None, **parameters):
+    """
+    Run a read query through the driver's managed execute_query API.
+    The driver owns the session, routes the query to a reader and retries transient errors.
+    Returns: EagerResult, or whatever result_transformer returns.
+    """
+    from neo4j import RoutingControl
+    options = {'result_transformer_': result_transformer} if result_transformer else {}
+    return driver.execute_query(query, parameters, routing_=RoutingControl.READ,
+                                database_=config.NEO4J_DATABASE, **options)
+
+
+def _read_records(driver, query: str, **parameters) -> list:
+    """Run a read query and return all of its records."""
+    return _read_query(driver, query, **parameters).records
+
+
+def _read_rows(driver, query: str, to_row, **parameters) -> list:
+    """
+    Run a read query, converting records to rows as they stream in.
+    Records are released as soon as they are converted instead of being held as a list.
+    """
+    return _read_query(driver, query, lambda result: [to_row(record) for record in result], **parameters)
+
+
+def _write_batches(session, query: str, rows: list, batch_size: int) -> int:
+    """
+    Run an UNWIND write query over rows, batch_size rows per managed write transaction.
+    Returns: Number of rows sent.
+    """
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+    return len(rows)
+
+
+def batch_merge_devices(session, devices: list, batch_size: int = config.GRAPH_BATCH_SIZE) -> int:
+    """
+    Merge Device nodes in batches.
+    Args: session, devices as [{'hostname': str, 'props': dict}], batch_size rows per transaction.
+    Returns: Number of rows sent.
+    """
+    return _write_batches(session, _Q_MERGE_DEVICES, devices, batch_size)
+
+
+def batch_merge_interfaces(session, interfaces: list, batch_size: int = config.GRAPH_BATCH_SIZE) -> int:
+    """
+    Merge Interface nodes and their HAS_INTERFACE links in batches.
+    Args: session, interfaces as [{'device_hostname': str, 'interface_id': str, 'props': dict}],
+          batch_size rows per transaction.
+    Returns: Number of rows sent.
+    """
+    return _write_batches(session, _Q_MERGE_INTERFACES, interfaces, batch_size)
+
+
+def batch_merge_connections(session, connections: list, batch_size: int = config.GRAPH_BATCH_SIZE) -> int:
+    """
+    Merge CONNECTED_TO links between existing interfaces in batches.
+    Args: session, connections as [{'source_interface_id': str, 'target_interface_id': str, 'method': str}],
+          batch_size rows per transaction.
+    Returns: Number of rows sent.
+    """
+    return _write_batches(session, _Q_MERGE_CONNECTIONS, connections, batch_size)
+
+
+def _inventory_row(record) -> tuple:
+    """Convert a device inventory record to a table row."""
+    return (
+        record['hostname'] or 'unknown',
+        record['vendor'] or 'unknown',
+        record['os_type'] or 'unknown',
+        record['platform'] or 'unknown',
+        record['mgmt_ip'] or 'unknown',
+        str(record['interface_count'] or 0)
+    )
+
+
+def _connection_row(record) -> tuple:
+    """Convert a physical connection record to a table row."""
+    return (
+        record['device1'],
+        record['int1'],
+        record['device2'],
+        record['int2'],
+        record['method'] or 'lldp'
+    )
+
+
+def _bgp_row(record) -> tuple:
+    """Convert a BGP peering record to a table row."""
+    sample_asns = [str(asn) for asn in record['sample_asns'] if asn is not None]
+    asn_display = ', '.join(sample_asns) + '...' if len(sample_asns) == 3 else ', '.join(sample_asns)
+    return (
+        record['device'],
+        str(record['peer_count']),
+        asn_display if sample_asns else 'unknown'
+    )
+
+
+def _close_neo4j_driver():
+    """Close the shared driver, if one was created."""
+    global _DRIVER
+    if _DRIVER is not None:
+        _DRIVER.close()
+        _DRIVER = None
 
 
 @click.group(name='ingest')
@@ -51,29 +335,26 @@ def all():
         return
         
     try:
-        with driver.session() as session:
-            # Show current data
-            result = session.run("MATCH (n) RETURN labels(n) as labels, count(n) as count ORDER BY count DESC")
-            
-            table = Table(title="Current Database Content")
-            table.add_column("Node Type", style="cyan")
-            table.add_column("Count", style="magenta", justify="right")
-            
-            total_nodes = 0
-            for record in result:
-                labels = record["labels"]
-                count = record["count"]
-                total_nodes += count
-                label_str = ":".join(labels) if labels else "No Label"
-                table.add_row(label_str, str(count))
-            
-            console.print(table)
-            console.print(f"[dim]Total nodes: {total_nodes}[/dim]")
+        # Show current data
+        result = _read_records(driver, _Q_LABEL_COUNTS)
+        
+        table = Table(title="Current Database Content")
+        table.add_column("Node Type", style="cyan")
+        table.add_column("Count", style="magenta", justify="right")
+        
+        total_nodes = 0
+        for record in result:
+            labels = record["labels"]
+            count = record["count"]
+            total_nodes += count
+            label_str = ":".join(labels) if labels else "No Label"
+            table.add_row(label_str, str(count))
+        
+        console.print(table)
+        console.print(f"[dim]Total nodes: {total_nodes}[/dim]")
             
     except Exception as e:
         console.print(f"[red]❌ Failed to query database: {e}[/red]")
-    finally:
-        driver.close()
 
 
 @ingest_group.command()
@@ -126,53 +407,44 @@ def status():
         return
     
     try:
-        with driver.session() as session:
-            # Database overview
-            result = session.run("MATCH (n) RETURN count(n) as total_nodes")
-            total_nodes = result.single()["total_nodes"]
-            
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as total_relationships")
-            total_rels = result.single()["total_relationships"]
-            
-            result = session.run("MATCH (d:Device) RETURN count(d) as device_count")
-            device_count = result.single()["device_count"]
-            
-            result = session.run("MATCH (i:Interface) RETURN count(i) as interface_count")  
-            interface_count = result.single()["interface_count"]
-            
-            # Status panel
-            console.print(Panel.fit(
-                f"[bold blue]🏗️ Neo4j Graph Database Status[/bold blue]\n\n"
-                f"[bold]Database URI:[/bold] {NEO4J_URI}\n"
-                f"[bold]Total Nodes:[/bold] {total_nodes:,}\n"
-                f"[bold]Total Relationships:[/bold] {total_rels:,}\n"
-                f"[bold]Devices:[/bold] {device_count}\n"
-                f"[bold]Interfaces:[/bold] {interface_count}\n"
-                f"[bold]Status:[/bold] [green]OPERATIONAL ✅[/green]",
-                title="Database Overview",
-                border_style="blue"
-            ))
-            
-            # Node type distribution
-            result = session.run("MATCH (n) RETURN labels(n) as labels, count(n) as count ORDER BY count DESC")
-            
-            nodes_table = Table(title="📋 Node Type Distribution")
-            nodes_table.add_column("Node Type", style="cyan", no_wrap=True)
-            nodes_table.add_column("Count", style="magenta", justify="right")
-            
-            for record in result:
-                labels = record["labels"]
-                count = record["count"]
-                if count > 0:
-                    label_str = ":".join(labels) if labels else "No Label"
-                    nodes_table.add_row(label_str, str(count))
-            
-            console.print(nodes_table)
+        # Database overview (all four counts in one round-trip)
+        counts = _read_records(driver, _Q_STATUS_COUNTS)[0]
+        total_nodes = counts["total_nodes"]
+        total_rels = counts["total_relationships"]
+        device_count = counts["device_count"]
+        interface_count = counts["interface_count"]
+        
+        # Status panel
+        console.print(Panel.fit(
+            f"[bold blue]🏗️ Neo4j Graph Database Status[/bold blue]\n\n"
+            f"[bold]Database URI:[/bold] {NEO4J_URI}\n"
+            f"[bold]Total Nodes:[/bold] {total_nodes:,}\n"
+            f"[bold]Total Relationships:[/bold] {total_rels:,}\n"
+            f"[bold]Devices:[/bold] {device_count}\n"
+            f"[bold]Interfaces:[/bold] {interface_count}\n"
+            f"[bold]Status:[/bold] [green]OPERATIONAL ✅[/green]",
+            title="Database Overview",
+            border_style="blue"
+        ))
+        
+        # Node type distribution
+        result = _read_records(driver, _Q_LABEL_COUNTS)
+        
+        nodes_table = Table(title="📋 Node Type Distribution")
+        nodes_table.add_column("Node Type", style="cyan", no_wrap=True)
+        nodes_table.add_column("Count", style="magenta", justify="right")
+        
+        for record in result:
+            labels = record["labels"]
+            count = record["count"]
+            if count > 0:
+                label_str = ":".join(labels) if labels else "No Label"
+                nodes_table.add_row(label_str, str(count))
+        
+        console.print(nodes_table)
             
     except Exception as e:
         console.print(f"[red]❌ Failed to retrieve status: {e}[/red]")
-    finally:
-        driver.close()
 
 
 @show_group.command()
@@ -197,6 +469,71 @@ def device(hostname):
     _show_device_impl(hostname)
 
 
+@_ttl_lru_cache(maxsize=8, ttl=config.CACHE_TTL_SECONDS)
+def _fetch_device_inventory(driver) -> list:
+    """Fetch the device inventory as table rows (cached for CACHE_TTL_SECONDS)."""
+    return _read_rows(driver, _Q_DEVICE_INVENTORY, _inventory_row)
+
+
+@show_group.command(name='cache-stats')
+def cache_stats():
+    """Show hit/miss statistics of the in-process graph query caches."""
+    table = Table(title="Graph Query Caches")
+    table.add_column("Cache", style="cyan")
+    for column in ("Hits", "Misses", "Size", "Max Size", "TTL (s)"):
+        table.add_column(column, style="magenta", justify="right")
+    
+    for name, cached in (("device", _fetch_device), ("device inventory", _fetch_device_inventory)):
+        info = cached.cache_info()
+        table.add_row(name, str(info['hits']), str(info['misses']), str(info['size']),
+                      str(info['maxsize']), str(info['ttl']))
+    
+    console.print(table)
+
+
+@show_group.command(name='cache-clear')
+def cache_clear():
+    """Clear the in-process graph query caches."""
+    _fetch_device.cache_clear()
+    _fetch_device_inventory.cache_clear()
+    console.print("[green]✓ Graph query caches cleared[/green]")
+
+
+@show_group.command()
+@click.argument('query', type=click.Choice(sorted(_PROFILED_QUERIES)))
+@click.option('--hostname', default='', help='Device hostname for the device query')
+def plan(query, hostname):
+    """PROFILE one of the show queries and print its execution plan."""
+    driver = get_neo4j_driver()
+    if not driver:
+        return
+    
+    try:
+        profile = _read_query(driver, "PROFILE " + _PROFILED_QUERIES[query], hostname=hostname).summary.profile
+        if not profile:
+            console.print("[yellow]No profile returned by the server[/yellow]")
+            return
+        
+        tree = Tree(f"[bold blue]📈 Plan for '{query}'[/bold blue]")
+        stack = [(tree, profile)]
+        total_db_hits = 0
+        while stack:
+            parent, operator = stack.pop()
+            total_db_hits += operator.get('dbHits', 0)
+            details = operator.get('args', {}).get('Details', '')
+            node = parent.add(
+                f"[cyan]{operator.get('operatorType', '?')}[/cyan] "
+                f"rows={operator.get('rows', 0)} dbHits={operator.get('dbHits', 0)} [dim]{details}[/dim]"
+            )
+            stack.extend((node, child) for child in reversed(operator.get('children', [])))
+        
+        console.print(tree)
+        console.print(f"[dim]Total db hits: {total_db_hits}[/dim]")
+        
+    except Exception as e:
+        console.print(f"[red]❌ Failed to profile query: {e}[/red]")
+
+
 def _show_devices_impl():
     """Implementation for showing devices."""
     driver = get_neo4j_driver()
@@ -204,47 +541,24 @@ def _show_devices_impl():
         return
     
     try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (d:Device)
-                OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
-                OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i:Interface)
-                RETURN d.hostname as hostname,
-                       ds.vendor as vendor,
-                       ds.os_type as os_type,
-                       ds.platform as platform,
-                       ds.management_ip as mgmt_ip,
-                       count(i) as interface_count
-                ORDER BY hostname
-            """)
-            
-            devices_table = Table(title="Device Inventory")
-            devices_table.add_column("Hostname", style="green", no_wrap=True)
-            devices_table.add_column("Vendor", style="cyan")
-            devices_table.add_column("OS Type", style="cyan")
-            devices_table.add_column("Platform", style="magenta")
-            devices_table.add_column("Management IP", style="blue")
-            devices_table.add_column("Interfaces", style="yellow", justify="right")
-            
-            device_count = 0
-            for record in result:
-                devices_table.add_row(
-                    record['hostname'] or 'unknown',
-                    record['vendor'] or 'unknown',
-                    record['os_type'] or 'unknown',
-                    record['platform'] or 'unknown',
-                    record['mgmt_ip'] or 'unknown',
-                    str(record['interface_count'] or 0)
-                )
-                device_count += 1
-            
-            console.print(devices_table)
-            console.print(f"[dim]Total devices: {device_count}[/dim]")
-            
+        rows = _fetch_device_inventory(driver)
+        
+        devices_table = Table(title="Device Inventory")
+        devices_table.add_column("Hostname", style="green", no_wrap=True)
+        devices_table.add_column("Vendor", style="cyan")
+        devices_table.add_column("OS Type", style="cyan")
+        devices_table.add_column("Platform", style="magenta")
+        devices_table.add_column("Management IP", style="blue")
+        devices_table.add_column("Interfaces", style="yellow", justify="right")
+        
+        for row in rows:
+            devices_table.add_row(*row)
+        
+        console.print(devices_table)
+        console.print(f"[dim]Total devices: {len(rows)}[/dim]")
+        
     except Exception as e:
         console.print(f"[red]❌ Failed to retrieve devices: {e}[/red]")
-    finally:
-        driver.close()
 
 
 def _show_topology_impl():
@@ -254,77 +568,59 @@ def _show_topology_impl():
         return
     
     try:
-        with driver.session() as session:
-            # Physical connections
-            console.print("[bold cyan]🔗 Physical Network Connections[/bold cyan]")
-            
-            result = session.run("""
-                MATCH (i1:Interface)-[c:CONNECTED_TO]->(i2:Interface)
-                MATCH (d1:Device)-[:HAS_INTERFACE]->(i1)
-                MATCH (d2:Device)-[:HAS_INTERFACE]->(i2)
-                RETURN d1.hostname as device1, i1.name as int1,
-                       d2.hostname as device2, i2.name as int2,
-                       c.discovered_via as method
-                ORDER BY device1, device2
-            """)
-            
-            connections_table = Table()
-            connections_table.add_column("Source Device", style="green")
-            connections_table.add_column("Source Interface", style="cyan")
-            connections_table.add_column("Target Device", style="green")
-            connections_table.add_column("Target Interface", style="cyan")
-            connections_table.add_column("Discovery Method", style="dim")
-            
-            connection_count = 0
-            for record in result:
-                connections_table.add_row(
-                    record['device1'],
-                    record['int1'],
-                    record['device2'],
-                    record['int2'],
-                    record['method'] or 'lldp'
-                )
-                connection_count += 1
-            
-            if connection_count > 0:
-                console.print(connections_table)
-                console.print(f"[dim]Total connections: {connection_count}[/dim]")
-            else:
-                console.print("[yellow]No physical connections found[/yellow]")
-            
-            # BGP peering summary
-            console.print(f"\n[bold cyan]🌐 BGP Peering Summary[/bold cyan]")
-            
-            result = session.run("""
-                MATCH (d:Device)-[:BGP_PEER_WITH]->(p:BGPPeer)
-                OPTIONAL MATCH (p)-[:LATEST]->(ps:BGPPeerState)
-                RETURN d.hostname as device,
-                       count(p) as peer_count,
-                       collect(DISTINCT ps.peer_asn)[0..3] as sample_asns
-                ORDER BY device
-            """)
-            
-            bgp_table = Table()
-            bgp_table.add_column("Device", style="green")
-            bgp_table.add_column("BGP Peers", style="magenta", justify="right")
-            bgp_table.add_column("Sample ASNs", style="cyan")
-            
-            for record in result:
-                sample_asns = [str(asn) for asn in record['sample_asns'] if asn is not None]
-                asn_display = ', '.join(sample_asns) + '...' if len(sample_asns) == 3 else ', '.join(sample_asns)
-                
-                bgp_table.add_row(
-                    record['device'],
-                    str(record['peer_count']),
-                    asn_display if sample_asns else 'unknown'
-                )
-            
-            console.print(bgp_table)
+        # Physical connections
+        console.print("[bold cyan]🔗 Physical Network Connections[/bold cyan]")
+        
+        rows = _read_rows(driver, _Q_TOPOLOGY_CONNECTIONS, _connection_row)
+        
+        connections_table = Table()
+        connections_table.add_column("Source Device", style="green")
+        connections_table.add_column("Source Interface", style="cyan")
+        connections_table.add_column("Target Device", style="green")
+        connections_table.add_column("Target Interface", style="cyan")
+        connections_table.add_column("Discovery Method", style="dim")
+        
+        for row in rows:
+            connections_table.add_row(*row)
+        
+        if rows:
+            console.print(connections_table)
+            console.print(f"[dim]Total connections: {len(rows)}[/dim]")
+        else:
+            console.print("[yellow]No physical connections found[/yellow]")
+        
+        # BGP peering summary
+        console.print(f"\n[bold cyan]🌐 BGP Peering Summary[/bold cyan]")
+        
+        rows = _read_rows(driver, _Q_TOPOLOGY_BGP, _bgp_row)
+        
+        bgp_table = Table()
+        bgp_table.add_column("Device", style="green")
+        bgp_table.add_column("BGP Peers", style="magenta", justify="right")
+        bgp_table.add_column("Sample ASNs", style="cyan")
+        
+        for row in rows:
+            bgp_table.add_row(*row)
+        
+        console.print(bgp_table)
             
     except Exception as e:
         console.print(f"[red]❌ Failed to retrieve topology data: {e}[/red]")
-    finally:
-        driver.close()
+
+
+# Misses are not cached, so a device ingested later in the same process shows up at once
+@_ttl_lru_cache(maxsize=256, ttl=config.CACHE_TTL_SECONDS, cache_if=lambda result: result[0] is not None)
+def _fetch_device(driver, hostname: str):
+    """
+    Fetch a device's header record, interface names and VLAN ids (cached for CACHE_TTL_SECONDS).
+    Returns: Tuple of (device_record or None, interface names, VLAN ids).
+    """
+    detail = _read_records(driver, _Q_DEVICE_DETAIL, hostname=hostname)
+    
+    if not detail:
+        return None, [], []
+    device_record = detail[0]
+    return device_record, device_record['interfaces'], device_record['vlans']
 
 
 def _show_device_impl(hostname: str):
@@ -334,72 +630,44 @@ def _show_device_impl(hostname: str):
         return
     
     try:
-        with driver.session() as session:
-            # Device basic info
-            result = session.run("""
-                MATCH (d:Device {hostname: $hostname})
-                OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
-                RETURN d.hostname as hostname,
-                       ds.vendor as vendor,
-                       ds.os_type as os_type,
-                       ds.platform as platform,
-                       ds.management_ip as mgmt_ip,
-                       ds.timestamp as last_update
-            """, hostname=hostname)
-            
-            device_record = result.single()
-            if not device_record:
-                console.print(f"[red]❌ Device '{hostname}' not found in graph database[/red]")
-                return
-            
-            # Device info panel
-            last_update = device_record['last_update']
-            update_str = str(last_update) if last_update else 'unknown'
-            
-            console.print(Panel.fit(
-                f"[bold]Hostname:[/bold] {device_record['hostname']}\n"
-                f"[bold]Vendor:[/bold] {device_record['vendor'] or 'unknown'}\n"
-                f"[bold]OS Type:[/bold] {device_record['os_type'] or 'unknown'}\n"
-                f"[bold]Platform:[/bold] {device_record['platform'] or 'unknown'}\n"
-                f"[bold]Management IP:[/bold] {device_record['mgmt_ip'] or 'unknown'}\n"
-                f"[bold]Last Update:[/bold] {update_str}",
-                title=f"Device: {hostname}",
-                border_style="blue"
-            ))
-            
-            # Interface summary
-            result = session.run("""
-                MATCH (d:Device {hostname: $hostname})-[:HAS_INTERFACE]->(i:Interface)
-                RETURN i.name as interface_name
-                ORDER BY i.name
-                LIMIT 20
-            """, hostname=hostname)
-            
-            interfaces = [record['interface_name'] for record in result]
-            if interfaces:
-                console.print(f"\n[bold cyan]🔌 Interfaces ({len(interfaces)}):[/bold cyan]")
-                interface_text = ", ".join(interfaces)
-                if len(interfaces) == 20:
-                    interface_text += "..."
-                console.print(f"[dim]{interface_text}[/dim]")
-            
-            # VLAN summary
-            result = session.run("""
-                MATCH (v:VLAN {device_hostname: $hostname})
-                RETURN v.vlan_number as vlan_id
-                ORDER BY vlan_id
-            """, hostname=hostname)
-            
-            vlans = [record['vlan_id'] for record in result]
-            if vlans:
-                console.print(f"\n[bold yellow]🏷️ VLANs ({len(vlans)}):[/bold yellow]")
-                vlan_text = ", ".join(map(str, vlans))
-                console.print(f"[dim]{vlan_text}[/dim]")
+        device_record, interfaces, vlans = _fetch_device(driver, hostname)
+        
+        # Device basic info
+        if not device_record:
+            console.print(f"[red]❌ Device '{hostname}' not found in graph database[/red]")
+            return
+        
+        # Device info panel
+        last_update = device_record['last_update']
+        update_str = str(last_update) if last_update else 'unknown'
+        
+        console.print(Panel.fit(
+            f"[bold]Hostname:[/bold] {device_record['hostname']}\n"
+            f"[bold]Vendor:[/bold] {device_record['vendor'] or 'unknown'}\n"
+            f"[bold]OS Type:[/bold] {device_record['os_type'] or 'unknown'}\n"
+            f"[bold]Platform:[/bold] {device_record['platform'] or 'unknown'}\n"
+            f"[bold]Management IP:[/bold] {device_record['mgmt_ip'] or 'unknown'}\n"
+            f"[bold]Last Update:[/bold] {update_str}",
+            title=f"Device: {hostname}",
+            border_style="blue"
+        ))
+        
+        # Interface summary
+        if interfaces:
+            console.print(f"\n[bold cyan]🔌 Interfaces ({len(interfaces)}):[/bold cyan]")
+            interface_text = ", ".join(interfaces)
+            if len(interfaces) == 20:
+                interface_text += "..."
+            console.print(f"[dim]{interface_text}[/dim]")
+        
+        # VLAN summary
+        if vlans:
+            console.print(f"\n[bold yellow]🏷️ VLANs ({len(vlans)}):[/bold yellow]")
+            vlan_text = ", ".join(map(str, vlans))
+            console.print(f"[dim]{vlan_text}[/dim]")
             
     except Exception as e:
         console.print(f"[red]❌ Failed to retrieve device details: {e}[/red]")
-    finally:
-        driver.close()
 
 
 # Register command groups with main CLI
@@ -4,6 +4,7 @@ Loads settings from environment variables with sensible defaults.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -12,6 +13,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=None)
+def _path_exists(path: Path) -> bool:
+    """
+    Check whether a configured path exists, probing the filesystem once per process.
+    Args: path to check.
+    Returns: True if the path exists.
+    """
+    return path.exists()
+
+
 class Config:
     """
     Application configuration loaded from environment variables.
@@ -78,7 +89,7 @@ class Config:
     def get_neo4j_config(self) -> dict:
         """
         Get Neo4j connection configuration as dictionary.
-        Returns: Dict with Neo4j connection parameters.
+        Returns: New dict with Neo4j connection parameters, safe for the caller to modify.
         """
         return {
             'uri': self.NEO4J_URI,
@@ -95,13 +106,13 @@ class Config:
         errors = []
 
         # Check required paths exist
-        if not self.DATA_CONFIGS_PATH.exists():
+        if not _path_exists(self.DATA_CONFIGS_PATH):
             errors.append(f"Data configs path does not exist: {self.DATA_CONFIGS_PATH}")
         
-        if not self.DATA_INVENTORY_PATH.exists():
+        if not _path_exists(self.DATA_INVENTORY_PATH):
             errors.append(f"Inventory file does not exist: {self.DATA_INVENTORY_PATH}")
         
-        if not self.YANG_MODELS_PATH.exists():
+        if not _path_exists(self.YANG_MODELS_PATH):
             errors.append(f"YANG models path does not exist: {self.YANG_MODELS_PATH}")
 
         # Validate numeric settings
@@ -141,5 +152,14 @@ class Config:
   Debug: {self.DEBUG_MODE}"""
 
 
+@lru_cache(maxsize=None)
+def get_config() -> Config:
+    """
+    Get the process-wide configuration, building it on first use.
+    Returns: Shared Config instance.
+    """
+    return Config()
+
+
 # Global configuration instance
-config = Config()
\ No newline at end of file
+config = get_config()
\ No newline at end of file
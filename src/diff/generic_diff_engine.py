@@ -7,17 +7,34 @@ from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 import json
 import logging
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 
 
-@dataclass
+# Change description templates; filled in only when a description is read
+_DESC_NEW_SECTION = "New configuration section: {path}"
+_DESC_ADDED = "Added configuration: {path}"
+_DESC_ADDED_ITEM = "Added list item: {path}"
+_DESC_LIST_MODIFIED = "List modified at {path}"
+_DESC_MODIFIED = "Modified {path}: {old} → {new}"
+
+# Marks a key missing from the current config (None is a valid config value)
+_MISSING = object()
+
+
+@dataclass(slots=True, frozen=True)
 class ConfigChange:
     """Represents a single configuration change."""
     path: str
     change_type: str  # 'added', 'deleted', 'modified'
     old_value: Any = None
     new_value: Any = None
-    description: str = ""
+    description_template: str = "{path}"
+    
+    @property
+    def description(self) -> str:
+        """Human-readable description, formatted on access."""
+        return self.description_template.format(path=self.path, old=self.old_value, new=self.new_value)
 
 
 class GenericDiffEngine:
@@ -26,6 +43,15 @@ class GenericDiffEngine:
     Analyzes only configuration objects present in proposed config.
     """
     
+    # Top-level sections that describe the device rather than its configuration
+    _METADATA_SECTIONS = frozenset({'device'})
+    
+    # Common key fields for network config list items, in priority order
+    _KEY_CANDIDATES = ('name', 'id', 'vlan-id', 'sequence-id', 'interface-id')
+    
+    # Leaf-lists whose order carries no meaning; others (e.g. import-policy) are ordered
+    _UNORDERED_LEAF_LISTS = frozenset({'trunk-vlans'})
+    
     def __init__(self, yang_models_path: Optional[Path] = None):
         """
         Initialize generic diff engine.
@@ -41,132 +67,175 @@ class GenericDiffEngine:
         Returns: List of ConfigChange objects for differences found.
         """
         changes = []
-        
-        # Define metadata sections to filter out
-        metadata_sections = {'device'}
+        current_get = current_config.get
         
         # Only analyze config sections present in proposed config (excluding metadata)
-        for top_level_key in proposed_config.keys():
+        for top_level_key, proposed_value in proposed_config.items():
             # Skip metadata sections
-            if top_level_key in metadata_sections:
-                self.logger.debug(f"Skipping metadata section: {top_level_key}")
+            if top_level_key in self._METADATA_SECTIONS:
                 continue
+            
+            current_value = current_get(top_level_key, _MISSING)
+            if current_value is not _MISSING:
+                # Unchanged sections are common in partial configs; dict/list equality
+                # runs in C and stops at the first difference, so check it before walking
+                if current_value == proposed_value:
+                    continue
                 
-            if top_level_key in current_config:
                 # Compare existing section
-                section_changes = self._compare_config_section(
-                    current_config[top_level_key],
-                    proposed_config[top_level_key], 
-                    top_level_key
-                )
-                changes.extend(section_changes)
+                changes.extend(self._compare_config_section(current_value, proposed_value, top_level_key))
             else:
                 # New section being added
                 changes.append(ConfigChange(
                     path=top_level_key,
                     change_type='added',
-                    new_value=proposed_config[top_level_key],
-                    description=f"New configuration section: {top_level_key}"
+                    new_value=proposed_value,
+                    description_template=_DESC_NEW_SECTION
                 ))
         
-        self.logger.info(f"Found {len(changes)} configuration changes")
+        self.logger.info("Found %d configuration changes", len(changes))
         return changes
     
     def _compare_config_section(self, current_section: Any, proposed_section: Any, path: str) -> List[ConfigChange]:
         """
-        Recursively compare configuration sections.
+        Compare configuration sections depth-first.
+        Uses an explicit work stack instead of recursion; changes come out in the same
+        order a recursive walk would produce. Subtrees that are the same object are skipped.
         Args: current_section, proposed_section to compare, path context.
         Returns: List of changes found in this section.
         """
         changes = []
         
-        if isinstance(proposed_section, dict) and isinstance(current_section, dict):
-            # Compare dictionary structures
-            for key, proposed_value in proposed_section.items():
-                key_path = f"{path}/{key}"
-                
-                if key not in current_section:
-                    # Key added
-                    changes.append(ConfigChange(
-                        path=key_path,
-                        change_type='added',
-                        new_value=proposed_value,
-                        description=f"Added configuration: {key_path}"
-                    ))
-                elif current_section[key] != proposed_value:
-                    # Recursively compare nested structures
-                    if isinstance(proposed_value, (dict, list)):
-                        nested_changes = self._compare_config_section(
-                            current_section[key], proposed_value, key_path
-                        )
-                        changes.extend(nested_changes)
-                    else:
-                        # Value modified
-                        changes.append(ConfigChange(
-                            path=key_path,
-                            change_type='modified',
-                            old_value=current_section[key],
-                            new_value=proposed_value,
-                            description=f"Modified {key_path}: {current_section[key]} → {proposed_value}"
-                        ))
-                        
-        elif isinstance(proposed_section, list) and isinstance(current_section, list):
-            # Compare list structures
-            changes.extend(self._compare_lists(current_section, proposed_section, path))
+        # Each entry is a (current, proposed, path) pair still to compare or a finished change;
+        # children are pushed in reverse so they are popped in document order
+        stack = [(current_section, proposed_section, path)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, ConfigChange):
+                changes.append(item)
+                continue
             
-        elif current_section != proposed_section:
-            # Direct value comparison
-            changes.append(ConfigChange(
-                path=path,
-                change_type='modified',
-                old_value=current_section,
-                new_value=proposed_section,
-                description=f"Modified {path}: {current_section} → {proposed_section}"
-            ))
+            current_section, proposed_section, path = item
+            if current_section is proposed_section:
+                continue
+            
+            if isinstance(proposed_section, dict) and isinstance(current_section, dict):
+                stack.extend(reversed(self._dict_work_items(current_section, proposed_section, path)))
+            
+            elif isinstance(proposed_section, list) and isinstance(current_section, list):
+                stack.extend(reversed(self._list_work_items(current_section, proposed_section, path)))
+            
+            elif current_section != proposed_section:
+                # Direct value comparison
+                changes.append(ConfigChange(
+                    path=path,
+                    change_type='modified',
+                    old_value=current_section,
+                    new_value=proposed_section,
+                    description_template=_DESC_MODIFIED
+                ))
         
         return changes
     
-    def _compare_lists(self, current_list: List[Any], proposed_list: List[Any], path: str) -> List[ConfigChange]:
+    def _dict_work_items(self, current_section: Dict[str, Any], proposed_section: Dict[str, Any], path: str) -> List[Any]:
         """
-        Compare list structures intelligently.
-        Args: current_list, proposed_list to compare, path context.
-        Returns: List of changes in list items.
+        Compare dictionary structures one level deep.
+        Args: current_section, proposed_section dicts to compare, path context.
+        Returns: Changes and nested (current, proposed, path) pairs, in key order.
         """
-        changes = []
-        
-        # For simple lists, do direct comparison
-        if all(not isinstance(item, (dict, list)) for item in proposed_list):
-            if current_list != proposed_list:
-                changes.append(ConfigChange(
-                    path=path,
+        items = []
+        for key, proposed_value in proposed_section.items():
+            key_path = f"{path}/{key}"
+            
+            if key not in current_section:
+                # Key added
+                items.append(ConfigChange(
+                    path=key_path,
+                    change_type='added',
+                    new_value=proposed_value,
+                    description_template=_DESC_ADDED
+                ))
+                continue
+            
+            current_value = current_section[key]
+            if current_value is proposed_value or current_value == proposed_value:
+                continue
+            
+            if isinstance(proposed_value, (dict, list)):
+                # Compare nested structures
+                items.append((current_value, proposed_value, key_path))
+            else:
+                # Value modified
+                items.append(ConfigChange(
+                    path=key_path,
                     change_type='modified',
-                    old_value=current_list,
-                    new_value=proposed_list,
-                    description=f"List modified at {path}"
+                    old_value=current_value,
+                    new_value=proposed_value,
+                    description_template=_DESC_MODIFIED
                 ))
-            return changes
+        
+        return items
+    
+    def _list_work_items(self, current_list: List[Any], proposed_list: List[Any], path: str) -> List[Any]:
+        """
+        Compare list structures intelligently, one level deep.
+        Args: current_list, proposed_list to compare, path context.
+        Returns: Changes and nested (current, proposed, path) pairs, in list order.
+        """
+        # For simple lists, do direct comparison
+        if not any(isinstance(item, (dict, list)) for item in proposed_list):
+            if current_list == proposed_list:
+                return []
+            # Reordering a known-unordered leaf-list is not a change; duplicates still count
+            if (path.rsplit('/', 1)[-1] in self._UNORDERED_LEAF_LISTS
+                    and len(current_list) == len(proposed_list)):
+                try:
+                    if Counter(current_list) == Counter(proposed_list):
+                        return []
+                except TypeError:
+                    pass
+            return [ConfigChange(
+                path=path,
+                change_type='modified',
+                old_value=current_list,
+                new_value=proposed_list,
+                description_template=_DESC_LIST_MODIFIED
+            )]
         
         # For complex lists, try to match items by key or position
-        current_items = {self._get_list_item_key(item, i): item for i, item in enumerate(current_list)}
-        proposed_items = {self._get_list_item_key(item, i): item for i, item in enumerate(proposed_list)}
+        current_items = self._index_list_items(current_list, path)
+        proposed_items = self._index_list_items(proposed_list, path)
         
+        items = []
         for key, proposed_item in proposed_items.items():
             item_path = f"{path}[{key}]"
             
             if key not in current_items:
-                changes.append(ConfigChange(
+                items.append(ConfigChange(
                     path=item_path,
                     change_type='added',
                     new_value=proposed_item,
-                    description=f"Added list item: {item_path}"
+                    description_template=_DESC_ADDED_ITEM
                 ))
             elif current_items[key] != proposed_item:
-                nested_changes = self._compare_config_section(
-                    current_items[key], proposed_item, item_path
-                )
-                changes.extend(nested_changes)
+                items.append((current_items[key], proposed_item, item_path))
         
-        return changes
+        return items
+    
+    def _index_list_items(self, items: List[Any], path: str) -> Dict[str, Any]:
+        """
+        Index list items by their identification key.
+        Args: items list to index, path context for duplicate warnings.
+        Returns: Dictionary of key to item; a later duplicate replaces the earlier one.
+        """
+        indexed = {}
+        get_key = self._get_list_item_key
+        for i, item in enumerate(items):
+            key = get_key(item, i)
+            if key in indexed:
+                self.logger.warning("Duplicate list item key '%s' at %s; keeping the last one", key, path)
+            indexed[key] = item
+        return indexed
     
     def _get_list_item_key(self, item: Any, index: int) -> str:
         """
@@ -175,11 +244,11 @@ class GenericDiffEngine:
         Returns: String key for item identification.
         """
         if isinstance(item, dict):
-            # Common key fields for network config
-            key_candidates = ['name', 'id', 'vlan-id', 'sequence-id', 'interface-id']
-            for candidate in key_candidates:
-                if candidate in item:
-                    return str(item[candidate])
+            get = item.get
+            for candidate in self._KEY_CANDIDATES:
+                value = get(candidate)
+                if value is not None:
+                    return str(value)
         
         # Fallback to index
         return str(index)
@@ -190,19 +259,17 @@ class GenericDiffEngine:
         Args: changes list to summarize.
         Returns: Dictionary with change statistics and details.
         """
-        summary = {
-            'total_changes': len(changes),
-            'added': len([c for c in changes if c.change_type == 'added']),
-            'modified': len([c for c in changes if c.change_type == 'modified']),
-            'deleted': len([c for c in changes if c.change_type == 'deleted']),
-            'changes_by_section': {}
-        }
+        counts = {'added': 0, 'modified': 0, 'deleted': 0}
+        changes_by_section = defaultdict(list)
         
-        # Group changes by top-level section
+        # Count change types and group by top-level section in one pass
         for change in changes:
-            section = change.path.split('/')[0]
-            if section not in summary['changes_by_section']:
-                summary['changes_by_section'][section] = []
-            summary['changes_by_section'][section].append(change.description)
+            if change.change_type in counts:
+                counts[change.change_type] += 1
+            changes_by_section[change.path.partition('/')[0]].append(change.description)
         
-        return summary
\ No newline at end of file
+        return {
+            'total_changes': len(changes),
+            **counts,
+            'changes_by_section': dict(changes_by_section)
+        }
@@ -1,434 +1,686 @@
 """
 Parameterized Cypher queries for idempotent graph operations.
 Handles all MERGE statements for nodes, relationships, and state management.
+Queries are module-level constants, with driver Query objects in QUERIES_Q;
+CypherQueries re-exports them as class attributes.
 """
 
-from typing import Dict, Any, List
+from collections import OrderedDict
+from textwrap import indent
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import time
+import zlib
 
+from neo4j import Query
 
-class CypherQueries:
+
+# Temporal state entities: name -> (identity label, identity key, state label, state properties).
+# State properties are passed as one $properties map; the list documents its expected keys
+# (plus content_hash, except for ACLs, which dedupe on rules_hash).
+# Every state write follows the same HAS_STATE / LATEST / PREVIOUS_STATE bookkeeping.
+_STATE_SPECS = {
+    'ACL_STATE': ('ACL', 'acl_id', 'ACLState', ['type', 'rule_count', 'rules_blob', 'rules_hash']),
+    'INTERFACE_STATE': ('Interface', 'interface_id', 'InterfaceState',
+                        ['description', 'type', 'enabled', 'ip_address', 'speed', 'duplex', 'mtu']),
+    'VLAN_STATE': ('VLAN', 'vlan_id', 'VLANState', ['name', 'status', 'stp_priority']),
+    'IPNETWORK_STATE': ('IPNetwork', 'network_id', 'IPNetworkState', ['description', 'vlan_number', 'gateway_ip']),
+    'BGP_PEER_STATE': ('BGPPeer', 'peer_id', 'BGPPeerState', ['peer_asn', 'session_state', 'description']),
+    'OSPF_NEIGHBOR_STATE': ('OSPFNeighbor', 'neighbor_id', 'OSPFNeighborState',
+                            ['neighbor_state', 'cost', 'hello_timer', 'dead_timer']),
+    'DEVICE_LAYOUT': ('Device', 'hostname', 'DeviceLayout',
+                      ['x_position', 'y_position', 'layer', 'icon_type', 'rack_unit', 'status_color']),
+    'LAG_STATE': ('LinkAggregation', 'lag_id', 'LinkAggregationState',
+                  ['protocol', 'member_count', 'active_members', 'aggregate_bandwidth']),
+}
+
+# State property compared against the LATEST state before writing; when it matches,
+# no new state is created and the LATEST state's last_seen is touched instead.
+# Defaults to content_hash (see content_hash()); ACL rules carry their own hash
+_STATE_DEDUP_KEYS = {
+    'ACL_STATE': 'rules_hash',
+}
+_DEFAULT_DEDUP_KEY = 'content_hash'
+
+# zlib level for ACL rule blobs; 6 is zlib's own default speed/size tradeoff
+ACL_RULES_COMPRESSION_LEVEL = 6
+
+
+def encode_acl_rules(rules: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Collection of parameterized Cypher queries for temporal graph operations.
-    All queries use MERGE for idempotent operations to prevent duplicates.
+    Serialize ACL rules for ACLState storage.
+    Keys are sorted so equal rule lists always produce the same hash.
+    Args: rules list of rule dicts.
+    Returns: Dict with rules_blob (zlib-compressed JSON bytes) and rules_hash (hex digest).
     """
+    data = json.dumps(rules, sort_keys=True, separators=(',', ':')).encode()
+    return {
+        'rules_blob': zlib.compress(data, ACL_RULES_COMPRESSION_LEVEL),
+        'rules_hash': hashlib.blake2b(data, digest_size=16).hexdigest()
+    }
 
-    # Device Operations
-    CREATE_ACL_IDENTITY = """
-    MATCH (d:Device {hostname: $hostname})
-    MERGE (a:ACL {acl_id: $acl_id})
-    ON CREATE SET a.name = $name,
-                 a.device_hostname = $hostname,
-                 a.created_at = datetime()
-    RETURN a.acl_id as acl_id
-    """
 
-    CREATE_ACL_STATE = """
-    MATCH (a:ACL {acl_id: $acl_id})
-    
-    CREATE (as:ACLState {
-        version: $version,
-        timestamp: datetime(),
-        type: $type,
-        rule_count: $rule_count,
-        rules_json: $rules_json
-    })
-    
-    CREATE (a)-[:HAS_STATE]->(as)
-    
-    WITH a, as
-    OPTIONAL MATCH (a)-[old_latest:LATEST]->(old_state:ACLState)
-    DELETE old_latest
-    CREATE (a)-[:LATEST]->(as)
-    
-    WITH a, as, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(as)
-    
-    RETURN as.version as version
+def content_hash(properties: Dict[str, Any]) -> str:
     """
-
-    CREATE_INTERFACE_STATE = """
-    MATCH (i:Interface {interface_id: $interface_id})
-    
-    CREATE (is:InterfaceState {
-        version: $version,
-        timestamp: datetime(),
-        description: $description,
-        type: $type,
-        enabled: $enabled,
-        ip_address: $ip_address,
-        speed: $speed,
-        duplex: $duplex,
-        mtu: $mtu
-    })
-    
-    CREATE (i)-[:HAS_STATE]->(is)
-    
-    WITH i, is
-    OPTIONAL MATCH (i)-[old_latest:LATEST]->(old_state:InterfaceState)
-    DELETE old_latest
-    CREATE (i)-[:LATEST]->(is)
-    
-    WITH i, is, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(is)
-    
-    RETURN is.version as version
+    Hash a state properties map for the in-query unchanged-state check.
+    Store the result in the map as 'content_hash' before sending it.
+    Args: properties map (an existing content_hash entry is ignored).
+    Returns: 32-character hex digest of the canonical JSON form.
     """
+    data = {k: v for k, v in properties.items() if k != _DEFAULT_DEDUP_KEY}
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode()
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
 
-    CREATE_VLAN_STATE = """
-    MATCH (v:VLAN {vlan_id: $vlan_id})
-    
-    CREATE (vs:VLANState {
-        version: $version,
-        timestamp: datetime(),
-        name: $name,
-        status: $status,
-        stp_priority: $stp_priority
-    })
-    
-    CREATE (v)-[:HAS_STATE]->(vs)
-    
-    WITH v, vs
-    OPTIONAL MATCH (v)-[old_latest:LATEST]->(old_state:VLANState)
-    DELETE old_latest
-    CREATE (v)-[:LATEST]->(vs)
-    
-    WITH v, vs, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(vs)
-    
-    RETURN vs.version as version
-    """
 
-    # Network and IP Operations
-    CREATE_IPNETWORK_IDENTITY = """
-    MERGE (n:IPNetwork {network_id: $network_id})
-    ON CREATE SET n.network_address = $network_address,
-                 n.prefix_length = $prefix_length,
-                 n.created_at = datetime()
-    RETURN n.network_id as network_id
+def decode_acl_rules(rules_blob: bytes) -> List[Dict[str, Any]]:
     """
-
-    CREATE_IPNETWORK_STATE = """
-    MATCH (n:IPNetwork {network_id: $network_id})
-    
-    CREATE (ns:IPNetworkState {
-        version: $version,
-        timestamp: datetime(),
-        description: $description,
-        vlan_number: $vlan_number,
-        gateway_ip: $gateway_ip
-    })
-    
-    CREATE (n)-[:HAS_STATE]->(ns)
-    
-    WITH n, ns
-    OPTIONAL MATCH (n)-[old_latest:LATEST]->(old_state:IPNetworkState)
-    DELETE old_latest
-    CREATE (n)-[:LATEST]->(ns)
-    
-    WITH n, ns, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(ns)
-    
-    RETURN ns.version as version
+    Decode a stored ACLState rules_blob back into rule dicts.
+    Args: rules_blob as written by encode_acl_rules.
+    Returns: List of rule dicts.
     """
+    return json.loads(zlib.decompress(rules_blob))
 
-    # Relationship Operations
-    CREATE_VLAN_MEMBERSHIP = """
-    MATCH (i:Interface {interface_id: $interface_id})
-    MATCH (v:VLAN {vlan_id: $vlan_id})
-    
-    MERGE (i)-[r:MEMBER_OF_VLAN]->(v)
-    SET r.membership_type = $membership_type,
-        r.native_vlan = $native_vlan
-    
-    RETURN r
-    """
 
-    CREATE_ACL_APPLICATION = """
-    MATCH (i:Interface {interface_id: $interface_id})
-    MATCH (a:ACL {acl_id: $acl_id})
-    
-    MERGE (i)-[r:APPLIED_ACL]->(a)
-    SET r.direction = $direction,
-        r.position = $position
-    
-    RETURN r
+def _state_body(label: str, id_key: str, state_label: str, properties: List[str], ref: str,
+                dedup_key: str, merge_identity: bool = False, by_eid: bool = False) -> str:
     """
-
-    CREATE_NETWORK_MEMBERSHIP = """
-    MATCH (i:Interface {interface_id: $interface_id})
-    MATCH (n:IPNetwork {network_id: $network_id})
-    
-    MERGE (i)-[r:IN_NETWORK]->(n)
-    
-    RETURN r
+    Build the shared state-creation clauses for one identity.
+    If the LATEST state has the same dedup_key value, only its last_seen is updated and
+    the row stops; a missing value on either side always writes a new state.
+    The previous LATEST state is relinked in a unit subquery, so a first state
+    needs no null row or filter.
+    Args: spec fields, ref prefix for values ('$' for parameters, 'row.' inside UNWIND),
+          dedup_key state property to compare against the LATEST state,
+          merge_identity to MERGE the identity node (set from identity_props) instead of matching it,
+          by_eid to look the identity node up by $eid (its elementId) instead of its key.
+    Returns: Cypher without indentation or RETURN clause.
     """
+    # Inside UNWIND the row has to be carried through every WITH and subquery import
+    carry = ', row' if ref == 'row.' else ''
+    if merge_identity:
+        identity = f"""MERGE (n:{label} {{{id_key}: {ref}{id_key}}})
+ON CREATE SET n += {ref}identity_props, n.created_at = {ref}timestamp
+WITH n{carry}"""
+    elif by_eid:
+        identity = f"MATCH (n:{label}) WHERE elementId(n) = {ref}eid"
+    else:
+        identity = f"MATCH (n:{label} {{{id_key}: {ref}{id_key}}})"
+    return f"""{identity}
 
-    # BGP Operations
-    CREATE_BGP_PEER_IDENTITY = """
-    MERGE (b:BGPPeer {peer_id: $peer_id})
-    ON CREATE SET b.local_hostname = $local_hostname,
-                 b.peer_ip = $peer_ip,
-                 b.created_at = datetime()
-    RETURN b.peer_id as peer_id
-    """
+OPTIONAL MATCH (n)-[:LATEST]->(prev:{state_label})
+CALL {{
+    WITH prev{carry}
+    WITH prev{carry} WHERE prev.{dedup_key} = {ref}properties.{dedup_key}
+    SET prev.last_seen = {ref}timestamp
+}}
+WITH n, prev{carry} WHERE NOT coalesce(prev.{dedup_key} = {ref}properties.{dedup_key}, false)
 
-    CREATE_BGP_PEER_STATE = """
-    MATCH (b:BGPPeer {peer_id: $peer_id})
-    
-    CREATE (bs:BGPPeerState {
-        version: $version,
-        timestamp: datetime(),
-        peer_asn: $peer_asn,
-        session_state: $session_state,
-        description: $description
-    })
-    
-    CREATE (b)-[:HAS_STATE]->(bs)
-    
-    WITH b, bs
-    OPTIONAL MATCH (b)-[old_latest:LATEST]->(old_state:BGPPeerState)
+CREATE (s:{state_label})
+SET s = {ref}properties, s.version = {ref}version, s.timestamp = {ref}timestamp
+
+CREATE (n)-[:HAS_STATE]->(s)
+
+CALL {{
+    WITH n, s
+    MATCH (n)-[old_latest:LATEST]->(old_state:{state_label})
     DELETE old_latest
-    CREATE (b)-[:LATEST]->(bs)
-    
-    WITH b, bs, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(bs)
-    
-    RETURN bs.version as version
-    """
+    CREATE (old_state)-[:PREVIOUS_STATE]->(s)
+}}
+CREATE (n)-[:LATEST]->(s)"""
 
-    CREATE_BGP_PEERING = """
-    MATCH (d1:Device {hostname: $local_hostname})
-    MATCH (d2:Device {hostname: $remote_hostname})
-    MATCH (b:BGPPeer {peer_id: $peer_id})
-    
-    MERGE (d1)-[r1:BGP_PEER_WITH]->(b)
-    SET r1.local_ip = $local_ip,
-        r1.peer_ip = $peer_ip
-    
-    MERGE (b)<-[r2:BGP_PEER_WITH]-(d2)
-    SET r2.local_ip = $peer_ip,
-        r2.peer_ip = $local_ip
-    
-    RETURN r1, r2
-    """
 
-    # Topology Visualization Operations
-    CREATE_SITE_IDENTITY = """
-    MERGE (s:Site {site_id: $site_id})
-    ON CREATE SET s.name = $name,
-                 s.type = $type,
-                 s.address = $address,
-                 s.coordinates = $coordinates,
-                 s.created_at = datetime()
-    RETURN s.site_id as site_id
+def _dedup_key(name: str) -> str:
     """
-
-    CREATE_DEVICE_LAYOUT = """
-    MATCH (d:Device {hostname: $hostname})
-    
-    CREATE (dl:DeviceLayout {
-        version: $version,
-        timestamp: datetime(),
-        x_position: $x_position,
-        y_position: $y_position,
-        layer: $layer,
-        icon_type: $icon_type,
-        rack_unit: $rack_unit,
-        status_color: $status_color
-    })
-    
-    CREATE (d)-[:HAS_STATE]->(dl)
-    
-    WITH d, dl
-    OPTIONAL MATCH (d)-[old_latest:LATEST]->(old_layout:DeviceLayout)
-    DELETE old_latest
-    CREATE (d)-[:LATEST]->(dl)
-    
-    WITH d, dl, old_layout
-    WHERE old_layout IS NOT NULL
-    CREATE (old_layout)-[:PREVIOUS_STATE]->(dl)
-    
-    RETURN dl.version as version
+    Get the unchanged-state comparison property for a _STATE_SPECS entry.
     """
+    return _STATE_DEDUP_KEYS.get(name, _DEFAULT_DEDUP_KEY)
 
-    CREATE_DEVICE_LOCATION = """
-    MATCH (d:Device {hostname: $hostname})
-    MATCH (s:Site {site_id: $site_id})
-    
-    MERGE (d)-[r:LOCATED_AT]->(s)
-    SET r.installation_date = $installation_date,
-        r.rack_name = $rack_name
-    
-    RETURN r
-    """
 
-    CREATE_OSPF_NEIGHBOR_IDENTITY = """
-    MERGE (o:OSPFNeighbor {neighbor_id: $neighbor_id})
-    ON CREATE SET o.local_device = $local_device,
-                 o.remote_device = $remote_device,
-                 o.ospf_area = $ospf_area,
-                 o.created_at = datetime()
-    RETURN o.neighbor_id as neighbor_id
+def _build_state_query(name: str, by_eid: bool = False) -> str:
     """
-
-    CREATE_OSPF_NEIGHBOR_STATE = """
-    MATCH (o:OSPFNeighbor {neighbor_id: $neighbor_id})
-    
-    CREATE (os:OSPFNeighborState {
-        version: $version,
-        timestamp: datetime(),
-        neighbor_state: $neighbor_state,
-        cost: $cost,
-        hello_timer: $hello_timer,
-        dead_timer: $dead_timer
-    })
-    
-    CREATE (o)-[:HAS_STATE]->(os)
-    
-    WITH o, os
-    OPTIONAL MATCH (o)-[old_latest:LATEST]->(old_state:OSPFNeighborState)
-    DELETE old_latest
-    CREATE (o)-[:LATEST]->(os)
-    
-    WITH o, os, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(os)
-    
-    RETURN os.version as version
+    Build the single-identity state creation query for a _STATE_SPECS entry.
+    Parameters: the identity key (or $eid with by_eid), $version, $timestamp and
+    $properties (map of state properties). Returns no row when the state is unchanged.
     """
+    body = _state_body(*_STATE_SPECS[name], ref='$', dedup_key=_dedup_key(name), by_eid=by_eid)
+    return f"""
+{body}
+
+RETURN s.version as version
+"""
 
-    CREATE_OSPF_PEERING = """
-    MATCH (d1:Device {hostname: $local_hostname})
-    MATCH (d2:Device {hostname: $remote_hostname})
-    MATCH (o:OSPFNeighbor {neighbor_id: $neighbor_id})
-    
-    MERGE (d1)-[r1:OSPF_NEIGHBOR_WITH]->(o)
-    SET r1.local_interface = $local_interface,
-        r1.remote_interface = $remote_interface,
-        r1.area = $area
-    
-    MERGE (o)<-[r2:OSPF_NEIGHBOR_WITH]-(d2)
-    SET r2.local_interface = $remote_interface,
-        r2.remote_interface = $local_interface,
-        r2.area = $area
-    
-    RETURN r1, r2
-    """
 
-    # Link Aggregation Operations
-    CREATE_LAG_IDENTITY = """
-    MATCH (d:Device {hostname: $hostname})
-    MERGE (l:LinkAggregation {lag_id: $lag_id})
-    ON CREATE SET l.name = $name,
-                 l.device_hostname = $hostname,
-                 l.created_at = datetime()
-    RETURN l.lag_id as lag_id
+def _identity_and_state_query(name: str) -> str:
     """
+    Build a query that merges the identity node and creates its state in one round trip.
+    Parameters: the identity key, $identity_props (set only when the node is new),
+    $version, $timestamp and $properties (map of state properties).
+    """
+    body = _state_body(*_STATE_SPECS[name], ref='$', dedup_key=_dedup_key(name), merge_identity=True)
+    return f"""
+{body}
 
-    CREATE_LAG_STATE = """
-    MATCH (l:LinkAggregation {lag_id: $lag_id})
-    
-    CREATE (ls:LinkAggregationState {
-        version: $version,
-        timestamp: datetime(),
-        protocol: $protocol,
-        member_count: $member_count,
-        active_members: $active_members,
-        aggregate_bandwidth: $aggregate_bandwidth
-    })
-    
-    CREATE (l)-[:HAS_STATE]->(ls)
-    
-    WITH l, ls
-    OPTIONAL MATCH (l)-[old_latest:LATEST]->(old_state:LinkAggregationState)
-    DELETE old_latest
-    CREATE (l)-[:LATEST]->(ls)
-    
-    WITH l, ls, old_state
-    WHERE old_state IS NOT NULL
-    CREATE (old_state)-[:PREVIOUS_STATE]->(ls)
-    
-    RETURN ls.version as version
+RETURN s.version as version
+"""
+
+
+def _batch_state_query(name: str) -> str:
+    """
+    Build an UNWIND query that creates one new state per row of $rows.
+    Each row carries the identity key, version, timestamp and a properties map; rows are isolated
+    in a subquery so every identity gets its own LATEST swap and PREVIOUS_STATE link.
     """
+    body = indent(_state_body(*_STATE_SPECS[name], ref='row.', dedup_key=_dedup_key(name)), '    ')
+    return f"""
+UNWIND $rows AS row
+CALL {{
+    WITH row
+{body}
+}}
+"""
+
 
-    CREATE_LAG_MEMBERSHIP = """
-    MATCH (i:Interface {interface_id: $interface_id})
-    MATCH (l:LinkAggregation {lag_id: $lag_id})
-    
-    MERGE (i)-[r:MEMBER_OF_LAG]->(l)
-    SET r.member_priority = $member_priority,
-        r.active = $active
-    
-    RETURN r
+def _next_version_query(label: str, id_key: str, state_label: str) -> str:
+    """
+    Build the next-version lookup for one identity label and its state label.
+    Reads the single LATEST state instead of aggregating over the whole history;
+    OPTIONAL MATCH keeps one row (next_version 1) for identities without states.
     """
+    return f"""
+OPTIONAL MATCH (n:{label} {{{id_key}: $id}})-[:LATEST]->(s:{state_label})
+RETURN coalesce(s.version, 0) + 1 AS next_version
+"""
+
 
-    # Utility Queries
-    GET_NEXT_VERSION = """
-    MATCH (identity)-[:HAS_STATE]->(state)
-    WHERE identity.{identity_property} = $identity_value
-    RETURN COALESCE(MAX(state.version), 0) + 1 as next_version
+def _normalize_query(text: str) -> str:
     """
+    Collapse all whitespace runs in a query to single spaces.
+    Queries here contain no multi-space string literals, so this is safe.
+    """
+    return " ".join(text.split())
+
 
-    GET_DEVICE_SUMMARY = """
-    MATCH (d:Device {hostname: $hostname})
-    OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
-    OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i:Interface)
-    OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i)-[:MEMBER_OF_VLAN]->(v:VLAN)
-    
-    RETURN d.hostname,
-           ds.vendor, ds.os_type, ds.os_version,
-           count(DISTINCT i) as interface_count,
-           count(DISTINCT v) as vlan_count
+def _compile_query(text: str) -> Query:
     """
+    Wrap a query constant in a driver Query object with normalized text.
+    """
+    return Query(_normalize_query(text))
+
+
+# Unique constraints backing every identity lookup below, so MATCH/MERGE on these keys
+# plans as a unique index seek from the first run. Names match GraphSchema's constraints
+SCHEMA_SETUP = [
+    "CREATE CONSTRAINT device_hostname_unique IF NOT EXISTS FOR (d:Device) REQUIRE d.hostname IS UNIQUE",
+    "CREATE CONSTRAINT acl_id_unique IF NOT EXISTS FOR (a:ACL) REQUIRE a.acl_id IS UNIQUE",
+    "CREATE CONSTRAINT interface_id_unique IF NOT EXISTS FOR (i:Interface) REQUIRE i.interface_id IS UNIQUE",
+    "CREATE CONSTRAINT vlan_id_unique IF NOT EXISTS FOR (v:VLAN) REQUIRE v.vlan_id IS UNIQUE",
+    "CREATE CONSTRAINT network_id_unique IF NOT EXISTS FOR (n:IPNetwork) REQUIRE n.network_id IS UNIQUE",
+    "CREATE CONSTRAINT bgp_peer_id_unique IF NOT EXISTS FOR (bp:BGPPeer) REQUIRE bp.peer_id IS UNIQUE",
+    "CREATE CONSTRAINT ospf_neighbor_id_unique IF NOT EXISTS FOR (on:OSPFNeighbor) REQUIRE on.neighbor_id IS UNIQUE",
+    "CREATE CONSTRAINT lag_id_unique IF NOT EXISTS FOR (l:LinkAggregation) REQUIRE l.lag_id IS UNIQUE",
+    "CREATE CONSTRAINT site_id_unique IF NOT EXISTS FOR (s:Site) REQUIRE s.site_id IS UNIQUE",
+]
+
+# Device Operations
+CREATE_ACL_IDENTITY = """
+MATCH (d:Device {hostname: $hostname})
+MERGE (a:ACL {acl_id: $acl_id})
+ON CREATE SET a.name = $name,
+             a.device_hostname = $hostname,
+             a.created_at = $timestamp
+RETURN a.acl_id as acl_id, elementId(a) as eid
+"""
+
+# State writes skip unchanged states: pass content_hash(properties) inside $properties
+# (ACL properties come from encode_acl_rules, whose rules_hash plays the same role)
+CREATE_ACL_STATE = _build_state_query('ACL_STATE')
+
+CREATE_INTERFACE_STATE = _build_state_query('INTERFACE_STATE')
+
+CREATE_VLAN_STATE = _build_state_query('VLAN_STATE')
+
+# Network and IP Operations
+CREATE_IPNETWORK_IDENTITY = """
+MERGE (n:IPNetwork {network_id: $network_id})
+ON CREATE SET n.network_address = $network_address,
+             n.prefix_length = $prefix_length,
+             n.created_at = $timestamp
+RETURN n.network_id as network_id, elementId(n) as eid
+"""
+
+CREATE_IPNETWORK_STATE = _build_state_query('IPNETWORK_STATE')
+
+# Relationship Operations
+CREATE_VLAN_MEMBERSHIP = """
+MATCH (i:Interface {interface_id: $interface_id})
+MATCH (v:VLAN {vlan_id: $vlan_id})
+
+MERGE (i)-[r:MEMBER_OF_VLAN]->(v)
+SET r.membership_type = $membership_type,
+    r.native_vlan = $native_vlan
+
+RETURN r
+"""
+
+CREATE_ACL_APPLICATION = """
+MATCH (i:Interface {interface_id: $interface_id})
+MATCH (a:ACL {acl_id: $acl_id})
+
+MERGE (i)-[r:APPLIED_ACL]->(a)
+SET r.direction = $direction,
+    r.position = $position
+
+RETURN r
+"""
+
+CREATE_NETWORK_MEMBERSHIP = """
+MATCH (i:Interface {interface_id: $interface_id})
+MATCH (n:IPNetwork {network_id: $network_id})
+
+MERGE (i)-[r:IN_NETWORK]->(n)
+
+RETURN r
+"""
+
+# BGP Operations
+CREATE_BGP_PEER_IDENTITY = """
+MERGE (b:BGPPeer {peer_id: $peer_id})
+ON CREATE SET b.local_hostname = $local_hostname,
+             b.peer_ip = $peer_ip,
+             b.created_at = $timestamp
+RETURN b.peer_id as peer_id, elementId(b) as eid
+"""
+
+CREATE_BGP_PEER_STATE = _build_state_query('BGP_PEER_STATE')
+
+CREATE_BGP_PEERING = """
+MATCH (d1:Device {hostname: $local_hostname})
+MATCH (d2:Device {hostname: $remote_hostname})
+MATCH (b:BGPPeer {peer_id: $peer_id})
+
+MERGE (d1)-[r1:BGP_PEER_WITH]->(b)
+SET r1.local_ip = $local_ip,
+    r1.peer_ip = $peer_ip
+
+MERGE (b)<-[r2:BGP_PEER_WITH]-(d2)
+SET r2.local_ip = $peer_ip,
+    r2.peer_ip = $local_ip
 
-    # Topology Queries for Visualization
-    GET_NETWORK_TOPOLOGY = """
-    MATCH (device:Device)-[:LATEST]->(device_state:DeviceState)
+RETURN r1, r2
+"""
+
+# Topology Visualization Operations
+CREATE_SITE_IDENTITY = """
+MERGE (s:Site {site_id: $site_id})
+ON CREATE SET s.name = $name,
+             s.type = $type,
+             s.address = $address,
+             s.coordinates = $coordinates,
+             s.created_at = $timestamp
+RETURN s.site_id as site_id, elementId(s) as eid
+"""
+
+CREATE_DEVICE_LAYOUT = _build_state_query('DEVICE_LAYOUT')
+
+CREATE_DEVICE_LOCATION = """
+MATCH (d:Device {hostname: $hostname})
+MATCH (s:Site {site_id: $site_id})
+
+MERGE (d)-[r:LOCATED_AT]->(s)
+SET r.installation_date = $installation_date,
+    r.rack_name = $rack_name
+
+RETURN r
+"""
+
+CREATE_OSPF_NEIGHBOR_IDENTITY = """
+MERGE (o:OSPFNeighbor {neighbor_id: $neighbor_id})
+ON CREATE SET o.local_device = $local_device,
+             o.remote_device = $remote_device,
+             o.ospf_area = $ospf_area,
+             o.created_at = $timestamp
+RETURN o.neighbor_id as neighbor_id, elementId(o) as eid
+"""
+
+CREATE_OSPF_NEIGHBOR_STATE = _build_state_query('OSPF_NEIGHBOR_STATE')
+
+CREATE_OSPF_PEERING = """
+MATCH (d1:Device {hostname: $local_hostname})
+MATCH (d2:Device {hostname: $remote_hostname})
+MATCH (o:OSPFNeighbor {neighbor_id: $neighbor_id})
+
+MERGE (d1)-[r1:OSPF_NEIGHBOR_WITH]->(o)
+SET r1.local_interface = $local_interface,
+    r1.remote_interface = $remote_interface,
+    r1.area = $area
+
+MERGE (o)<-[r2:OSPF_NEIGHBOR_WITH]-(d2)
+SET r2.local_interface = $remote_interface,
+    r2.remote_interface = $local_interface,
+    r2.area = $area
+
+RETURN r1, r2
+"""
+
+# Link Aggregation Operations
+CREATE_LAG_IDENTITY = """
+MATCH (d:Device {hostname: $hostname})
+MERGE (l:LinkAggregation {lag_id: $lag_id})
+ON CREATE SET l.name = $name,
+             l.device_hostname = $hostname,
+             l.created_at = $timestamp
+RETURN l.lag_id as lag_id, elementId(l) as eid
+"""
+
+CREATE_LAG_STATE = _build_state_query('LAG_STATE')
+
+CREATE_LAG_MEMBERSHIP = """
+MATCH (i:Interface {interface_id: $interface_id})
+MATCH (l:LinkAggregation {lag_id: $lag_id})
+
+MERGE (i)-[r:MEMBER_OF_LAG]->(l)
+SET r.member_priority = $member_priority,
+    r.active = $active
+
+RETURN r
+"""
+
+# Utility Queries
+# Next state version per state label; parameter: $id (the identity key value).
+# One constant string per label, so each gets a single cached plan
+NEXT_VERSION_BY_LABEL = {
+    state_label: _next_version_query(label, id_key, state_label)
+    for label, id_key, state_label, _ in _STATE_SPECS.values()
+}
+
+GET_DEVICE_SUMMARY = """
+MATCH (d:Device {hostname: $hostname})
+OPTIONAL MATCH (d)-[:LATEST]->(ds:DeviceState)
+OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i:Interface)
+OPTIONAL MATCH (d)-[:HAS_INTERFACE]->(i)-[:MEMBER_OF_VLAN]->(v:VLAN)
+
+RETURN d.hostname,
+       ds.vendor, ds.os_type, ds.os_version,
+       count(DISTINCT i) as interface_count,
+       count(DISTINCT v) as vlan_count
+"""
+
+# Topology Queries for Visualization
+# Layout, site and connections are read in separate subqueries, so their
+# cardinalities are not multiplied into one row set before aggregation.
+# Connections are reduced per interface pair (parallel CONNECTED_TO edges keep the
+# first) instead of hashing every result map for collect(DISTINCT ...)
+GET_NETWORK_TOPOLOGY = """
+MATCH (device:Device)-[:LATEST]->(device_state:DeviceState)
+
+CALL {
+    WITH device
     OPTIONAL MATCH (device)-[:LATEST]->(layout:DeviceLayout)
+    RETURN layout
+    LIMIT 1
+}
+
+CALL {
+    WITH device
     OPTIONAL MATCH (device)-[:LOCATED_AT]->(site:Site)
-    
-    OPTIONAL MATCH (device)-[:HAS_INTERFACE]->(interface:Interface)
-                            -[conn:CONNECTED_TO]->
-                            (remote_interface:Interface)
-                            <-[:HAS_INTERFACE]-
-                            (remote_device:Device)
-    
-    RETURN device.hostname, device_state, layout, site,
-           collect(DISTINCT {
+    RETURN site
+    LIMIT 1
+}
+
+CALL {
+    WITH device
+    MATCH (device)-[:HAS_INTERFACE]->(interface:Interface)
+          -[conn:CONNECTED_TO]->
+          (remote_interface:Interface)
+          <-[:HAS_INTERFACE]-
+          (remote_device:Device)
+    WITH interface, remote_interface, remote_device, head(collect(conn)) AS conn
+    RETURN collect({
              remote_device: remote_device.hostname,
              local_interface: interface.name,
              remote_interface: remote_interface.name,
              connection_type: conn.connection_type,
              relationship_type: 'physical'
            }) as connections
+}
+
+RETURN device.hostname, device_state, layout, site, connections
+"""
+
+# Batch Operations for Performance
+# The batch queries return nothing; callers read progress from the summary
+# counters (result.consume().counters.nodes_created) instead of a count()
+BATCH_CREATE_INTERFACES = """
+UNWIND $interfaces as interface_data
+MATCH (d:Device {hostname: interface_data.hostname})
+MERGE (i:Interface {interface_id: interface_data.interface_id})
+ON CREATE SET i.name = interface_data.name,
+             i.device_hostname = interface_data.hostname,
+             i.created_at = interface_data.timestamp
+
+MERGE (d)-[:HAS_INTERFACE]->(i)
+"""
+
+BATCH_CREATE_VLANS = """
+UNWIND $vlans as vlan_data
+MATCH (d:Device {hostname: vlan_data.hostname})
+MERGE (v:VLAN {vlan_id: vlan_data.vlan_id})
+ON CREATE SET v.vlan_number = vlan_data.vlan_number,
+             v.device_hostname = vlan_data.hostname,
+             v.created_at = vlan_data.timestamp
+"""
+
+# Batched relationship writes; parameter: $rows, one map per relationship.
+# Endpoints are matched through their unique-constraint indexes
+BATCH_CREATE_VLAN_MEMBERSHIPS = """
+UNWIND $rows AS row
+MATCH (i:Interface {interface_id: row.interface_id})
+MATCH (v:VLAN {vlan_id: row.vlan_id})
+MERGE (i)-[r:MEMBER_OF_VLAN]->(v)
+SET r.membership_type = row.membership_type,
+    r.native_vlan = row.native_vlan
+"""
+
+BATCH_CREATE_ACL_APPLICATIONS = """
+UNWIND $rows AS row
+MATCH (i:Interface {interface_id: row.interface_id})
+MATCH (a:ACL {acl_id: row.acl_id})
+MERGE (i)-[r:APPLIED_ACL]->(a)
+SET r.direction = row.direction,
+    r.position = row.position
+"""
+
+BATCH_CREATE_NETWORK_MEMBERSHIPS = """
+UNWIND $rows AS row
+MATCH (i:Interface {interface_id: row.interface_id})
+MATCH (n:IPNetwork {network_id: row.network_id})
+MERGE (i)-[:IN_NETWORK]->(n)
+"""
+
+BATCH_CREATE_LAG_MEMBERSHIPS = """
+UNWIND $rows AS row
+MATCH (i:Interface {interface_id: row.interface_id})
+MATCH (l:LinkAggregation {lag_id: row.lag_id})
+MERGE (i)-[r:MEMBER_OF_LAG]->(l)
+SET r.member_priority = row.member_priority,
+    r.active = row.active
+"""
+
+# Batched state creation; parameter: $rows, one map per state with the identity key,
+# version, timestamp and properties map. Send ~1000 rows per call; counts come from the result summary.
+BATCH_CREATE_ACL_STATE = _batch_state_query('ACL_STATE')
+BATCH_CREATE_INTERFACE_STATE = _batch_state_query('INTERFACE_STATE')
+BATCH_CREATE_VLAN_STATE = _batch_state_query('VLAN_STATE')
+BATCH_CREATE_IPNETWORK_STATE = _batch_state_query('IPNETWORK_STATE')
+BATCH_CREATE_BGP_PEER_STATE = _batch_state_query('BGP_PEER_STATE')
+BATCH_CREATE_OSPF_NEIGHBOR_STATE = _batch_state_query('OSPF_NEIGHBOR_STATE')
+BATCH_CREATE_DEVICE_LAYOUT = _batch_state_query('DEVICE_LAYOUT')
+BATCH_CREATE_LAG_STATE = _batch_state_query('LAG_STATE')
+
+# State creation addressed by elementId, for callers holding the eid returned by the
+# identity query (see ElementIdCache); parameter $eid replaces the identity key
+CREATE_ACL_STATE_BY_EID = _build_state_query('ACL_STATE', by_eid=True)
+CREATE_INTERFACE_STATE_BY_EID = _build_state_query('INTERFACE_STATE', by_eid=True)
+CREATE_VLAN_STATE_BY_EID = _build_state_query('VLAN_STATE', by_eid=True)
+CREATE_IPNETWORK_STATE_BY_EID = _build_state_query('IPNETWORK_STATE', by_eid=True)
+CREATE_BGP_PEER_STATE_BY_EID = _build_state_query('BGP_PEER_STATE', by_eid=True)
+CREATE_OSPF_NEIGHBOR_STATE_BY_EID = _build_state_query('OSPF_NEIGHBOR_STATE', by_eid=True)
+CREATE_DEVICE_LAYOUT_BY_EID = _build_state_query('DEVICE_LAYOUT', by_eid=True)
+CREATE_LAG_STATE_BY_EID = _build_state_query('LAG_STATE', by_eid=True)
+
+# Identity MERGE plus state creation in a single query, for ingesting entities that
+# may not exist yet; replaces a CREATE_*_IDENTITY + CREATE_*_STATE pair
+CREATE_ACL_IDENTITY_AND_STATE = _identity_and_state_query('ACL_STATE')
+CREATE_INTERFACE_IDENTITY_AND_STATE = _identity_and_state_query('INTERFACE_STATE')
+CREATE_VLAN_IDENTITY_AND_STATE = _identity_and_state_query('VLAN_STATE')
+CREATE_IPNETWORK_IDENTITY_AND_STATE = _identity_and_state_query('IPNETWORK_STATE')
+CREATE_BGP_PEER_IDENTITY_AND_STATE = _identity_and_state_query('BGP_PEER_STATE')
+CREATE_OSPF_NEIGHBOR_IDENTITY_AND_STATE = _identity_and_state_query('OSPF_NEIGHBOR_STATE')
+CREATE_LAG_IDENTITY_AND_STATE = _identity_and_state_query('LAG_STATE')
+
+
+# Driver Query objects with normalized text, keyed by query constant name.
+# Next-version queries are kept per state label in NEXT_VERSION_BY_LABEL_Q
+QUERIES_Q: Dict[str, Query] = {
+    'CREATE_ACL_IDENTITY': _compile_query(CREATE_ACL_IDENTITY),
+    'CREATE_ACL_STATE': _compile_query(CREATE_ACL_STATE),
+    'CREATE_INTERFACE_STATE': _compile_query(CREATE_INTERFACE_STATE),
+    'CREATE_VLAN_STATE': _compile_query(CREATE_VLAN_STATE),
+    'CREATE_IPNETWORK_IDENTITY': _compile_query(CREATE_IPNETWORK_IDENTITY),
+    'CREATE_IPNETWORK_STATE': _compile_query(CREATE_IPNETWORK_STATE),
+    'CREATE_VLAN_MEMBERSHIP': _compile_query(CREATE_VLAN_MEMBERSHIP),
+    'CREATE_ACL_APPLICATION': _compile_query(CREATE_ACL_APPLICATION),
+    'CREATE_NETWORK_MEMBERSHIP': _compile_query(CREATE_NETWORK_MEMBERSHIP),
+    'CREATE_BGP_PEER_IDENTITY': _compile_query(CREATE_BGP_PEER_IDENTITY),
+    'CREATE_BGP_PEER_STATE': _compile_query(CREATE_BGP_PEER_STATE),
+    'CREATE_BGP_PEERING': _compile_query(CREATE_BGP_PEERING),
+    'CREATE_SITE_IDENTITY': _compile_query(CREATE_SITE_IDENTITY),
+    'CREATE_DEVICE_LAYOUT': _compile_query(CREATE_DEVICE_LAYOUT),
+    'CREATE_DEVICE_LOCATION': _compile_query(CREATE_DEVICE_LOCATION),
+    'CREATE_OSPF_NEIGHBOR_IDENTITY': _compile_query(CREATE_OSPF_NEIGHBOR_IDENTITY),
+    'CREATE_OSPF_NEIGHBOR_STATE': _compile_query(CREATE_OSPF_NEIGHBOR_STATE),
+    'CREATE_OSPF_PEERING': _compile_query(CREATE_OSPF_PEERING),
+    'CREATE_LAG_IDENTITY': _compile_query(CREATE_LAG_IDENTITY),
+    'CREATE_LAG_STATE': _compile_query(CREATE_LAG_STATE),
+    'CREATE_LAG_MEMBERSHIP': _compile_query(CREATE_LAG_MEMBERSHIP),
+    'GET_DEVICE_SUMMARY': _compile_query(GET_DEVICE_SUMMARY),
+    'GET_NETWORK_TOPOLOGY': _compile_query(GET_NETWORK_TOPOLOGY),
+    'BATCH_CREATE_INTERFACES': _compile_query(BATCH_CREATE_INTERFACES),
+    'BATCH_CREATE_VLANS': _compile_query(BATCH_CREATE_VLANS),
+    'BATCH_CREATE_VLAN_MEMBERSHIPS': _compile_query(BATCH_CREATE_VLAN_MEMBERSHIPS),
+    'BATCH_CREATE_ACL_APPLICATIONS': _compile_query(BATCH_CREATE_ACL_APPLICATIONS),
+    'BATCH_CREATE_NETWORK_MEMBERSHIPS': _compile_query(BATCH_CREATE_NETWORK_MEMBERSHIPS),
+    'BATCH_CREATE_LAG_MEMBERSHIPS': _compile_query(BATCH_CREATE_LAG_MEMBERSHIPS),
+    'BATCH_CREATE_ACL_STATE': _compile_query(BATCH_CREATE_ACL_STATE),
+    'BATCH_CREATE_INTERFACE_STATE': _compile_query(BATCH_CREATE_INTERFACE_STATE),
+    'BATCH_CREATE_VLAN_STATE': _compile_query(BATCH_CREATE_VLAN_STATE),
+    'BATCH_CREATE_IPNETWORK_STATE': _compile_query(BATCH_CREATE_IPNETWORK_STATE),
+    'BATCH_CREATE_BGP_PEER_STATE': _compile_query(BATCH_CREATE_BGP_PEER_STATE),
+    'BATCH_CREATE_OSPF_NEIGHBOR_STATE': _compile_query(BATCH_CREATE_OSPF_NEIGHBOR_STATE),
+    'BATCH_CREATE_DEVICE_LAYOUT': _compile_query(BATCH_CREATE_DEVICE_LAYOUT),
+    'BATCH_CREATE_LAG_STATE': _compile_query(BATCH_CREATE_LAG_STATE),
+    'CREATE_ACL_STATE_BY_EID': _compile_query(CREATE_ACL_STATE_BY_EID),
+    'CREATE_INTERFACE_STATE_BY_EID': _compile_query(CREATE_INTERFACE_STATE_BY_EID),
+    'CREATE_VLAN_STATE_BY_EID': _compile_query(CREATE_VLAN_STATE_BY_EID),
+    'CREATE_IPNETWORK_STATE_BY_EID': _compile_query(CREATE_IPNETWORK_STATE_BY_EID),
+    'CREATE_BGP_PEER_STATE_BY_EID': _compile_query(CREATE_BGP_PEER_STATE_BY_EID),
+    'CREATE_OSPF_NEIGHBOR_STATE_BY_EID': _compile_query(CREATE_OSPF_NEIGHBOR_STATE_BY_EID),
+    'CREATE_DEVICE_LAYOUT_BY_EID': _compile_query(CREATE_DEVICE_LAYOUT_BY_EID),
+    'CREATE_LAG_STATE_BY_EID': _compile_query(CREATE_LAG_STATE_BY_EID),
+    'CREATE_ACL_IDENTITY_AND_STATE': _compile_query(CREATE_ACL_IDENTITY_AND_STATE),
+    'CREATE_INTERFACE_IDENTITY_AND_STATE': _compile_query(CREATE_INTERFACE_IDENTITY_AND_STATE),
+    'CREATE_VLAN_IDENTITY_AND_STATE': _compile_query(CREATE_VLAN_IDENTITY_AND_STATE),
+    'CREATE_IPNETWORK_IDENTITY_AND_STATE': _compile_query(CREATE_IPNETWORK_IDENTITY_AND_STATE),
+    'CREATE_BGP_PEER_IDENTITY_AND_STATE': _compile_query(CREATE_BGP_PEER_IDENTITY_AND_STATE),
+    'CREATE_OSPF_NEIGHBOR_IDENTITY_AND_STATE': _compile_query(CREATE_OSPF_NEIGHBOR_IDENTITY_AND_STATE),
+    'CREATE_LAG_IDENTITY_AND_STATE': _compile_query(CREATE_LAG_IDENTITY_AND_STATE),
+}
+NEXT_VERSION_BY_LABEL_Q = {
+    state_label: _compile_query(text)
+    for state_label, text in NEXT_VERSION_BY_LABEL.items()
+}
+
+
+def all_queries() -> Dict[str, Query]:
+    """
+    Get every compiled query constant, e.g. for a warm-up script that EXPLAINs each one at startup.
+    Returns: QUERIES_Q, query constant name to driver Query object.
+    """
+    return QUERIES_Q
+
+
+class ElementIdCache:
+    """
+    Small LRU of identity key -> elementId for the *_BY_EID queries.
+    Entries expire after ttl seconds because element ids can be reused once a node is
+    deleted; call clear() whenever the driver is closed or reconnected.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        """
+        Initialize an empty cache.
+        Args: maxsize entries kept, ttl seconds before an entry is ignored.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+
+    def get(self, label: str, key: Any) -> Optional[str]:
+        """
+        Look up a cached elementId.
+        Args: label of the identity node, key value (e.g. the hostname).
+        Returns: elementId string, or None when missing or expired.
+        """
+        entry = self._entries.get((label, key))
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[(label, key)]
+            return None
+        self._entries.move_to_end((label, key))
+        return entry[1]
+
+    def put(self, label: str, key: Any, eid: str) -> None:
+        """
+        Remember the elementId returned by an identity query.
+        Args: label of the identity node, key value, eid from the query's eid column.
+        """
+        self._entries[(label, key)] = (time.monotonic(), eid)
+        self._entries.move_to_end((label, key))
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drop every cached elementId.
+        """
+        self._entries.clear()
+
+
+class CypherQueries:
+    """
+    Collection of parameterized Cypher queries for temporal graph operations.
+    All queries use MERGE for idempotent operations to prevent duplicates.
+    Timestamps are parameters ($timestamp, or a per-row timestamp in batches) captured once
+    by the caller, e.g. neo4j.time.DateTime.now(), so a retried transaction writes the same values.
+    The queries are module-level constants; this class re-exports them for existing callers.
+    Hot loops should import the module-level names directly.
     """
 
-    # Batch Operations for Performance
-    BATCH_CREATE_INTERFACES = """
-    UNWIND $interfaces as interface_data
-    MATCH (d:Device {hostname: interface_data.hostname})
-    MERGE (i:Interface {interface_id: interface_data.interface_id})
-    ON CREATE SET i.name = interface_data.name,
-                 i.device_hostname = interface_data.hostname,
-                 i.created_at = datetime()
-    
-    MERGE (d)-[:HAS_INTERFACE]->(i)
-    
-    RETURN count(i) as interfaces_created
+    SCHEMA_SETUP = SCHEMA_SETUP
+    NEXT_VERSION_BY_LABEL = NEXT_VERSION_BY_LABEL
+    NEXT_VERSION_BY_LABEL_Q = NEXT_VERSION_BY_LABEL_Q
+    QUERIES_Q = QUERIES_Q
+    all_queries = staticmethod(all_queries)
+
+
+def _export_queries() -> None:
     """
+    Re-export each query in QUERIES_Q as a CypherQueries string attribute of the same name.
+    """
+    for name, query in QUERIES_Q.items():
+        setattr(CypherQueries, name, query.text)
+
 
-    BATCH_CREATE_VLANS = """
-    UNWIND $vlans as vlan_data
-    MATCH (d:Device {hostname: vlan_data.hostname})
-    MERGE (v:VLAN {vlan_id: vlan_data.vlan_id})
-    ON CREATE SET v.vlan_number = vlan_data.vlan_number,
-                 v.device_hostname = vlan_data.hostname,
-                 v.created_at = datetime()
-    
-    RETURN count(v) as vlans_created
-    """
\ No newline at end of file
+_export_queries()
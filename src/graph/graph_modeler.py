@@ -11,6 +11,119 @@ from datetime import datetime
 from .graph_schema import GraphSchema
 
 
+# Per-label UNWIND writes used by GraphModeler._flush_batch, in dependency order.
+# Each mirrors the matching GraphSchema create_*_identity MERGE; parameter: $rows
+_NODE_MERGE_QUERIES = {
+    'Device': """
+        UNWIND $rows AS row
+        MERGE (n:Device {hostname: row.hostname})
+        ON CREATE SET n.device_id = row.device_id,
+                     n.created_at = datetime()
+    """,
+    'Interface': """
+        UNWIND $rows AS row
+        MERGE (n:Interface {interface_id: row.interface_id})
+        ON CREATE SET n.name = row.name,
+                     n.device_hostname = row.device_hostname,
+                     n.created_at = datetime()
+    """,
+    'VLAN': """
+        UNWIND $rows AS row
+        MERGE (n:VLAN {vlan_id: row.vlan_id})
+        ON CREATE SET n.vlan_number = row.vlan_number,
+                     n.device_hostname = row.device_hostname,
+                     n.created_at = datetime()
+    """,
+    'ACL': """
+        UNWIND $rows AS row
+        MERGE (n:ACL {acl_id: row.acl_id, name: row.name, device_hostname: row.device_hostname})
+        SET n.acl_type = row.acl_type
+    """,
+    'ACLEntry': """
+        UNWIND $rows AS row
+        MERGE (n:ACLEntry {entry_id: row.entry_id, acl_id: row.acl_id})
+        SET n += row
+    """,
+    'BGPInstance': """
+        UNWIND $rows AS row
+        MERGE (n:BGPInstance {instance_id: row.instance_id, device_hostname: row.device_hostname})
+        SET n.as_number = row.as_number,
+            n.router_id = row.router_id
+    """,
+    'BGPPeer': """
+        UNWIND $rows AS row
+        MERGE (n:BGPPeer {peer_id: row.peer_id, bgp_instance_id: row.bgp_instance_id})
+        SET n.peer_address = row.peer_address,
+            n.peer_as = row.peer_as,
+            n.description = row.description
+    """,
+    'RouteMap': """
+        UNWIND $rows AS row
+        MERGE (n:RouteMap {map_id: row.map_id, name: row.name, device_hostname: row.device_hostname})
+    """,
+    'QoSPolicy': """
+        UNWIND $rows AS row
+        MERGE (n:QoSPolicy {policy_id: row.policy_id, name: row.name, device_hostname: row.device_hostname})
+        SET n.policy_type = row.policy_type
+    """,
+}
+
+# Relationship type -> (from label, from key, to label, to key, stamp created_at)
+_REL_ENDPOINTS = {
+    'HAS_INTERFACE': ('Device', 'hostname', 'Interface', 'interface_id', False),
+    'HAS_ACL': ('Device', 'hostname', 'ACL', 'acl_id', False),
+    'HAS_ACL_ENTRY': ('ACL', 'acl_id', 'ACLEntry', 'entry_id', False),
+    'HAS_BGP_INSTANCE': ('Device', 'hostname', 'BGPInstance', 'instance_id', False),
+    'HAS_BGP_PEER': ('BGPInstance', 'instance_id', 'BGPPeer', 'peer_id', False),
+    'HAS_ROUTE_MAP': ('Device', 'hostname', 'RouteMap', 'map_id', False),
+    'HAS_QOS_POLICY': ('Device', 'hostname', 'QoSPolicy', 'policy_id', False),
+    'MEMBER_OF_VLAN': ('Interface', 'interface_id', 'VLAN', 'vlan_id', True),
+    'APPLIES_ACL_INGRESS': ('Interface', 'interface_id', 'ACL', 'acl_id', True),
+    'APPLIES_ACL_EGRESS': ('Interface', 'interface_id', 'ACL', 'acl_id', True),
+    'USES_ROUTE_MAP': ('BGPPeer', 'peer_id', 'RouteMap', 'map_id', True),
+}
+
+
+def _rel_merge_query(rel_type: str) -> str:
+    """
+    Build the UNWIND relationship MERGE for one _REL_ENDPOINTS entry.
+    Parameter: $rows of {'from': key, 'to': key, 'props': map}.
+    """
+    from_label, from_key, to_label, to_key, stamp = _REL_ENDPOINTS[rel_type]
+    created_at = ", r.created_at = datetime()" if stamp else ""
+    return f"""
+        UNWIND $rows AS row
+        MATCH (a:{from_label} {{{from_key}: row.from}})
+        MATCH (b:{to_label} {{{to_key}: row.to}})
+        MERGE (a)-[r:{rel_type}]->(b)
+        SET r += row.props{created_at}
+    """
+
+
+_REL_MERGE_QUERIES = {rel_type: _rel_merge_query(rel_type) for rel_type in _REL_ENDPOINTS}
+
+# New DeviceState with the next version; previous LATEST is relinked in a unit subquery
+_DEVICE_STATE_QUERY = """
+    MATCH (d:Device {hostname: $hostname})
+    OPTIONAL MATCH (d)-[:HAS_STATE]->(s:DeviceState)
+    WITH d, coalesce(max(s.version), 0) + 1 AS version
+    
+    CREATE (ds:DeviceState)
+    SET ds = $state, ds.version = version, ds.timestamp = datetime()
+    CREATE (d)-[:HAS_STATE]->(ds)
+    
+    CALL {
+        WITH d, ds
+        MATCH (d)-[old_latest:LATEST]->(old_state:DeviceState)
+        DELETE old_latest
+        CREATE (old_state)-[:PREVIOUS_STATE]->(ds)
+    }
+    CREATE (d)-[:LATEST]->(ds)
+    
+    RETURN ds.version as version
+"""
+
+
 class GraphModeler:
     """
     Transforms validated device configurations into temporal graph structure.
@@ -29,6 +142,7 @@ class GraphModeler:
         """
         Main entry point for ingesting device configuration into graph.
         Creates device identity, state, and all related network elements.
+        All writes are collected first and flushed in a single transaction.
         Returns: Summary of ingestion results with node counts.
         """
         metadata = validated_data.get('_metadata', {})
@@ -39,32 +153,50 @@ class GraphModeler:
 
         self.logger.info(f"Ingesting device configuration for {hostname}")
         
+        # Unchanged configuration and device metadata: the graph already holds everything below
+        state_data = self._build_state_data(validated_data)
+        if self.schema.get_current_device_state(hostname) == state_data:
+            self.logger.info(f"Configuration unchanged for {hostname}, skipping ingestion")
+            return {
+                'hostname': hostname,
+                'timestamp': datetime.now().isoformat(),
+                'skipped': True,
+                'config_hash': state_data['config_hash'],
+                'total_nodes_created': 0,
+                'total_relationships_created': 0
+            }
+        
+        batch = self._new_batch()
+        
         # Create device identity and state
-        device_results = self._create_device_nodes(validated_data)
+        device_results = self._create_device_nodes(validated_data, batch)
         
         # Create interface nodes and relationships
-        interface_results = self._create_interface_nodes(validated_data)
+        interface_results = self._create_interface_nodes(validated_data, batch)
         
         # Create VLAN nodes and relationships
-        vlan_results = self._create_vlan_nodes(validated_data)
+        vlan_results = self._create_vlan_nodes(validated_data, batch)
         
         # Create ACL nodes and relationships
-        acl_results = self._create_acl_nodes(validated_data)
+        acl_results = self._create_acl_nodes(validated_data, batch)
         
         # Create BGP and routing elements
-        bgp_results = self._create_bgp_nodes(validated_data)
+        bgp_results = self._create_bgp_nodes(validated_data, batch)
         
         # Create Route Map and routing policy elements
-        routing_policy_results = self._create_routing_policy_nodes(validated_data)
+        routing_policy_results = self._create_routing_policy_nodes(validated_data, batch)
         
         # Create QoS policy elements
-        qos_results = self._create_qos_nodes(validated_data)
+        qos_results = self._create_qos_nodes(validated_data, batch)
         
         # Create network and routing elements
         network_results = self._create_network_nodes(validated_data)
         
         # Create configuration dependency relationships
-        dependency_results = self._create_dependency_relationships(validated_data)
+        dependency_results = self._create_dependency_relationships(validated_data, batch)
+        
+        # Write everything collected above
+        device_results['version'] = self._flush_batch(batch)
         
         # Combine all results
         ingestion_summary = {
@@ -95,43 +227,94 @@ class GraphModeler:
         self.logger.info(f"Completed ingestion for {hostname}: {ingestion_summary['total_nodes_created']} nodes created")
         return ingestion_summary
 
-    def _create_device_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _new_batch(self) -> Dict[str, Any]:
         """
-        Create device identity and state nodes from validated configuration.
-        Args: validated_data containing device metadata and configuration.
-        Returns: Device creation results summary.
+        Create an empty write batch for one device.
+        Returns: Dict with node rows per label, relationship rows per type and the device state.
+        """
+        return {
+            'nodes': {label: [] for label in _NODE_MERGE_QUERIES},
+            'rels': {rel_type: [] for rel_type in _REL_ENDPOINTS},
+            'device_state': None
+        }
+
+    def _add_rel(self, batch: Dict[str, Any], rel_type: str, from_id: Any, to_id: Any,
+                 props: Optional[Dict[str, Any]] = None):
+        """
+        Queue a relationship write.
+        Args: batch, rel_type from _REL_ENDPOINTS, endpoint keys, optional relationship properties.
+        """
+        batch['rels'][rel_type].append({'from': from_id, 'to': to_id, 'props': props or {}})
+
+    def _flush_batch(self, batch: Dict[str, Any]) -> Optional[int]:
+        """
+        Write a device batch in one transaction: one UNWIND query per label and
+        relationship type, nodes before relationships.
+        Args: batch filled by the _create_* builders.
+        Returns: Version of the created device state, or None if the batch has none.
+        """
+        def write(tx) -> Optional[int]:
+            for label, query in _NODE_MERGE_QUERIES.items():
+                rows = batch['nodes'][label]
+                if rows:
+                    tx.run(query, rows=rows).consume()
+                if label == 'Device' and batch['device_state']:
+                    record = tx.run(_DEVICE_STATE_QUERY, **batch['device_state']).single()
+                    batch['device_state']['version'] = record['version'] if record else None
+            
+            for rel_type, query in _REL_MERGE_QUERIES.items():
+                rows = batch['rels'][rel_type]
+                if rows:
+                    tx.run(query, rows=rows).consume()
+            
+            return (batch['device_state'] or {}).get('version')
+        
+        with self.schema.driver.session() as session:
+            return session.execute_write(write)
+
+    def _create_device_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build device identity and state writes from validated configuration.
+        Args: validated_data containing device metadata and configuration, batch to fill.
+        Returns: Device creation results summary (version is filled in after the flush).
         """
         metadata = validated_data['_metadata']
         hostname = metadata['hostname']
         
-        # Create device identity
-        device_id = self.schema.create_device_identity(hostname)
+        # Device identity
+        device_id = f"device_{hostname}"
+        batch['nodes']['Device'].append({'hostname': hostname, 'device_id': device_id})
         
-        # Prepare device state data
-        config_hash = self._generate_config_hash(validated_data)
-        state_data = {
+        # Device state
+        batch['device_state'] = {'hostname': hostname, 'state': self._build_state_data(validated_data)}
+        
+        return {
+            'device_id': device_id,
+            'version': None,
+            'nodes_created': 2  # Identity + State
+        }
+
+    def _build_state_data(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the DeviceState properties for a configuration.
+        Args: validated_data containing device metadata and configuration.
+        Returns: Vendor/platform fields from metadata plus the config hash.
+        """
+        metadata = validated_data['_metadata']
+        return {
             'vendor': metadata.get('vendor', ''),
             'os_type': metadata.get('os_type', ''),
             'os_version': metadata.get('os_version', ''),
             'platform': metadata.get('platform', ''),
             'management_ip': metadata.get('management_ip', ''),
             'serial_number': metadata.get('serial_number', ''),
-            'config_hash': config_hash
-        }
-        
-        # Create device state
-        version = self.schema.create_device_state(hostname, state_data)
-        
-        return {
-            'device_id': device_id,
-            'version': version,
-            'nodes_created': 2  # Identity + State
+            'config_hash': self._generate_config_hash(validated_data)
         }
 
-    def _create_interface_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_interface_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create interface identity and state nodes from OpenConfig data.
-        Args: validated_data with OpenConfig interface configurations.
+        Build interface identity writes from OpenConfig data.
+        Args: validated_data with OpenConfig interface configurations, batch to fill.
         Returns: Interface creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -148,24 +331,21 @@ class GraphModeler:
             if not interface_name:
                 continue
                 
-            # Create interface identity
-            interface_id = self.schema.create_interface_identity(hostname, interface_name)
-            
-            # Create interface state (to be implemented when we add interface state methods)
-            # For now, we're focusing on identity nodes
+            # Interface identity and its device link
+            interface_id = f"interface_{hostname}_{interface_name}"
+            batch['nodes']['Interface'].append({
+                'interface_id': interface_id,
+                'name': interface_name,
+                'device_hostname': hostname
+            })
+            self._add_rel(batch, 'HAS_INTERFACE', hostname, interface_id)
             
             # Handle VLAN membership
             vlan_membership = self._extract_vlan_membership(interface_config)
             if vlan_membership:
-                self._create_vlan_membership_relationships(interface_id, vlan_membership, hostname)
+                self._create_vlan_membership_relationships(interface_id, vlan_membership, hostname, batch)
                 results['relationships_created'] += len(vlan_membership)
             
-            # Handle ACL applications
-            acl_applications = self._extract_acl_applications(interface_config)
-            if acl_applications:
-                self._create_acl_application_relationships(interface_id, acl_applications, hostname)
-                results['relationships_created'] += len(acl_applications)
-            
             results['interfaces_created'].append({
                 'name': interface_name,
                 'interface_id': interface_id
@@ -175,10 +355,10 @@ class GraphModeler:
         self.logger.info(f"Created {results['nodes_created']} interfaces for {hostname}")
         return results
 
-    def _create_vlan_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_vlan_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create VLAN identity and state nodes from OpenConfig data.
-        Args: validated_data with OpenConfig VLAN configurations.
+        Build VLAN identity writes from OpenConfig data.
+        Args: validated_data with OpenConfig VLAN configurations, batch to fill.
         Returns: VLAN creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -194,8 +374,13 @@ class GraphModeler:
             if not vlan_id:
                 continue
                 
-            # Create VLAN identity
-            vlan_identity_id = self.schema.create_vlan_identity(hostname, vlan_id)
+            # VLAN identity
+            vlan_identity_id = f"vlan_{hostname}_{vlan_id}"
+            batch['nodes']['VLAN'].append({
+                'vlan_id': vlan_identity_id,
+                'vlan_number': vlan_id,
+                'device_hostname': hostname
+            })
             
             results['vlans_created'].append({
                 'vlan_id': vlan_id,
@@ -206,10 +391,10 @@ class GraphModeler:
         self.logger.info(f"Created {results['nodes_created']} VLANs for {hostname}")
         return results
 
-    def _create_acl_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_acl_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create ACL identity and state nodes from OpenConfig data.
-        Args: validated_data with OpenConfig ACL configurations.
+        Build ACL identity and ACL entry writes from OpenConfig data.
+        Args: validated_data with OpenConfig ACL configurations, batch to fill.
         Returns: ACL creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -226,22 +411,24 @@ class GraphModeler:
             if not acl_name:
                 continue
                 
-            # Create ACL identity using enhanced schema method
-            acl_identity_id = self.schema.create_acl_identity(
-                hostname=hostname,
-                acl_name=acl_name,
-                acl_type=acl_type.lower().replace('acl_', '')
-            )
+            # ACL identity and its device link
+            acl_identity_id = f"{hostname}:acl:{acl_name}"
+            batch['nodes']['ACL'].append({
+                'acl_id': acl_identity_id,
+                'name': acl_name,
+                'device_hostname': hostname,
+                'acl_type': acl_type.lower().replace('acl_', '')
+            })
+            self._add_rel(batch, 'HAS_ACL', hostname, acl_identity_id)
             
-            # Extract and create ACL entries
+            # ACL entries
             acl_entries = acl_config.get('acl-entries', {}).get('acl-entry', [])
             entries_created = 0
-            
             for entry_config in acl_entries:
-                sequence_id = entry_config.get('sequence-id')
-                if sequence_id is not None:
-                    # Create ACL entry (using future method)
-                    self._create_acl_entry(acl_identity_id, entry_config)
+                if entry_config.get('sequence-id') is not None:
+                    entry_row = self._acl_entry_row(acl_identity_id, entry_config)
+                    batch['nodes']['ACLEntry'].append(entry_row)
+                    self._add_rel(batch, 'HAS_ACL_ENTRY', acl_identity_id, entry_row['entry_id'])
                     entries_created += 1
             
             results['acls_created'].append({
@@ -255,59 +442,35 @@ class GraphModeler:
         self.logger.info(f"Created {results['nodes_created']} ACLs for {hostname}")
         return results
     
-    def _create_acl_entry(self, acl_id: str, entry_config: Dict[str, Any]):
+    def _acl_entry_row(self, acl_id: str, entry_config: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create ACL entry node linked to ACL.
+        Build the ACLEntry property row for one ACL entry.
         Args: acl_id and entry_config with sequence details.
+        Returns: Dict of ACLEntry properties, including entry_id and acl_id.
         """
         sequence_id = entry_config.get('sequence-id')
-        entry_id = f"{acl_id}:entry:{sequence_id}"
         
-        # Extract entry details
+        # Extract match conditions and actions
         config = entry_config.get('config', {})
-        description = config.get('description', '')
-        
-        # Extract match conditions
         ipv4_config = entry_config.get('ipv4', {}).get('config', {})
-        src_addr = ipv4_config.get('source-address', 'any')
-        dst_addr = ipv4_config.get('destination-address', 'any')
-        protocol = ipv4_config.get('protocol', 'ip')
-        
-        # Extract actions
         actions_config = entry_config.get('actions', {}).get('config', {})
-        forwarding_action = actions_config.get('forwarding-action', 'ACCEPT')
-        log_action = actions_config.get('log-action')
-        
-        # Create entry using direct Cypher (can be enhanced to use schema method)
-        query = """
-        MATCH (acl:ACL {acl_id: $acl_id})
-        MERGE (entry:ACLEntry {entry_id: $entry_id, acl_id: $acl_id})
-        SET entry.sequence_id = $sequence_id,
-            entry.description = $description,
-            entry.source_address = $src_addr,
-            entry.destination_address = $dst_addr,
-            entry.protocol = $protocol,
-            entry.forwarding_action = $forwarding_action,
-            entry.log_action = $log_action
-        MERGE (acl)-[:HAS_ACL_ENTRY]->(entry)
-        """
         
-        with self.schema.driver.session() as session:
-            session.run(query,
-                       acl_id=acl_id,
-                       entry_id=entry_id,
-                       sequence_id=sequence_id,
-                       description=description,
-                       src_addr=src_addr,
-                       dst_addr=dst_addr,
-                       protocol=protocol,
-                       forwarding_action=forwarding_action,
-                       log_action=log_action)
+        return {
+            'entry_id': f"{acl_id}:entry:{sequence_id}",
+            'acl_id': acl_id,
+            'sequence_id': sequence_id,
+            'description': config.get('description', ''),
+            'source_address': ipv4_config.get('source-address', 'any'),
+            'destination_address': ipv4_config.get('destination-address', 'any'),
+            'protocol': ipv4_config.get('protocol', 'ip'),
+            'forwarding_action': actions_config.get('forwarding-action', 'ACCEPT'),
+            'log_action': actions_config.get('log-action')
+        }
 
-    def _create_bgp_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_bgp_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create BGP instance and peer nodes from routing configuration.
-        Args: validated_data with BGP routing configurations.
+        Build BGP instance and peer writes from routing configuration.
+        Args: validated_data with BGP routing configurations, batch to fill.
         Returns: BGP creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -329,12 +492,15 @@ class GraphModeler:
         router_id = global_config.get('router-id')
         
         if as_number:
-            # Create BGP instance using enhanced schema method
-            bgp_instance_id = self.schema.create_bgp_instance_identity(
-                hostname=hostname,
-                as_number=as_number,
-                router_id=router_id
-            )
+            # BGP instance and its device link
+            bgp_instance_id = f"{hostname}:bgp:{as_number}"
+            batch['nodes']['BGPInstance'].append({
+                'instance_id': bgp_instance_id,
+                'device_hostname': hostname,
+                'as_number': as_number,
+                'router_id': router_id
+            })
+            self._add_rel(batch, 'HAS_BGP_INSTANCE', hostname, bgp_instance_id)
             
             results['bgp_instances_created'].append({
                 'as_number': as_number,
@@ -343,12 +509,12 @@ class GraphModeler:
             })
             results['nodes_created'] += 1
             
-            # Extract and create BGP peers
+            # BGP peers
             neighbors = bgp_data.get('neighbors', [])
             for neighbor_config in neighbors:
                 peer_address = neighbor_config.get('neighbor-address')
                 if peer_address:
-                    peer_id = self._create_bgp_peer(bgp_instance_id, neighbor_config)
+                    peer_id = self._create_bgp_peer(bgp_instance_id, neighbor_config, batch)
                     results['bgp_peers_created'].append({
                         'peer_address': peer_address,
                         'peer_id': peer_id
@@ -358,10 +524,10 @@ class GraphModeler:
         self.logger.info(f"Created {results['nodes_created']} BGP objects for {hostname}")
         return results
     
-    def _create_bgp_peer(self, bgp_instance_id: str, neighbor_config: Dict[str, Any]) -> str:
+    def _create_bgp_peer(self, bgp_instance_id: str, neighbor_config: Dict[str, Any], batch: Dict[str, Any]) -> str:
         """
-        Create BGP peer node linked to BGP instance.
-        Args: bgp_instance_id and neighbor_config with peer details.
+        Build the BGP peer write and its link to the BGP instance.
+        Args: bgp_instance_id, neighbor_config with peer details, batch to fill.
         Returns: Generated peer_id.
         """
         peer_address = neighbor_config.get('neighbor-address')
@@ -369,33 +535,20 @@ class GraphModeler:
         
         # Extract peer configuration
         config = neighbor_config.get('config', {})
-        peer_as = config.get('peer-as')
-        description = config.get('description', '')
-        
-        # Create BGP peer using direct Cypher
-        query = """
-        MATCH (bgp:BGPInstance {instance_id: $bgp_instance_id})
-        MERGE (peer:BGPPeer {peer_id: $peer_id, bgp_instance_id: $bgp_instance_id})
-        SET peer.peer_address = $peer_address,
-            peer.peer_as = $peer_as,
-            peer.description = $description
-        MERGE (bgp)-[:HAS_BGP_PEER]->(peer)
-        RETURN peer.peer_id as peer_id
-        """
-        
-        with self.schema.driver.session() as session:
-            result = session.run(query,
-                               bgp_instance_id=bgp_instance_id,
-                               peer_id=peer_id,
-                               peer_address=peer_address,
-                               peer_as=peer_as,
-                               description=description)
-            return result.single()['peer_id']
+        batch['nodes']['BGPPeer'].append({
+            'peer_id': peer_id,
+            'bgp_instance_id': bgp_instance_id,
+            'peer_address': peer_address,
+            'peer_as': config.get('peer-as'),
+            'description': config.get('description', '')
+        })
+        self._add_rel(batch, 'HAS_BGP_PEER', bgp_instance_id, peer_id)
+        return peer_id
 
-    def _create_routing_policy_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_routing_policy_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create route map and routing policy nodes from configuration.
-        Args: validated_data with routing policy configurations.
+        Build route map and routing policy writes from configuration.
+        Args: validated_data with routing policy configurations, batch to fill.
         Returns: Routing policy creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -413,11 +566,14 @@ class GraphModeler:
         for route_map_config in route_maps:
             route_map_name = route_map_config.get('name')
             if route_map_name:
-                # Create route map using enhanced schema method
-                route_map_id = self.schema.create_route_map_identity(
-                    hostname=hostname,
-                    route_map_name=route_map_name
-                )
+                # Route map identity and its device link
+                route_map_id = f"{hostname}:route-map:{route_map_name}"
+                batch['nodes']['RouteMap'].append({
+                    'map_id': route_map_id,
+                    'name': route_map_name,
+                    'device_hostname': hostname
+                })
+                self._add_rel(batch, 'HAS_ROUTE_MAP', hostname, route_map_id)
                 
                 results['route_maps_created'].append({
                     'name': route_map_name,
@@ -428,10 +584,10 @@ class GraphModeler:
         self.logger.info(f"Created {results['nodes_created']} routing policy objects for {hostname}")
         return results
 
-    def _create_qos_nodes(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_qos_nodes(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create QoS policy nodes from configuration.
-        Args: validated_data with QoS configurations.
+        Build QoS policy writes from configuration.
+        Args: validated_data with QoS configurations, batch to fill.
         Returns: QoS creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -450,12 +606,15 @@ class GraphModeler:
             policy_type = policy_config.get('type', 'service')
             
             if policy_name:
-                # Create QoS policy using enhanced schema method
-                policy_id = self.schema.create_qos_policy_identity(
-                    hostname=hostname,
-                    policy_name=policy_name,
-                    policy_type=policy_type
-                )
+                # QoS policy identity and its device link
+                policy_id = f"{hostname}:qos:{policy_name}"
+                batch['nodes']['QoSPolicy'].append({
+                    'policy_id': policy_id,
+                    'name': policy_name,
+                    'device_hostname': hostname,
+                    'policy_type': policy_type
+                })
+                self._add_rel(batch, 'HAS_QOS_POLICY', hostname, policy_id)
                 
                 results['qos_policies_created'].append({
                     'name': policy_name,
@@ -467,10 +626,10 @@ class GraphModeler:
         self.logger.info(f"Created {results['nodes_created']} QoS objects for {hostname}")
         return results
 
-    def _create_dependency_relationships(self, validated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_dependency_relationships(self, validated_data: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Create dependency relationships between configuration objects.
-        Args: validated_data to analyze for cross-references.
+        Build dependency relationship writes between configuration objects.
+        Args: validated_data to analyze for cross-references, batch to fill.
         Returns: Dependency creation results summary.
         """
         hostname = validated_data['_metadata']['hostname']
@@ -495,12 +654,12 @@ class GraphModeler:
                 
                 if ingress_acl:
                     acl_id = f"{hostname}:acl:{ingress_acl}"
-                    self.schema.create_acl_dependency(interface_id, 'Interface', acl_id, 'APPLIES_ACL_INGRESS')
+                    self._add_rel(batch, 'APPLIES_ACL_INGRESS', interface_id, acl_id)
                     results['relationships_created'] += 1
                     
                 if egress_acl:
                     acl_id = f"{hostname}:acl:{egress_acl}"
-                    self.schema.create_acl_dependency(interface_id, 'Interface', acl_id, 'APPLIES_ACL_EGRESS')
+                    self._add_rel(batch, 'APPLIES_ACL_EGRESS', interface_id, acl_id)
                     results['relationships_created'] += 1
         
         # Extract BGP-to-route-map dependencies
@@ -520,7 +679,7 @@ class GraphModeler:
                 
                 for policy_name in import_policy + export_policy:
                     route_map_id = f"{hostname}:route-map:{policy_name}"
-                    self.schema.create_route_map_dependency(peer_id, 'BGPPeer', route_map_id, 'USES_ROUTE_MAP')
+                    self._add_rel(batch, 'USES_ROUTE_MAP', peer_id, route_map_id)
                     results['relationships_created'] += 1
         
         self.logger.info(f"Created {results['relationships_created']} dependency relationships for {hostname}")
@@ -605,40 +764,45 @@ class GraphModeler:
         
         return memberships
 
-    def _create_vlan_membership_relationships(self, interface_id: str, memberships: List[Dict[str, Any]], hostname: str):
+    def _create_vlan_membership_relationships(self, interface_id: str, memberships: List[Dict[str, Any]],
+                                              hostname: str, batch: Dict[str, Any]):
         """
-        Create VLAN membership relationships in graph database.
-        Args: interface_id, membership details, and hostname for context.
+        Build VLAN membership relationship writes.
+        Args: interface_id, membership details, hostname for context, batch to fill.
         """
         for membership in memberships:
             vlan_number = membership['vlan_id']
             vlan_id = f"vlan_{hostname}_{vlan_number}"
             membership_type = membership['membership_type']
-            native_vlan = membership.get('native_vlan', False)
             
-            # Create the MEMBER_OF_VLAN relationship
-            self.schema.create_vlan_membership(
-                interface_id=interface_id,
-                vlan_id=vlan_id,
-                membership_type=membership_type,
-                native_vlan=native_vlan
-            )
+            # Queue the MEMBER_OF_VLAN relationship
+            self._add_rel(batch, 'MEMBER_OF_VLAN', interface_id, vlan_id, {
+                'membership_type': membership_type,
+                'native_vlan': membership.get('native_vlan', False)
+            })
             
-            self.logger.debug(f"Created VLAN membership: {interface_id} -> {vlan_id} ({membership_type})")
+            self.logger.debug(f"Queued VLAN membership: {interface_id} -> {vlan_id} ({membership_type})")
 
     def _generate_config_hash(self, validated_data: Dict[str, Any]) -> str:
         """
         Generate hash of configuration for change detection.
+        The hash is memoized in validated_data['_metadata']['config_hash'].
         Args: validated_data dictionary to hash.
         Returns: SHA-256 hash string of configuration.
         """
-        # Create a copy without metadata for consistent hashing
-        config_copy = validated_data.copy()
-        config_copy.pop('_metadata', None)
+        metadata = validated_data.get('_metadata')
+        if metadata and 'config_hash' in metadata:
+            return metadata['config_hash']
+        
+        # Exclude metadata for consistent hashing
+        config = {key: value for key, value in validated_data.items() if key != '_metadata'}
         
         # Sort and serialize for consistent hashing
-        config_json = json.dumps(config_copy, sort_keys=True)
-        return hashlib.sha256(config_json.encode()).hexdigest()
+        config_json = json.dumps(config, sort_keys=True)
+        config_hash = hashlib.sha256(config_json.encode()).hexdigest()
+        if metadata is not None:
+            metadata['config_hash'] = config_hash
+        return config_hash
 
     def get_ingestion_stats(self) -> Dict[str, Any]:
         """
@@ -15,6 +15,59 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.config import config
+from src.graph.cypher_queries import SCHEMA_SETUP
+
+# Summary keys mapped to the node label or relationship type they count
+_SUMMARY_NODE_LABELS = {
+    # Core objects
+    'devices': 'Device',
+    'interfaces': 'Interface',
+    'vlans': 'VLAN',
+
+    # Security configuration objects
+    'acls': 'ACL',
+    'acl_entries': 'ACLEntry',
+
+    # Routing configuration objects
+    'bgp_instances': 'BGPInstance',
+    'bgp_peers': 'BGPPeer',
+    'route_maps': 'RouteMap',
+    'prefix_lists': 'PrefixList',
+    'ospf_instances': 'OSPFInstance',
+    'static_routes': 'StaticRoute',
+
+    # QoS configuration objects
+    'qos_policies': 'QoSPolicy',
+    'class_maps': 'ClassMap',
+    'policy_maps': 'PolicyMap',
+
+    # Interface configuration objects
+    'port_channels': 'PortChannel',
+    'vrfs': 'VRF',
+    'svis': 'SVI',
+
+    # State objects
+    'device_states': 'DeviceState',
+    'interface_states': 'InterfaceState',
+}
+
+_SUMMARY_RELATIONSHIP_TYPES = {
+    'connections': 'CONNECTED_TO',
+    'acl_dependencies': 'APPLIES_ACL',
+    'route_map_dependencies': 'USES_ROUTE_MAP',
+    'qos_dependencies': 'APPLIES_QOS_POLICY',
+}
+
+_SUMMARY_COUNT_KEYS = tuple(_SUMMARY_NODE_LABELS) + tuple(_SUMMARY_RELATIONSHIP_TYPES)
+
+# All summary counts in one round trip; each branch is a single-label
+# count(*) so Neo4j answers it from the count store instead of scanning nodes
+_SUMMARY_COUNT_QUERY = "\nUNION ALL\n".join(
+    [f"MATCH (:{label}) RETURN '{key}' AS key, count(*) AS count"
+     for key, label in _SUMMARY_NODE_LABELS.items()] +
+    [f"MATCH ()-[:{rel_type}]->() RETURN '{key}' AS key, count(*) AS count"
+     for key, rel_type in _SUMMARY_RELATIONSHIP_TYPES.items()]
+)
 
 
 class GraphSchema:
@@ -84,6 +137,7 @@ class GraphSchema:
             # Interface configuration objects
             "CREATE CONSTRAINT port_channel_id_unique IF NOT EXISTS FOR (pc:PortChannel) REQUIRE pc.channel_id IS UNIQUE",
             "CREATE CONSTRAINT vrf_id_unique IF NOT EXISTS FOR (vrf:VRF) REQUIRE vrf.vrf_id IS UNIQUE",
+            "CREATE CONSTRAINT lag_id_unique IF NOT EXISTS FOR (l:LinkAggregation) REQUIRE l.lag_id IS UNIQUE",
             "CREATE CONSTRAINT svi_id_unique IF NOT EXISTS FOR (svi:SVI) REQUIRE svi.svi_id IS UNIQUE",
             
             # Management configuration objects
@@ -91,6 +145,8 @@ class GraphSchema:
             "CREATE CONSTRAINT ntp_server_id_unique IF NOT EXISTS FOR (ntp:NTPServer) REQUIRE ntp.server_id IS UNIQUE",
             "CREATE CONSTRAINT logging_destination_id_unique IF NOT EXISTS FOR (ld:LoggingDestination) REQUIRE ld.destination_id IS UNIQUE"
         ]
+        # Identity lookups used by the Cypher query module (adds OSPFNeighbor and Site)
+        constraints.extend(q for q in SCHEMA_SETUP if q not in constraints)
 
         with self.driver.session() as session:
             for constraint in constraints:
@@ -111,6 +167,7 @@ class GraphSchema:
             "CREATE INDEX interface_device_idx IF NOT EXISTS FOR (i:Interface) ON (i.device_hostname)",
             "CREATE INDEX interface_name_idx IF NOT EXISTS FOR (i:Interface) ON (i.name)",
             "CREATE INDEX vlan_number_idx IF NOT EXISTS FOR (v:VLAN) ON (v.vlan_number)",
+            "CREATE INDEX vlan_device_idx IF NOT EXISTS FOR (v:VLAN) ON (v.device_hostname)",
             
             # Security configuration indexes
             "CREATE INDEX acl_name_idx IF NOT EXISTS FOR (a:ACL) ON (a.name)",
@@ -377,59 +434,34 @@ class GraphSchema:
             result = session.run(query, hostname=hostname)
             return result.single()["next_version"]
 
-    def get_schema_summary(self) -> Dict[str, Any]:
+    def get_current_device_state(self, hostname: str) -> Optional[Dict[str, Any]]:
         """
-        Return summary of current graph schema state.
-        Returns: Dictionary with node counts, relationship counts, and schema info.
+        Get the stored fields of the device's LATEST state.
+        Args: hostname of the device.
+        Returns: Vendor/platform fields and config_hash, or None if the device has no state yet.
         """
-        queries = {
-            # Core objects
-            'devices': 'MATCH (d:Device) RETURN count(d) as count',
-            'interfaces': 'MATCH (i:Interface) RETURN count(i) as count',
-            'vlans': 'MATCH (v:VLAN) RETURN count(v) as count',
-            
-            # Security configuration objects
-            'acls': 'MATCH (a:ACL) RETURN count(a) as count',
-            'acl_entries': 'MATCH (ae:ACLEntry) RETURN count(ae) as count',
-            
-            # Routing configuration objects
-            'bgp_instances': 'MATCH (b:BGPInstance) RETURN count(b) as count',
-            'bgp_peers': 'MATCH (bp:BGPPeer) RETURN count(bp) as count',
-            'route_maps': 'MATCH (rm:RouteMap) RETURN count(rm) as count',
-            'prefix_lists': 'MATCH (pl:PrefixList) RETURN count(pl) as count',
-            'ospf_instances': 'MATCH (o:OSPFInstance) RETURN count(o) as count',
-            'static_routes': 'MATCH (sr:StaticRoute) RETURN count(sr) as count',
-            
-            # QoS configuration objects
-            'qos_policies': 'MATCH (qp:QoSPolicy) RETURN count(qp) as count',
-            'class_maps': 'MATCH (cm:ClassMap) RETURN count(cm) as count',
-            'policy_maps': 'MATCH (pm:PolicyMap) RETURN count(pm) as count',
-            
-            # Interface configuration objects
-            'port_channels': 'MATCH (pc:PortChannel) RETURN count(pc) as count',
-            'vrfs': 'MATCH (vrf:VRF) RETURN count(vrf) as count',
-            'svis': 'MATCH (svi:SVI) RETURN count(svi) as count',
-            
-            # State objects
-            'device_states': 'MATCH (ds:DeviceState) RETURN count(ds) as count',
-            'interface_states': 'MATCH (is:InterfaceState) RETURN count(is) as count',
-            
-            # Relationships
-            'connections': 'MATCH ()-[c:CONNECTED_TO]->() RETURN count(c) as count',
-            'acl_dependencies': 'MATCH ()-[ad:APPLIES_ACL]->() RETURN count(ad) as count',
-            'route_map_dependencies': 'MATCH ()-[rm:USES_ROUTE_MAP]->() RETURN count(rm) as count',
-            'qos_dependencies': 'MATCH ()-[qd:APPLIES_QOS_POLICY]->() RETURN count(qd) as count'
-        }
-
-        summary = {}
+        query = """
+        MATCH (d:Device {hostname: $hostname})-[:LATEST]->(ds:DeviceState)
+        RETURN ds {.vendor, .os_type, .os_version, .platform,
+                   .management_ip, .serial_number, .config_hash} as state
+        """
+
         with self.driver.session() as session:
-            for key, query in queries.items():
-                try:
-                    result = session.run(query)
-                    summary[key] = result.single()["count"]
-                except Exception as e:
-                    self.logger.warning(f"Summary query failed for {key}: {e}")
-                    summary[key] = 0
+            record = session.run(query, hostname=hostname).single()
+            return dict(record["state"]) if record else None
+
+    def get_schema_summary(self) -> Dict[str, int]:
+        """
+        Return summary of current graph schema state.
+        Returns: Dictionary of integer node and relationship counts (0 when the count query fails).
+        """
+        summary = dict.fromkeys(_SUMMARY_COUNT_KEYS, 0)
+        try:
+            with self.driver.session() as session:
+                for record in session.run(_SUMMARY_COUNT_QUERY):
+                    summary[record["key"]] = int(record["count"])
+        except Exception as e:
+            self.logger.warning(f"Schema summary query failed: {e}")
 
         return summary
 
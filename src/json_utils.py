@@ -0,0 +1,28 @@
+"""
+JSON encoding helpers shared by the loaders, analyzers and CLI.
+Uses orjson when the optional "fast" extra is installed, the stdlib json module otherwise.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+# Parse a JSON document from bytes or str; orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so callers catch the stdlib exception for both backends
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON.
+    Non-string dict keys are accepted by both backends, as with the stdlib json module.
+    Args: obj to serialize, default called for values that are not JSON serializable.
+    Returns: Encoded JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=default).encode()
@@ -3,13 +3,14 @@ Cisco IOS/IOS-XE loader plugin implementing the 4-step loading process.
 Handles both JSON and XML formats with vendor-native to OpenConfig mapping.
 """
 
-import json
 import xmltodict
 from pathlib import Path
 from typing import Dict, Any, List
 from .base_loader import BaseLoader
 import logging
 
+from src.json_utils import json_loads
+
 
 class CiscoIosLoader(BaseLoader):
     """
@@ -36,8 +37,7 @@ class CiscoIosLoader(BaseLoader):
         try:
             if file_path.suffix.lower() == '.json':
                 # Direct JSON loading
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                data = json_loads(file_path.read_bytes())
             elif file_path.suffix.lower() == '.xml':
                 # XML to dict conversion via xmltodict
                 with open(file_path, 'r') as f:
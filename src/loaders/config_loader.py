@@ -5,11 +5,12 @@ Handles both JSON and XML formats with unified interface.
 
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-import json
 import xml.etree.ElementTree as ET
 import xmltodict
 import logging
 
+from src.json_utils import json_loads
+
 
 class ConfigLoader:
     """
@@ -53,14 +54,7 @@ class ConfigLoader:
         Args: config_file name or path relative to tests directory.
         Returns: Configuration dictionary or None if not found.
         """
-        # Handle both absolute and relative paths
-        if config_file.startswith('./tests/') or config_file.startswith('tests/'):
-            config_path = self.project_root / config_file.lstrip('./')
-        elif config_file.startswith('/'):
-            config_path = Path(config_file)
-        else:
-            # Assume it's relative to tests directory
-            config_path = self.proposed_configs_dir / config_file
+        config_path = self.resolve_proposed_path(config_file)
         
         if not config_path.exists():
             self.logger.error(f"Proposed config not found: {config_path}")
@@ -74,6 +68,21 @@ class ConfigLoader:
             self.logger.error(f"Unsupported config format: {config_path.suffix}")
             return None
     
+    def resolve_proposed_path(self, config_file: str) -> Path:
+        """
+        Resolve a proposed config name to the file load_proposed_config would read.
+        Args: config_file name or path relative to tests directory.
+        Returns: Path to the proposed configuration file (may not exist).
+        """
+        # Handle both absolute and relative paths
+        if config_file.startswith('./tests/') or config_file.startswith('tests/'):
+            return self.project_root / config_file.lstrip('./')
+        elif config_file.startswith('/'):
+            return Path(config_file)
+        else:
+            # Assume it's relative to tests directory
+            return self.proposed_configs_dir / config_file
+    
     def _load_json_config(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """
         Load JSON configuration file.
@@ -81,8 +90,7 @@ class ConfigLoader:
         Returns: Configuration dictionary or None on error.
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = json_loads(Path(file_path).read_bytes())
             
             self.logger.info(f"Loaded JSON config from: {file_path}")
             return config
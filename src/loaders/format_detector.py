@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Tuple, Optional, Dict, Any
 from enum import Enum
 
+from src.json_utils import json_loads
+
 class ConfigFormat(Enum):
     """Supported configuration formats."""
     TEXT = "text"
@@ -109,7 +111,8 @@ class FormatDetector:
     def _try_json_format(self, content: str) -> Tuple[ConfigFormat, Optional[str], Optional[Dict[str, Any]]]:
         """Try to parse as JSON and validate YANG structure."""
         try:
-            data = json.loads(content)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            data = json_loads(content)
             
             if not isinstance(data, dict):
                 return ConfigFormat.UNKNOWN, "JSON file must contain an object, not array or primitive", None
@@ -121,7 +124,9 @@ class FormatDetector:
                 metadata = {
                     'yang_objects': yang_keys,
                     'total_keys': len(data.keys()),
-                    'has_device_wrapper': 'device' in data
+                    'has_device_wrapper': 'device' in data,
+                    # Parsed document, so callers need not parse the file a second time
+                    'document': data
                 }
                 return ConfigFormat.JSON, None, metadata
             else: